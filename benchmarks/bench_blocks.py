@@ -0,0 +1,118 @@
+"""Benchmark slotted content blocks against the old dict blocks.
+
+Measures memory per block and writer dispatch time for a document shaped
+like a large PDF -> EPUB conversion (one paragraph per line, some headings).
+Dict blocks, and slotted blocks read through their Mapping interface, go
+through a copy of the writers' previous ``block['type']`` dispatch; slotted
+blocks are also written by the current writers, which dispatch with
+``isinstance`` and read attributes.
+
+Run with:
+    python benchmarks/bench_blocks.py [num_blocks]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from convertext.converters.base import Document
+from convertext.converters.mixins import HtmlWriterMixin, TextWriterMixin
+from convertext.converters.utils import LineWriter, escape_html
+
+
+def _texts(n):
+    return [f"Line {i} of extracted page text, roughly one PDF line long." for i in range(n)]
+
+
+def build_dicts(texts):
+    # A bare holder: Document.content converts dict blocks on access
+    doc = SimpleNamespace(content=[])
+    for i, text in enumerate(texts):
+        if i % 50 == 0:
+            doc.content.append({"type": "heading", "data": text, "level": 2})
+        else:
+            doc.content.append({"type": "paragraph", "data": text})
+    return doc
+
+
+def build_blocks(texts):
+    doc = Document()
+    for i, text in enumerate(texts):
+        if i % 50 == 0:
+            doc.add_heading(text, 2)
+        else:
+            doc.add_paragraph(text)
+    return doc
+
+
+def measure_memory(builder, texts):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    doc = builder(texts)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return doc, size / len(texts)
+
+
+class _Writer(TextWriterMixin, HtmlWriterMixin):
+    pass
+
+
+class _KeyWriter:
+    """The writers' previous dispatch on block['type'] and block['data']."""
+
+    def _write_txt(self, doc, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for block in doc.content:
+                btype = block["type"]
+                if btype in ("text", "paragraph"):
+                    f.write(block["data"] + "\n\n")
+                elif btype == "heading":
+                    f.write("\n" + block["data"].upper() + "\n")
+                    f.write("-" * len(block["data"]) + "\n\n")
+
+    def _write_html(self, doc, path):
+        with open(path, "w", encoding="utf-8") as f:
+            html_parts = LineWriter(f)
+            for block in doc.content:
+                btype = block["type"]
+                if btype == "paragraph" and not block.get("spans"):
+                    html_parts.append(f"<p>{escape_html(block['data'])}</p>")
+                elif btype == "heading":
+                    level = min(block["level"], 6)
+                    html_parts.append(f"<h{level}>{escape_html(block['data'])}</h{level}>")
+
+
+def measure_dispatch(doc, writer, repeat=3):
+    best = {}
+    for name, write in (('txt', writer._write_txt), ('html', writer._write_html)):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            write(doc, os.devnull)
+            times.append(time.perf_counter() - start)
+        best[name] = min(times)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    texts = _texts(n)
+
+    print(f"{n:,} blocks")
+    print(f"{'representation':<20}{'bytes/block':>12}{'txt write':>12}{'html write':>12}")
+    for label, builder, writer in (
+        ('dict', build_dicts, _KeyWriter()),
+        ('slotted, by key', build_blocks, _KeyWriter()),
+        ('slotted', build_blocks, _Writer()),
+    ):
+        doc, per_block = measure_memory(builder, texts)
+        times = measure_dispatch(doc, writer)
+        print(f"{label:<20}{per_block:>12.0f}{times['txt']:>11.3f}s{times['html']:>11.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark the shared lxml HTML reader against BeautifulSoup's html.parser.
+
+Parses an XHTML chapter shaped like an EPUB spine item (headings,
+paragraphs with inline markup, a table and a list per section) into
+Document blocks both ways and reports the best of several runs.
+
+Run with:
+    python benchmarks/bench_html.py [num_sections]
+"""
+
+import sys
+import time
+
+from convertext.converters.base import Document
+from convertext.converters.html_reader import read_html
+
+
+def _chapter(sections):
+    parts = ['<?xml version="1.0" encoding="utf-8"?>',
+             '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>Bench</title></head><body>']
+    for i in range(sections):
+        parts.append(f'<h2>Section {i}</h2>')
+        for j in range(20):
+            parts.append(f'<p>Paragraph {j} of section {i} with <em>some</em> '
+                         f'<strong>inline</strong> markup and a <a href="#n{j}">link</a>.</p>')
+        parts.append('<table><thead><tr><th>A</th><th>B</th></tr></thead><tbody>'
+                     + '<tr><td>1</td><td>2</td></tr>' * 5 + '</tbody></table>')
+        parts.append('<ul>' + '<li>item</li>' * 5 + '</ul>')
+    parts.append('</body></html>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def read_soup(data):
+    from bs4 import BeautifulSoup
+    doc = Document()
+    soup = BeautifulSoup(data.decode('utf-8'), 'html.parser')
+    for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'ul', 'ol']):
+        if element.name.startswith('h'):
+            doc.add_heading(element.get_text().strip(), int(element.name[1]))
+        elif element.name == 'p':
+            text = element.get_text().strip()
+            if text:
+                doc.add_paragraph(text)
+        elif element.name == 'table':
+            rows = [[cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
+                    for row in element.find_all('tr')]
+            doc.add_table(rows=[r for r in rows if r])
+        else:
+            doc.add_list([li.get_text().strip() for li in element.find_all('li')],
+                         ordered=element.name == 'ol')
+    return doc
+
+
+def read_lxml(data):
+    return read_html(data, rich=True)
+
+
+def best_of(read, data, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        doc = read(data)
+        times.append(time.perf_counter() - start)
+    return min(times), len(doc.content)
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    data = _chapter(sections)
+
+    print(f"{len(data) / 1e6:.1f} MB of XHTML, {sections:,} sections")
+    print(f"{'reader':<16}{'time':>10}{'blocks':>10}")
+    readers = [('lxml', read_lxml)]
+    try:
+        import bs4  # noqa: F401
+        readers.insert(0, ('html.parser', read_soup))
+    except ImportError:
+        print("(beautifulsoup4 not installed; skipping html.parser)")
+    for label, read in readers:
+        elapsed, blocks = best_of(read, data)
+        print(f"{label:<16}{elapsed:>9.3f}s{blocks:>10,}")
+
+
+if __name__ == '__main__':
+    main()
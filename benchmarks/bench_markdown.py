@@ -0,0 +1,57 @@
+"""Benchmark the direct Markdown reader against rendering to HTML and re-parsing.
+
+Reads a Markdown document shaped like a long README (headings, paragraphs
+with inline markup, lists and code blocks per section) into Document blocks
+both ways and reports the best of several runs.
+
+Run with:
+    python benchmarks/bench_markdown.py [num_sections]
+"""
+
+import sys
+import time
+
+import markdown
+
+from convertext.converters.html_reader import read_html
+from convertext.converters.markdown_reader import read_markdown
+
+
+def _source(sections):
+    parts = ['# Bench', '']
+    for i in range(sections):
+        parts += [f'## Section {i}', '']
+        for j in range(20):
+            parts += [f'Paragraph {j} of section {i} with *some* **inline** '
+                      f'markup and a [link](#n{j}).', '']
+        parts += [f'- item {k}' for k in range(5)] + ['']
+        parts += ['    code line', '    more code', '']
+    return '\n'.join(parts)
+
+
+def read_round_trip(source):
+    return read_html(markdown.markdown(source), title=False)
+
+
+def best_of(read, source, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        doc = read(source)
+        times.append(time.perf_counter() - start)
+    return min(times), len(doc.content)
+
+
+def main():
+    sections = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    source = _source(sections)
+
+    print(f"{len(source) / 1e6:.1f} MB of Markdown, {sections:,} sections")
+    print(f"{'reader':<16}{'time':>10}{'blocks':>10}")
+    for label, read in [('html round trip', read_round_trip), ('direct', read_markdown)]:
+        elapsed, blocks = best_of(read, source)
+        print(f"{label:<16}{elapsed:>9.3f}s{blocks:>10,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark PalmDOC decompression of MOBI text records.
+
+Compresses HTML-like text into 4 KB records the way the AZW3 writer does,
+then decodes all records with a byte-at-a-time decoder (the previous
+implementation) and with the slice-copying decoder, and reports the best of
+several runs.
+
+Run with:
+    python benchmarks/bench_palmdoc.py [num_records]
+"""
+
+import random
+import sys
+import time
+
+from convertext.converters.ebooks.azw3 import _palmdoc_compress
+from convertext.converters.ebooks.palmdoc import decompress
+
+
+def decompress_bytewise(data):
+    result = []
+    i = 0
+    while i < len(data):
+        c = data[i]
+        i += 1
+        if c == 0:
+            result.append(0)
+        elif 1 <= c <= 8:
+            result.extend(data[i:i + c])
+            i += c
+        elif 0x09 <= c <= 0x7F:
+            result.append(c)
+        elif 0xC0 <= c:
+            result.append(0x20)
+            result.append(c ^ 0x80)
+        elif i < len(data):
+            c2 = data[i]
+            i += 1
+            dist = ((c << 8 | c2) >> 3) & 0x7FF
+            length = (c2 & 0x07) + 3
+            start = len(result) - dist
+            if start >= 0:
+                for _ in range(length):
+                    if start < len(result):
+                        result.append(result[start])
+                        start += 1
+    return bytes(result)
+
+
+_WORDS = ('the of and to in was that he it his with had for as you not on her at by but which '
+          'café naïve fiancée river mountain evening lantern whispered remembered carriage '
+          'extraordinary thoroughly somewhere, yesterday. “Indeed,” however; nevertheless').split()
+
+
+def _records(count):
+    rng = random.Random(1)
+    paragraphs = []
+    while sum(map(len, paragraphs)) < count * 4096:
+        words = ' '.join(rng.choice(_WORDS) for _ in range(rng.randrange(20, 120)))
+        paragraphs.append(f'<p class="calibre{rng.randrange(4)}">{words.capitalize()}.</p>\n')
+    text = ''.join(paragraphs).encode('utf-8')
+    return [_palmdoc_compress(text[i:i + 4096]) for i in range(0, count * 4096, 4096)]
+
+
+def best_of(decode, records, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(decode(record)) for record in records)
+        times.append(time.perf_counter() - start)
+    return min(times), size
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    records = _records(count)
+
+    print(f"{count:,} records, {sum(map(len, records)) / 1e6:.1f} MB compressed")
+    print(f"{'decoder':<12}{'time':>10}{'MB/s':>10}")
+    for label, decode in [('bytewise', decompress_bytewise), ('slices', decompress)]:
+        elapsed, size = best_of(decode, records)
+        print(f"{label:<12}{elapsed:>9.3f}s{size / 1e6 / elapsed:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
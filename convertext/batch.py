@@ -0,0 +1,317 @@
+"""Pipelined batch conversion with read-ahead and write-behind I/O stages."""
+
+import copy
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from convertext.config import Config
+from convertext.converters.utils import process_pool_context
+from convertext.core import ConversionEngine, ConversionResult
+
+_DONE = object()
+# Bytes read per call when pulling a source into the page cache
+_READ_AHEAD_CHUNK = 1024 * 1024
+
+# Per-process engine set up by the pool initializer
+_worker_engine: Optional[ConversionEngine] = None
+
+
+class _ByteBudget:
+    """Blocking counter that caps how many source bytes are read ahead."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.used = 0
+        self.cancelled = False
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int) -> bool:
+        """Take size bytes of the budget. Returns False once cancelled."""
+        with self._cond:
+            # A single file larger than the budget is admitted on its own
+            while not self.cancelled and self.used and self.used + size > self.limit:
+                self._cond.wait()
+            if self.cancelled:
+                return False
+            self.used += size
+            return True
+
+    def release(self, size: int):
+        with self._cond:
+            self.used -= size
+            self._cond.notify_all()
+
+    def cancel(self):
+        """Wake every waiter; later acquires fail."""
+        with self._cond:
+            self.cancelled = True
+            self._cond.notify_all()
+
+
+class BatchPipeline:
+    """Convert many files with overlapped reading, converting and writing.
+
+    A prefetch thread reads upcoming sources ahead of the converters
+    (bounded by ``prefetch`` files and ``prefetch_bytes``) so they are in
+    the OS page cache by the time they are parsed, worker threads convert
+    each source from its original location into local temp storage, and a
+    writer thread moves finished outputs into place. Outputs are renamed
+    into their final location atomically, copying to a temp file next to
+    the target first when the target is on a different filesystem. On
+    network storage this keeps the converters busy instead of waiting on
+    source reads and target writes.
+
+    With more than one worker, conversions run in a process pool so
+    CPU-bound parsing (PDF, MOBI, Markdown) is not serialized by the GIL;
+    the worker threads only hand jobs to it. One worker converts on its
+    thread.
+
+    Example:
+        >>> pipeline = BatchPipeline(cfg, workers=4)
+        >>> for result in pipeline.run(((p, None) for p in files), ['txt']):
+        ...     print(result.success)
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        workers: int = 4,
+        prefetch: int = 8,
+        prefetch_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.config = config
+        self.workers = max(1, workers)
+        self.prefetch = max(1, prefetch)
+        self.prefetch_bytes = prefetch_bytes
+
+    def run(
+        self,
+        jobs: Iterable[Tuple[Path, Optional[Path]]],
+        formats: List[str],
+    ) -> Iterator[ConversionResult]:
+        """Convert (source, output_dir) jobs to every format in formats.
+
+        Results are yielded as outputs land on disk, which is not
+        necessarily job order. Every result carries its requested format in
+        ``target_format``. Stopping iteration early shuts the stages down.
+        """
+        staging = Path(tempfile.mkdtemp(prefix='convertext-'))
+        budget = _ByteBudget(self.prefetch_bytes)
+        read_q: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        write_q: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        pool = None
+        if self.workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=process_pool_context(),
+                initializer=_init_worker,
+                initargs=(self.config,),
+            )
+
+        def put(q: queue.Queue, item) -> bool:
+            """Put unless the pipeline is shutting down."""
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def get(q: queue.Queue):
+            """Next item, or _DONE once the pipeline is shutting down."""
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return _DONE
+
+        def failed(source: Path, fmt: str, error: Exception) -> ConversionResult:
+            return ConversionResult(
+                success=False, source_path=source, target_path=None,
+                error=str(error), hops=0, target_format=fmt,
+            )
+
+        def prefetcher():
+            try:
+                for n, (source, out_dir) in enumerate(jobs):
+                    source = Path(source)
+                    try:
+                        size = source.stat().st_size
+                        if not budget.acquire(size):
+                            return
+                        _read_ahead(source)
+                    except OSError as e:
+                        for fmt in formats:
+                            results.put(failed(source, fmt, e))
+                        continue
+                    if not put(read_q, (n, source, out_dir, size)):
+                        budget.release(size)
+                        return
+            finally:
+                for _ in range(self.workers):
+                    put(read_q, _DONE)
+
+        def worker():
+            # Engines merge per-directory config files into their Config,
+            # so every worker gets its own copy.
+            engine = ConversionEngine(copy.deepcopy(self.config))
+            while True:
+                item = get(read_q)
+                if item is _DONE:
+                    put(write_q, _DONE)
+                    return
+                n, source, out_dir, size = item
+                job_dir = staging / f'job{n}'
+                try:
+                    for fmt in formats:
+                        try:
+                            result = self._convert(pool, engine, source, fmt, out_dir, job_dir)
+                        except Exception as e:
+                            result = failed(source, fmt, e)
+                        result = replace(result, target_format=fmt)
+                        if result.success:
+                            put(write_q, (result, job_dir / result.target_path.name))
+                        else:
+                            results.put(result)
+                finally:
+                    budget.release(size)
+                # Queued after this job's outputs, so the writer can drop the dir
+                put(write_q, (None, job_dir))
+
+        def writer():
+            remaining = self.workers
+            while remaining:
+                item = get(write_q)
+                if item is _DONE:
+                    if stop.is_set():
+                        return
+                    remaining -= 1
+                    continue
+                result, staged_out = item
+                if result is None:
+                    shutil.rmtree(staged_out, ignore_errors=True)
+                    continue
+                try:
+                    _atomic_move(staged_out, result.target_path)
+                except OSError as e:
+                    result = replace(result, success=False, error=str(e))
+                results.put(result)
+            results.put(_DONE)
+
+        threads = [threading.Thread(target=prefetcher, name='convertext-prefetch', daemon=True),
+                   threading.Thread(target=writer, name='convertext-writer', daemon=True)]
+        threads += [threading.Thread(target=worker, name=f'convertext-worker-{i}', daemon=True)
+                    for i in range(self.workers)]
+        for t in threads:
+            t.start()
+
+        try:
+            while True:
+                result = results.get()
+                if result is _DONE:
+                    break
+                yield result
+        finally:
+            stop.set()
+            budget.cancel()
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _convert(
+        self,
+        pool: Optional[ProcessPoolExecutor],
+        engine: ConversionEngine,
+        source: Path,
+        fmt: str,
+        out_dir: Optional[Path],
+        job_dir: Path,
+    ) -> ConversionResult:
+        """Convert source into job_dir, in the pool if there is one."""
+        # Config files are looked up from the real location
+        engine.config.load_file_config(source)
+        target = engine._get_target_path(source, fmt, out_dir)
+        if target.exists() and not engine.config.get('output.overwrite', False):
+            return ConversionResult(
+                success=False,
+                source_path=source,
+                target_path=target,
+                error="Target file already exists (use --overwrite)",
+                hops=0,
+            )
+
+        if pool is not None:
+            try:
+                result = pool.submit(_worker_convert, source, fmt, job_dir).result()
+            except BrokenProcessPool:
+                # A worker died (crash, out of memory); convert here instead
+                result = _convert_into(engine, source, fmt, job_dir)
+        else:
+            result = _convert_into(engine, source, fmt, job_dir)
+        return replace(result, target_path=target)
+
+
+def _convert_into(engine: ConversionEngine, source: Path, fmt: str, job_dir: Path) -> ConversionResult:
+    """Convert source from where it is (so relative resources resolve) into job_dir."""
+    return engine.convert(source, fmt, output_dir=job_dir)
+
+
+def _init_worker(config: Config):
+    global _worker_engine
+    from convertext.converters.loader import load_converters
+
+    load_converters()
+    _worker_engine = ConversionEngine(config)
+
+
+def _worker_convert(source: Path, fmt: str, job_dir: Path) -> ConversionResult:
+    return _convert_into(_worker_engine, source, fmt, job_dir)
+
+
+def _read_ahead(path: Path):
+    """Read path once and drop the data, leaving it in the OS page cache."""
+    with open(path, 'rb', buffering=0) as f:
+        while f.read(_READ_AHEAD_CHUNK):
+            pass
+
+
+def _atomic_move(src: Path, dst: Path):
+    """Move src to dst so dst never holds a partially written file."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        same_fs = os.stat(src).st_dev == os.stat(dst.parent).st_dev
+    except OSError:
+        same_fs = False
+
+    if same_fs:
+        os.replace(src, dst)
+        return
+
+    fd, tmp = tempfile.mkstemp(prefix=f'.{dst.name}.', suffix='.tmp', dir=dst.parent)
+    os.close(fd)
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    finally:
+        try:
+            src.unlink()
+        except OSError:
+            pass
@@ -1,14 +1,18 @@
 """CLI interface for convertext."""
 
 import click
+from itertools import chain
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from convertext import __version__
+from convertext.batch import BatchPipeline
 from convertext.config import Config
 from convertext.core import ConversionEngine
+from convertext.discovery import discover_files
 from convertext.registry import get_registry
 from convertext.converters.loader import load_converters
+from convertext.converters.ranges import PREVIEW_RANGE, ReadRange
 
 
 @click.command()
@@ -23,11 +27,54 @@ from convertext.converters.loader import load_converters
     type=click.Path(),
     help='Output directory (default: same as source)'
 )
+@click.option(
+    '--recursive', '-r',
+    type=click.Path(exists=True, file_okay=False),
+    help='Convert all files under a directory (output mirrors the tree)'
+)
+@click.option(
+    '--include',
+    multiple=True,
+    help='Glob pattern for --recursive files to convert (repeatable)'
+)
+@click.option(
+    '--exclude',
+    multiple=True,
+    help='Glob pattern for --recursive files/directories to skip (repeatable)'
+)
 @click.option(
     '--config', '-c',
     type=click.Path(exists=True),
     help='Path to custom config file'
 )
+@click.option(
+    '--jobs', '-j',
+    type=click.IntRange(min=1),
+    help='Pipelined batch mode: convert with N workers, prefetching sources and writing outputs in the background'
+)
+@click.option(
+    '--prefetch-mb',
+    type=click.IntRange(min=1),
+    default=256,
+    show_default=True,
+    help='How many source bytes --jobs mode reads ahead of the converters'
+)
+@click.option(
+    '--cache-dir',
+    type=click.Path(file_okay=False),
+    help='Cache parsed documents here so later conversions of the same source skip parsing'
+)
+@click.option(
+    '--range', 'read_range',
+    callback=lambda ctx, param, value: _check_range(value),
+    help='Convert only part of each source: native units such as PDF pages or EPUB spine items '
+         '(1-20), the first N blocks (blocks:N) or headings (headings:N); combine with commas'
+)
+@click.option(
+    '--preview',
+    is_flag=True,
+    help=f'Convert only the opening of each source (same as --range {PREVIEW_RANGE})'
+)
 @click.option(
     '--overwrite',
     is_flag=True,
@@ -62,7 +109,15 @@ def main(
     files: tuple,
     output_formats: Optional[str],
     output: Optional[str],
+    recursive: Optional[str],
+    include: tuple,
+    exclude: tuple,
     config: Optional[str],
+    jobs: Optional[int],
+    prefetch_mb: int,
+    cache_dir: Optional[str],
+    read_range: Optional[str],
+    preview: bool,
     overwrite: bool,
     list_formats: bool,
     init_config: bool,
@@ -94,7 +149,7 @@ def main(
             click.echo(f"  {source.upper()} → {', '.join(t.upper() for t in sorted(set(targets)))}")
         return
 
-    if not files:
+    if not files and not recursive:
         click.echo("Error: No input files specified")
         click.echo("Run 'convertext --help' for usage information")
         return
@@ -103,6 +158,10 @@ def main(
         click.echo("Error: No output format specified (use --format)")
         return
 
+    if jobs and keep_intermediate:
+        click.echo("Error: --keep-intermediate is not supported with --jobs")
+        return
+
     cfg = Config()
     if config:
         cfg.override(cfg._load_yaml(Path(config)))
@@ -113,37 +172,132 @@ def main(
     if overwrite:
         overrides['output'] = overrides.get('output', {})
         overrides['output']['overwrite'] = True
+    if cache_dir:
+        overrides['cache'] = {'directory': cache_dir}
+    if read_range or preview:
+        overrides['documents'] = {'range': read_range or PREVIEW_RANGE}
 
     if overrides:
         cfg.override(overrides)
 
     formats = [f.strip().lower() for f in output_formats.split(',')]
     engine = ConversionEngine(cfg, keep_intermediate=keep_intermediate)
-    source_files = [Path(f) for f in files]
+
+    sources = ((Path(f), None) for f in files)
+    if recursive:
+        root = Path(recursive)
+        patterns = include or _supported_patterns()
+        discovered = discover_files(root, include=patterns, exclude=exclude)
+        if output:
+            # Don't feed our own outputs back in when --output is inside the tree
+            out_root = Path(output).resolve()
+            discovered = (s for s in discovered if out_root not in s.resolve().parents)
+        sources = chain(sources, ((source, _mirror_dir(source, root, output)) for source in discovered))
+
+    if jobs:
+        pipeline = BatchPipeline(cfg, workers=jobs, prefetch_bytes=prefetch_mb * 1024 * 1024)
+        success_count, fail_count = _run_pipeline(pipeline, sources, formats, verbose)
+    else:
+        success_count, fail_count = _run_jobs(engine, sources, formats, verbose)
+
+    click.echo(f"\nCompleted: {success_count} successful, {fail_count} failed")
+
+
+def _check_range(value: Optional[str]) -> Optional[str]:
+    """Validate a --range spec up front rather than once per file."""
+    if value is not None:
+        try:
+            ReadRange.parse(value)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return value
+
+
+def _supported_patterns() -> tuple:
+    """Glob patterns for every registered source format."""
+    return tuple(f"*.{fmt}" for fmt in get_registry().list_supported_formats())
+
+
+def _mirror_dir(source: Path, root: Path, output: Optional[str]) -> Optional[Path]:
+    """Output directory mirroring source's position under root.
+
+    Not created here: the engine creates it when a target is written.
+    """
+    if not output:
+        return None
+    return Path(output) / source.parent.relative_to(root)
+
+
+def _run_jobs(
+    engine: ConversionEngine,
+    jobs: Iterable,
+    formats: list,
+    verbose: bool
+) -> tuple:
+    """Convert (source, output_dir) jobs as they arrive. Returns (successes, failures)."""
     success_count = 0
     fail_count = 0
 
     with click.progressbar(
-        source_files,
+        jobs,
         label='Converting files',
         show_pos=True
     ) as bar:
-        for source in bar:
+        for source, out_dir in bar:
             for fmt in formats:
-                result = engine.convert(source, fmt)
-                if result.success:
+                result = engine.convert(source, fmt, output_dir=out_dir)
+                if _report(result, fmt, verbose):
                     success_count += 1
-                    if verbose:
-                        hop_info = ""
-                        if result.hops > 1 and result.conversion_path:
-                            path_str = " → ".join(f.upper() for f in result.conversion_path)
-                            hop_info = f" ({path_str}, {result.hops} hops)"
-                        click.echo(f"\n✓ {source.name} → {result.target_path.name}{hop_info}")
                 else:
                     fail_count += 1
-                    click.echo(f"\n✗ {source.name} → {fmt}: {result.error}")
 
-    click.echo(f"\nCompleted: {success_count} successful, {fail_count} failed")
+    return success_count, fail_count
+
+
+def _run_pipeline(
+    pipeline: BatchPipeline,
+    jobs: Iterable,
+    formats: list,
+    verbose: bool
+) -> tuple:
+    """Convert jobs through the read-ahead/write-behind pipeline."""
+    success_count = 0
+    fail_count = 0
+
+    with click.progressbar(
+        pipeline.run(jobs, formats),
+        label='Converting files',
+        show_pos=True
+    ) as bar:
+        for result in bar:
+            if _report(result, result.target_format, verbose):
+                success_count += 1
+            else:
+                fail_count += 1
+
+    return success_count, fail_count
+
+
+def _report(result, fmt: str, verbose: bool) -> bool:
+    """Echo the outcome of one conversion. Returns result.success."""
+    source = result.source_path
+    if result.success:
+        if verbose:
+            hop_info = ""
+            if result.hops > 1 and result.conversion_path:
+                path_str = " → ".join(f.upper() for f in result.conversion_path)
+                hop_info = f" ({path_str}, {result.hops} hops)"
+            click.echo(f"\n✓ {source.name} → {result.target_path.name}{hop_info}")
+            if result.skipped_pages:
+                pages = ", ".join(map(str, result.skipped_pages))
+                click.echo(f"  ⚠ skipped pages: {pages}")
+            if result.blank_pages:
+                click.echo(f"  {result.blank_pages} blank or image-only pages skipped")
+            if result.encoding:
+                click.echo(f"  detected encoding: {result.encoding}")
+    else:
+        click.echo(f"\n✗ {source.name} → {fmt}: {result.error}")
+    return result.success
 
 
 if __name__ == '__main__':
@@ -17,6 +17,22 @@ class Config:
         "documents": {
             "encoding": "utf-8",
             "title_from_filename": False,
+            "range": None,
+        },
+        "cache": {
+            "directory": None,
+        },
+        "pdf": {
+            "workers": 1,
+            "page_timeout": 30,
+            "detect_headings": True,
+        },
+        "epub": {
+            "workers": 1,
+            "processes": 0,
+        },
+        "mobi": {
+            "workers": 1,
         },
     }
 
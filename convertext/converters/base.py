@@ -1,8 +1,19 @@
 """Base converter classes and intermediate document representation."""
 
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from itertools import chain
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from convertext.converters.blocks import (
+    Block, Heading, Image, Link, ListBlock, Paragraph, Run, Section, Table, Text, as_block, text_size,
+)
+from convertext.converters.charset import detect_encoding
+from convertext.converters.hints import CONFIG_KEY as HINTS_KEY, ReadHints
+from convertext.converters.images import ImageStore
+from convertext.converters.ranges import ReadRange
 
 
 class Document:
@@ -10,27 +21,86 @@ class Document:
 
     def __init__(self):
         self.metadata: Dict[str, Any] = {}
-        self.content: List[Dict[str, Any]] = []
-        self.images: Dict[str, Dict[str, Any]] = {}
+        self._content: List[Block] = []
+        self._checked = 0
+        self.images: ImageStore = ImageStore()
         self.styles: Dict[str, Any] = {}
         self.toc: List[Dict[str, Any]] = []
+        self._sections: List[Section] = []
+        self._indexed = 0
+        self._indexed_content: Optional[List[Block]] = None
+
+    @property
+    def content(self) -> List[Block]:
+        """Content blocks (an iterator for streamed Documents).
+
+        Dict blocks in the old ``{'type': ..., 'data': ...}`` form, as
+        appended by external code, are converted to Block objects on the
+        next access; only blocks added since the last access are checked.
+        """
+        content = self._content
+        if type(content) is list:
+            checked = min(self._checked, len(content))
+            for index in range(checked, len(content)):
+                block = content[index]
+                if not isinstance(block, Block):
+                    content[index] = as_block(block)
+            self._checked = len(content)
+        return content
+
+    @content.setter
+    def content(self, content: List[Block]):
+        self._content = content
+        self._checked = 0
+
+    @property
+    def sections(self) -> List[Section]:
+        """Chapter index of the content, split at level-1 headings.
+
+        The index is extended incrementally: only blocks appended since the
+        last access are scanned, so writers and readers can consult it
+        freely while content grows. Replacing ``content`` rebuilds it.
+        Streamed content has no index until materialized.
+        """
+        content = self.content
+        if not isinstance(content, list):
+            raise TypeError("Streamed Document has no section index; call materialize() first")
+        if content is not self._indexed_content or len(content) < self._indexed:
+            self._sections = []
+            self._indexed = 0
+            self._indexed_content = content
+
+        sections = self._sections
+        current = sections[-1] if sections else None
+        for index in range(self._indexed, len(content)):
+            block = content[index]
+            if isinstance(block, Heading) and block.level == 1:
+                current = Section(index, index, 1, block.data)
+                sections.append(current)
+            elif current is None:
+                current = Section(index, index)
+                sections.append(current)
+            current.end = index + 1
+            current.size += text_size(block)
+        self._indexed = len(content)
+        return sections
 
     def add_text(self, text: str, style: Optional[str] = None):
         """Add text content."""
-        self.content.append({"type": "text", "data": text, "style": style})
+        self._content.append(Text(text, style))
 
     def add_heading(self, text: str, level: int):
         """Add heading."""
-        self.content.append({"type": "heading", "data": text, "level": level})
+        self._content.append(Heading(text, level))
 
     def add_image(self, name: str, data: bytes, format: str):
         """Add image."""
-        self.images[name] = {"data": data, "format": format}
-        self.content.append({"type": "image", "name": name})
+        self.images.add_bytes(name, data, format)
+        self._content.append(Image(name))
 
-    def add_paragraph(self, text: str):
-        """Add paragraph."""
-        self.content.append({"type": "paragraph", "data": text})
+    def add_paragraph(self, text: str, spans: Optional[List[Run]] = None):
+        """Add paragraph, optionally with inline formatted spans."""
+        self._content.append(Paragraph(text, spans))
 
     def add_run(
         self,
@@ -43,42 +113,127 @@ class Document:
         font_size: Optional[int] = None,
     ):
         """Add inline text run with formatting."""
-        run_block = {
-            "type": "run",
-            "text": text,
-            "bold": bold,
-            "italic": italic,
-            "underline": underline,
-        }
-        if color:
-            run_block["color"] = color
-        if font_name:
-            run_block["font"] = font_name
-        if font_size:
-            run_block["size"] = font_size
-        self.content.append(run_block)
+        self._content.append(Run(text, bold, italic, underline, color, font_name, font_size))
 
     def add_table(
         self, rows: List[List[str]], headers: Optional[List[str]] = None
     ):
         """Add table block."""
-        table_block = {"type": "table", "rows": rows}
-        if headers:
-            table_block["headers"] = headers
-        self.content.append(table_block)
+        self._content.append(Table(rows, headers))
 
     def add_list(self, items: List[str], ordered: bool = False):
         """Add list block (ordered or unordered)."""
-        self.content.append({"type": "list", "items": items, "ordered": ordered})
+        self._content.append(ListBlock(items, ordered))
 
     def add_link(self, text: str, url: str):
         """Add hyperlink."""
-        self.content.append({"type": "link", "text": text, "url": url})
+        self._content.append(Link(text, url))
+
+    def materialize(self) -> 'Document':
+        """Return a Document with all content loaded (self for plain Documents)."""
+        return self
+
+
+class StreamingDocument(Document):
+    """Document whose content is produced lazily by a reader.
+
+    ``content`` is a one-shot iterator of blocks rather than a list. The
+    reader is a generator function taking this document; it fills in
+    ``metadata`` (and any up-front images or styles) before yielding its
+    first block. The generator is started on construction, so metadata is
+    complete before a writer consumes any content.
+
+    Writers that make a single pass over ``doc.content`` work unchanged and
+    run in constant memory. Writers that need several passes or random
+    access call ``materialize()`` first (see ``BaseConverter.buffered_formats``).
+
+    Example:
+        >>> doc = StreamingDocument(lambda d: reader._iter_txt(path, config, d))
+        >>> doc.metadata.get('title')   # available before any block is read
+    """
+
+    def __init__(self, reader: Callable[['StreamingDocument'], Iterator[Block]]):
+        super().__init__()
+        blocks = reader(self)
+        first = next(blocks, None)
+        self.content = blocks if first is None else chain((first,), blocks)
+
+    def materialize(self) -> Document:
+        """Drain the stream into a regular in-memory Document."""
+        doc = Document()
+        doc.content = list(self.content)
+        doc.metadata = self.metadata
+        doc.images = self.images
+        doc.styles = self.styles
+        doc.toc = self.toc
+        return doc
+
+
+_reports = threading.local()
+
+
+class ReadReport:
+    """What the readers noted during a conversion.
+
+    Attributes:
+        skipped_pages: 1-based numbers of pages that could not be extracted
+        blank_pages: Number of pages skipped for having no text at all
+        encoding: Encoding detected for a text source (``encoding: auto``)
+    """
+
+    __slots__ = ('skipped_pages', 'blank_pages', 'encoding')
+
+    def __init__(self):
+        self.skipped_pages: List[int] = []
+        self.blank_pages = 0
+        self.encoding: Optional[str] = None
+
+
+@contextmanager
+def collect_read_report() -> Iterator[ReadReport]:
+    """Collect what readers report during the conversions in this block.
+
+    Converters are shared between threads, so the report is per thread.
+
+    Example:
+        >>> with collect_read_report() as report:
+        ...     converter.convert(source, target, config)
+        >>> report.skipped_pages, report.blank_pages
+        ([17], 3)
+    """
+    previous = getattr(_reports, 'current', None)
+    _reports.current = report = ReadReport()
+    try:
+        yield report
+    finally:
+        _reports.current = previous
 
 
 class BaseConverter(ABC):
     """Abstract base class for all format converters."""
 
+    #: Output formats whose writers need the whole Document at once
+    #: (multi-pass layouts, record tables, page flow). Streamed input is
+    #: buffered before it reaches them; all other writers consume
+    #: ``doc.content`` as an iterator.
+    buffered_formats: Tuple[str, ...] = ()
+
+    #: Source formats whose readers apply the unit part of a read range to
+    #: their own units (pages, spine items, text records) and stop early.
+    #: For all other sources the unit range selects blocks.
+    ranged_formats: Tuple[str, ...] = ()
+
+    #: Config sections that change what the reader produces; they are part
+    #: of the parse cache key.
+    cache_sections: Tuple[str, ...] = ('documents',)
+
+    #: Target formats whose writers use ``doc.images`` (cover records,
+    #: embedded pictures), and those that use run formatting (paragraph
+    #: spans). Converters read through hint-aware readers with
+    #: ``_hinted``, which derives ``ReadHints`` from these.
+    image_formats: Tuple[str, ...] = ()
+    styled_formats: Tuple[str, ...] = ()
+
     @property
     @abstractmethod
     def input_formats(self) -> List[str]:
@@ -129,6 +284,89 @@ class BaseConverter(ABC):
         if config.get('documents', {}).get('title_from_filename', False):
             doc.metadata['title'] = source_path.stem
 
+    def _source_encoding(self, path: Path, config: Dict[str, Any]) -> str:
+        """Encoding to read a text source with (``documents.encoding``).
+
+        ``auto`` detects it from the start of the file and reports it to the
+        enclosing ``collect_read_report``, if any.
+        """
+        encoding = config.get('documents', {}).get('encoding', 'utf-8')
+        if encoding != 'auto':
+            return encoding
+        encoding = detect_encoding(path)
+        report = getattr(_reports, 'current', None)
+        if report is not None and report.encoding is None:
+            report.encoding = encoding
+        return encoding
+
+    def _hinted(self, config: Dict[str, Any], target_fmt: str) -> Dict[str, Any]:
+        """config plus read hints for what the target_fmt writer uses."""
+        return ReadHints(
+            images=target_fmt in self.image_formats,
+            styles=target_fmt in self.styled_formats,
+        ).apply(config)
+
+    def _report_read(self, doc: Document):
+        """Pass what the reader noted in ``doc.metadata`` (``skipped_pages``,
+        ``blank_pages``) on to the enclosing ``collect_read_report``, if any."""
+        report = getattr(_reports, 'current', None)
+        if report is not None:
+            report.skipped_pages.extend(doc.metadata.get('skipped_pages', ()))
+            report.blank_pages += doc.metadata.get('blank_pages', 0)
+
+    def _apply_read_range(self, doc: Document, source_path: Path, config: Dict[str, Any]):
+        """Cut doc down to the configured read range (``documents.range``).
+
+        Readers that stop early have already done most of the work; this
+        enforces the exact caps and covers readers that read everything.
+        Streamed content is limited lazily, so its reader stops as well.
+        """
+        rng = ReadRange.from_config(config)
+        if rng is None:
+            return
+        units_as_blocks = source_path.suffix.lstrip('.').lower() not in self.ranged_formats
+        if isinstance(doc.content, list):
+            rng.trim(doc.content, units_as_blocks)
+        else:
+            doc.content = rng.limit(doc.content, units_as_blocks)
+
+    def _buffer_for(self, doc: Document, target_fmt: str) -> Document:
+        """Materialize a streamed Document if target_fmt needs buffering."""
+        if target_fmt in self.buffered_formats:
+            return doc.materialize()
+        return doc
+
+    def _read_cached(
+        self,
+        read: Callable[[Path, Dict[str, Any]], Document],
+        source_path: Path,
+        config: Dict[str, Any],
+    ) -> Document:
+        """Call read(source_path, config), reusing a cached parse when enabled.
+
+        With ``cache.directory`` set, parsed Documents are stored there in the
+        binary serialization format and reloaded instead of re-parsing.
+        """
+        cache_dir = config.get('cache', {}).get('directory')
+        if not cache_dir:
+            return read(source_path, config)
+
+        from convertext.converters.serialization import DocumentCache
+
+        cache = DocumentCache(Path(cache_dir).expanduser())
+        options = {name: config.get(name, {}) for name in self.cache_sections}
+        if HINTS_KEY in config:
+            options[HINTS_KEY] = config[HINTS_KEY]
+        key = cache.key(source_path, f'{type(self).__name__}.{read.__name__}', options)
+        doc = cache.get(key)
+        if doc is None:
+            doc = read(source_path, config).materialize()
+            try:
+                cache.put(key, doc)
+            except OSError:
+                pass  # An unwritable cache must not fail the conversion
+        return doc
+
     def extract_metadata(self, source_path: Path) -> Dict[str, Any]:
         """Extract metadata from source file."""
         return {}
@@ -0,0 +1,393 @@
+"""Typed content blocks for the intermediate Document.
+
+Blocks are small ``__slots__`` objects instead of per-block dicts, which
+keeps large documents (hundreds of thousands of paragraphs) compact. Each
+block also implements the read-only ``Mapping`` interface, so external
+code can keep using ``block['type']``, ``block['data']`` and
+``block.get('level')`` exactly as it did with dict blocks, and blocks
+compare equal to the equivalent dicts. Writers dispatch on the classes and
+read attributes; dict blocks added to ``Document.content`` are converted
+with ``as_block``.
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import groupby
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+
+class Block(Mapping):
+    """Base class for Document content blocks."""
+
+    __slots__ = ()
+
+    #: Interned block type tag, shared by all instances of a class
+    type: str = ''
+    #: Mapping keys (and slot names) in dict-representation order
+    _fields: Tuple[str, ...] = ()
+    #: Keys left out of the mapping view when their value is None
+    _optional: FrozenSet[str] = frozenset()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'type':
+            return self.type
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is None and key in self._optional:
+                raise KeyError(key)
+            return value
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == 'type':
+            return self.type
+        if key in self._fields:
+            value = getattr(self, key)
+            if value is None and key in self._optional:
+                return default
+            return value
+        return default
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._fields:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'type'
+        for name in self._fields:
+            if name in self._optional and getattr(self, name) is None:
+                continue
+            yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        args = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({args})'
+
+
+def _tag(name: str) -> str:
+    return sys.intern(name)
+
+
+class Text(Block):
+    """Styled text block."""
+
+    __slots__ = ('data', 'style')
+    type = _tag('text')
+    _fields = ('data', 'style')
+
+    def __init__(self, data: str, style: Optional[str] = None):
+        self.data = data
+        self.style = style
+
+
+class Paragraph(Block):
+    """Paragraph, optionally with inline formatting.
+
+    ``data`` is always the plain text. ``spans``, when set, is a list of Run
+    blocks whose texts concatenate to ``data``; writers that support inline
+    formatting render those instead.
+    """
+
+    __slots__ = ('data', 'spans')
+    type = _tag('paragraph')
+    _fields = ('data', 'spans')
+    _optional = frozenset(('spans',))
+
+    def __init__(self, data: str, spans: Optional[List['Run']] = None):
+        self.data = data
+        self.spans = spans or None
+
+
+class Heading(Block):
+    """Heading with level 1-6."""
+
+    __slots__ = ('data', 'level')
+    type = _tag('heading')
+    _fields = ('data', 'level')
+
+    def __init__(self, data: str, level: int):
+        self.data = data
+        self.level = level
+
+
+class Run(Block):
+    """Inline text run with character formatting."""
+
+    __slots__ = ('text', 'bold', 'italic', 'underline', 'color', 'font', 'size')
+    type = _tag('run')
+    _fields = ('text', 'bold', 'italic', 'underline', 'color', 'font', 'size')
+    _optional = frozenset(('color', 'font', 'size'))
+
+    def __init__(
+        self,
+        text: str,
+        bold: bool = False,
+        italic: bool = False,
+        underline: bool = False,
+        color: Optional[str] = None,
+        font: Optional[str] = None,
+        size: Optional[int] = None,
+    ):
+        self.text = text
+        self.bold = bold
+        self.italic = italic
+        self.underline = underline
+        self.color = color or None
+        self.font = font or None
+        self.size = size or None
+
+    @property
+    def style_key(self) -> tuple:
+        """Formatting attributes; runs with equal keys render identically."""
+        return (self.bold, self.italic, self.underline, self.color, self.font, self.size)
+
+
+_PLAIN_STYLE = (False, False, False, None, None, None)
+
+
+def merge_runs(runs: Iterable[Run], strip: bool = True) -> List[Run]:
+    """Coalesce adjacent runs with identical formatting into single spans.
+
+    Empty runs are dropped. With ``strip``, whitespace is trimmed from the
+    start of the first span and the end of the last, mirroring the
+    ``text.strip()`` readers apply to plain paragraphs.
+    """
+    merged = [
+        Run(''.join(run.text for run in group), *key)
+        for key, group in groupby((run for run in runs if run.text), key=lambda run: run.style_key)
+    ]
+    if strip:
+        while merged and not merged[0].text.strip():
+            merged.pop(0)
+        while merged and not merged[-1].text.strip():
+            merged.pop()
+        if merged:
+            merged[0].text = merged[0].text.lstrip()
+            merged[-1].text = merged[-1].text.rstrip()
+    return merged
+
+
+def is_plain(spans: List[Run]) -> bool:
+    """True if the spans carry no formatting at all."""
+    return all(run.style_key == _PLAIN_STYLE for run in spans)
+
+
+class TableRows(Sequence):
+    """Read-only row view of a Table; row lists are built on access."""
+
+    __slots__ = ('_table',)
+
+    def __init__(self, table: 'Table'):
+        self._table = table
+
+    def __len__(self) -> int:
+        return self._table.nrows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._table.row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('table row index out of range')
+        return self._table.row(index)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return self._table.iter_rows()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(
+                row == list(o) for row, o in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'TableRows({list(self)!r})'
+
+
+class Table(Block):
+    """Table with optional header row, stored column-wise.
+
+    Cells are interned in a per-table string list and each column is an
+    ``array('I')`` of indexes into it, so a cell costs 4 bytes and repeated
+    values (blanks, units, yes/no) are stored once. ``rows`` is a lazy
+    ``TableRows`` view; iterating it yields one row list at a time. Rows
+    shorter than the widest row keep their own length.
+    """
+
+    __slots__ = ('strings', 'columns', 'widths', 'headers', '_lookup')
+    type = _tag('table')
+    _fields = ('rows', 'headers')
+    _optional = frozenset(('headers',))
+
+    def __init__(self, rows: Iterable[Sequence[Any]] = (), headers: Optional[List[str]] = None):
+        self.headers = headers or None
+        self._reset()
+        self.extend(rows)
+
+    def _reset(self):
+        self.strings: List[str] = ['']
+        self._lookup: Dict[str, int] = {'': 0}
+        self.columns: List[array] = []
+        self.widths = array('I')
+
+    @property
+    def rows(self) -> TableRows:
+        return TableRows(self)
+
+    @rows.setter
+    def rows(self, rows: Iterable[Sequence[Any]]):
+        self._reset()
+        self.extend(rows)
+
+    @property
+    def nrows(self) -> int:
+        return len(self.widths)
+
+    def extend(self, rows: Iterable[Sequence[Any]]):
+        """Append rows in bulk. Cells are stored as strings."""
+        strings = self.strings
+        lookup = self._lookup
+        columns = self.columns
+        widths = self.widths
+        for row in rows:
+            width = len(row)
+            while len(columns) < width:
+                columns.append(array('I', bytes(4 * len(widths))))
+            for col, cell in zip(columns, row):
+                if type(cell) is not str:
+                    cell = str(cell)
+                index = lookup.get(cell)
+                if index is None:
+                    index = lookup[cell] = len(strings)
+                    strings.append(cell)
+                col.append(index)
+            for col in columns[width:]:
+                col.append(0)
+            widths.append(width)
+
+    def row(self, index: int) -> List[str]:
+        """Cells of one row."""
+        strings = self.strings
+        return [strings[col[index]] for col in self.columns[:self.widths[index]]]
+
+    def iter_rows(self) -> Iterator[List[str]]:
+        """Yield rows in order without materializing the table."""
+        strings = self.strings
+        ncols = len(self.columns)
+        if not ncols:
+            for _ in self.widths:
+                yield []
+            return
+        for width, indexes in zip(self.widths, zip(*self.columns)):
+            if width != ncols:
+                indexes = indexes[:width]
+            yield [strings[i] for i in indexes]
+
+
+class ListBlock(Block):
+    """Ordered or unordered list."""
+
+    __slots__ = ('items', 'ordered')
+    type = _tag('list')
+    _fields = ('items', 'ordered')
+
+    def __init__(self, items: List[str], ordered: bool = False):
+        self.items = items
+        self.ordered = ordered
+
+
+class Link(Block):
+    """Hyperlink."""
+
+    __slots__ = ('text', 'url')
+    type = _tag('link')
+    _fields = ('text', 'url')
+
+    def __init__(self, text: str, url: str):
+        self.text = text
+        self.url = url
+
+
+class Image(Block):
+    """Reference to an entry in Document.images."""
+
+    __slots__ = ('name',)
+    type = _tag('image')
+    _fields = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+_BLOCK_CLASSES: Dict[str, type] = {
+    cls.type: cls for cls in (Text, Paragraph, Heading, Run, Table, ListBlock, Link, Image)
+}
+
+
+def as_block(block: Any) -> Any:
+    """Block equivalent to a dict block (``{'type': 'paragraph', 'data': ...}``).
+
+    Blocks, and anything that is not a mapping of a known block type, are
+    returned unchanged.
+    """
+    if isinstance(block, Block) or not isinstance(block, Mapping):
+        return block
+    cls = _BLOCK_CLASSES.get(block.get('type'))
+    if cls is None:
+        return block
+    fields = {name: block[name] for name in cls._fields if name in block}
+    if cls is Paragraph and fields.get('spans'):
+        fields['spans'] = [as_block(run) for run in fields['spans']]
+    return cls(**fields)
+
+
+def text_size(block: Block) -> int:
+    """Approximate size of a block's text, for sizing output ahead of time."""
+    if isinstance(block, Table):
+        strings = block.strings
+        size = sum(len(strings[i]) for col in block.columns for i in col)
+        return size + sum(map(len, block.headers or ()))
+    if isinstance(block, ListBlock):
+        return sum(map(len, block.items))
+    if isinstance(block, Link):
+        return len(block.text) + len(block.url)
+    text = getattr(block, 'data', None) or getattr(block, 'text', None)
+    return len(text) if isinstance(text, str) else 0
+
+
+class Section:
+    """A chapter of a Document: the blocks ``content[start:end]``.
+
+    A section opens at a level-1 heading (``level`` 1, ``title`` its text)
+    and runs to the next one. Content before the first level-1 heading forms
+    an untitled leading section with ``level`` 0. ``size`` is the summed
+    ``text_size`` of its blocks.
+    """
+
+    __slots__ = ('start', 'end', 'level', 'title', 'size')
+
+    def __init__(self, start: int, end: int, level: int = 0,
+                 title: Optional[str] = None, size: int = 0):
+        self.start = start
+        self.end = end
+        self.level = level
+        self.title = title
+        self.size = size
+
+    def __repr__(self) -> str:
+        return (f'Section(start={self.start}, end={self.end}, level={self.level}, '
+                f'title={self.title!r}, size={self.size})')
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Section):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
@@ -0,0 +1,99 @@
+"""Encoding detection for text sources (``documents.encoding: auto``).
+
+Only a bounded prefix of the file is read. Detection checks, in order:
+
+1. A byte order mark (UTF-8, UTF-16, UTF-32).
+2. NUL bytes in every other position, which mark BOM-less UTF-16.
+3. A UTF-8 validity pass over the prefix; pure ASCII counts as UTF-8.
+4. Otherwise a single-byte encoding: CP1252, unless the prefix uses a byte
+   CP1252 leaves undefined, then Latin-1 (which decodes any byte).
+
+Example:
+    >>> detect_encoding(Path('notes.txt'))
+    'cp1252'
+"""
+
+import codecs
+from pathlib import Path
+
+#: Bytes read from the start of a file to detect its encoding
+SAMPLE_SIZE = 64 * 1024
+
+# Longest first, so UTF-32 LE is not taken for UTF-16 LE
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# Bytes with no character in CP1252
+_CP1252_UNDEFINED = frozenset(b'\x81\x8d\x8f\x90\x9d')
+# Share of NUL bytes in one byte position that marks UTF-16 text
+_UTF16_NULS = 0.3
+
+
+def detect_encoding(path: Path, sample_size: int = SAMPLE_SIZE) -> str:
+    """Best guess at the encoding of a text file, from its first bytes."""
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+    return detect_bytes_encoding(sample, complete=len(sample) < sample_size)
+
+
+def detect_bytes_encoding(sample: bytes, complete: bool = True) -> str:
+    """Best guess at the encoding of sample.
+
+    Args:
+        sample: The data, or a prefix of it
+        complete: Whether sample is all of the data; if not, a multibyte
+            sequence cut off at its end is not held against UTF-8
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    utf16 = _utf16_without_bom(sample)
+    if utf16:
+        return utf16
+
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    if _CP1252_UNDEFINED.intersection(sample):
+        return 'latin-1'
+    return 'cp1252'
+
+
+def _utf16_without_bom(sample: bytes) -> str:
+    """'utf-16-le' or 'utf-16-be' if NULs fill one byte position, else ''."""
+    pairs = len(sample) // 2
+    if not pairs or b'\x00' not in sample:
+        return ''
+    even, odd = sample[0::2].count(0), sample[1::2].count(0)
+    if odd >= pairs * _UTF16_NULS and even * 10 <= odd:
+        return 'utf-16-le'
+    if even >= pairs * _UTF16_NULS and odd * 10 <= even:
+        return 'utf-16-be'
+    return ''
+
+
+def libxml2_encoding(encoding: str) -> str:
+    """The name libxml2 (lxml's parsers) knows a Python codec by.
+
+    libxml2 takes most Python names but not, for example, ``utf-8-sig``
+    (it skips a UTF-8 BOM itself), ``latin-1`` or ``utf-16-le``.
+    """
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return encoding
+    if name == 'utf-8-sig':
+        return 'utf-8'
+    if name.startswith('iso8859-'):
+        return 'iso-8859-' + name[len('iso8859-'):]
+    if name.startswith('utf-') and name.endswith(('-le', '-be')):
+        return name[:-3] + name[-2:]
+    return name
@@ -1,16 +1,33 @@
 """DOCX format converter."""
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import docx
+from lxml import etree
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Run, Table, Text, is_plain, merge_runs
+from convertext.converters.hints import ReadHints
+from convertext.converters.utils import LineWriter, run_to_html, run_to_markdown
+
+_W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+_W_NS = {'w': _W}
+_W_TR, _W_TC, _W_P = f'{{{_W}}}tr', f'{{{_W}}}tc', f'{{{_W}}}p'
+_W_T, _W_TAB, _W_PTAB, _W_CR, _W_BR = (f'{{{_W}}}{n}' for n in ('t', 'tab', 'ptab', 'cr', 'br'))
+_W_NO_BREAK_HYPHEN = f'{{{_W}}}noBreakHyphen'
+_W_VAL, _W_TYPE = f'{{{_W}}}val', f'{{{_W}}}type'
+_RUN_ITEMS = etree.XPath('w:r/* | w:hyperlink/w:r/*', namespaces=_W_NS)
+_GRID_BEFORE = etree.XPath('string(w:trPr/w:gridBefore/@w:val)', namespaces=_W_NS)
+_GRID_SPAN = etree.XPath('string(w:tcPr/w:gridSpan/@w:val)', namespaces=_W_NS)
+_V_MERGE = etree.XPath('w:tcPr/w:vMerge', namespaces=_W_NS)
 
 
 class DocxConverter(BaseConverter):
     """DOCX/DOC format converter."""
 
+    styled_formats = ('html', 'md')
+
     @property
     def input_formats(self) -> List[str]:
         return ['docx', 'doc']
@@ -24,10 +41,11 @@ class DocxConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert DOCX to target format."""
-        doc = self._read_docx(source_path, config)
+        target_fmt = target_path.suffix.lstrip('.').lower()
+        doc = self._read_cached(self._read_docx, source_path, self._hinted(config, target_fmt))
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
-        target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
             return self._write_txt(doc, target_path)
         elif target_fmt == 'html':
@@ -40,6 +58,7 @@ class DocxConverter(BaseConverter):
     def _read_docx(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read DOCX into intermediate Document with full formatting."""
         doc = Document()
+        hints = ReadHints.from_config(config)
         docx_doc = docx.Document(path)
 
         core_props = docx_doc.core_properties
@@ -48,6 +67,8 @@ class DocxConverter(BaseConverter):
             'author': core_props.author or '',
             'subject': core_props.subject or '',
         }
+        if not hints.content:
+            return doc
 
         for para in docx_doc.paragraphs:
             if para.style.name.startswith('Heading'):
@@ -63,38 +84,27 @@ class DocxConverter(BaseConverter):
 
             else:
                 if para.text.strip():
-                    if len(para.runs) == 1 and not any([
-                        para.runs[0].bold,
-                        para.runs[0].italic,
-                        para.runs[0].underline
-                    ]):
-                        doc.add_paragraph(para.text.strip())
-                    else:
-                        for run in para.runs:
-                            if run.text.strip():
-                                color = None
-                                if run.font.color and run.font.color.rgb:
-                                    rgb = run.font.color.rgb
-                                    color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
-
-                                doc.add_run(
-                                    text=run.text,
-                                    bold=run.bold or False,
-                                    italic=run.italic or False,
-                                    underline=run.underline or False,
-                                    color=color,
-                                    font_name=run.font.name,
-                                    font_size=int(run.font.size.pt) if run.font.size else None
-                                )
+                    if not hints.styles:
+                        # Text only: skip the per-run formatting lookups
+                        text = ''.join(_run_item_text(e) for e in _RUN_ITEMS(para._p)).strip()
+                        if text:
+                            doc.add_paragraph(text)
+                        continue
+                    # One paragraph block per source paragraph; Word splits
+                    # runs freely, so equally formatted neighbours are merged
+                    spans = merge_runs(_iter_runs(para))
+                    text = ''.join(span.text for span in spans)
+                    doc.add_paragraph(text, None if is_plain(spans) else spans)
 
         for table in docx_doc.tables:
-            rows = []
-            for row in table.rows:
-                row_data = [cell.text.strip() for cell in row.cells]
-                rows.append(row_data)
-
-            if rows:
-                doc.add_table(rows=rows[1:], headers=rows[0] if len(rows) > 1 else None)
+            rows = _table_rows(table._tbl)
+            first = next(rows, None)
+            if first is not None:
+                block = Table(rows)
+                # The first row is the header unless it is the only row
+                if block.nrows:
+                    block.headers = first or None
+                doc.content.append(block)
 
         return doc
 
@@ -106,42 +116,44 @@ class DocxConverter(BaseConverter):
                 f.write('=' * len(doc.metadata['title']) + '\n\n')
 
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('\n' + block['data'].upper() + '\n')
-                    f.write('-' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('\n' + block.data.upper() + '\n')
+                    f.write('-' * len(block.data) + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
-        else:
-            html_parts.append('<title>Document</title>')
-
-        html_parts.append('</head>')
-        html_parts.append('<body>')
-
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
-
-        html_parts.append('</body>')
-        html_parts.append('</html>')
-
         with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+            ])
+
+            if doc.metadata.get('title'):
+                html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
+            else:
+                html_parts.append('<title>Document</title>')
+
+            html_parts.append('</head>')
+            html_parts.append('<body>')
+
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    if block.spans:
+                        html_parts.append('<p>' + ''.join(map(run_to_html, block.spans)) + '</p>')
+                    else:
+                        html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
+
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -154,10 +166,13 @@ class DocxConverter(BaseConverter):
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    if block.spans:
+                        f.write(''.join(map(run_to_markdown, block.spans)) + '\n\n')
+                    else:
+                        f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
@@ -168,3 +183,69 @@ class DocxConverter(BaseConverter):
                 .replace('>', '&gt;')
                 .replace('"', '&quot;')
                 .replace("'", '&#39;'))
+
+
+def _iter_runs(para) -> Iterator[Run]:
+    """Formatted runs of a paragraph, including those inside hyperlinks."""
+    for item in para.iter_inner_content():
+        for run in getattr(item, 'runs', None) or (item,):
+            color = None
+            if run.font.color and run.font.color.rgb:
+                rgb = run.font.color.rgb
+                color = f"#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"
+
+            yield Run(
+                run.text,
+                bold=run.bold or False,
+                italic=run.italic or False,
+                underline=run.underline or False,
+                color=color,
+                font=run.font.name,
+                size=int(run.font.size.pt) if run.font.size else None,
+            )
+
+
+def _table_rows(tbl) -> Iterator[List[str]]:
+    """Yield stripped cell texts per row, read straight from the table XML.
+
+    Matches python-docx's ``row.cells`` (a horizontally spanned cell repeats
+    its text per grid column, a vertically merged cell repeats the text of
+    the cell above) using compiled XPath instead of per-cell proxy objects,
+    which is several times faster on tables with thousands of rows.
+    """
+    above: Dict[int, tuple] = {}
+    for tr in tbl.iterchildren(_W_TR):
+        row: List[str] = []
+        current: Dict[int, tuple] = {}
+        offset = int(_GRID_BEFORE(tr) or 0)
+        for tc in tr.iterchildren(_W_TC):
+            span = int(_GRID_SPAN(tc) or 1)
+            merge = _V_MERGE(tc)
+            if merge and (merge[0].get(_W_VAL) or 'continue') == 'continue':
+                text, span = above.get(offset, ('', span))
+            else:
+                text = '\n'.join(
+                    ''.join(_run_item_text(e) for e in _RUN_ITEMS(p))
+                    for p in tc.iterchildren(_W_P)
+                ).strip()
+            row.extend([text] * span)
+            current[offset] = (text, span)
+            offset += span
+        above = current
+        yield row
+
+
+def _run_item_text(element) -> str:
+    """Text of a run child, as python-docx's Run.text renders it."""
+    tag = element.tag
+    if tag == _W_T:
+        return element.text or ''
+    if tag in (_W_TAB, _W_PTAB):
+        return '\t'
+    if tag == _W_CR:
+        return '\n'
+    if tag == _W_BR:
+        return '\n' if element.get(_W_TYPE, 'textWrapping') == 'textWrapping' else ''
+    if tag == _W_NO_BREAK_HYPHEN:
+        return '-'
+    return ''
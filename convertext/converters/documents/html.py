@@ -1,11 +1,17 @@
 """HTML format converter."""
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from convertext.converters.base import BaseConverter, Document
+from convertext.converters.base import BaseConverter, Document, StreamingDocument
+from convertext.converters.blocks import Block, Heading, Paragraph, Text
+from convertext.converters.charset import libxml2_encoding
+from convertext.converters.html_reader import BLOCK_TAGS as _BLOCK_TAGS
+
+# Text of the opening blocks held back while looking for an <h1> title
+_TITLE_LOOKAHEAD = 64 * 1024
 
 
 class HtmlConverter(BaseConverter):
@@ -24,8 +30,9 @@ class HtmlConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert HTML to target format."""
-        doc = self._read_html(source_path, config)
+        doc = StreamingDocument(lambda d: self._iter_html(source_path, config, d))
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
@@ -37,32 +44,74 @@ class HtmlConverter(BaseConverter):
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read HTML into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-            elif element.name == 'p':
-                text = element.get_text().strip()
+        return StreamingDocument(lambda d: self._iter_html(path, config, d)).materialize()
+
+    def _iter_html(self, path: Path, config: Dict[str, Any], doc: Document) -> Iterator[Block]:
+        """Yield paragraphs and headings while parsing the file incrementally.
+
+        Elements are discarded as soon as they have been handled, so memory
+        stays flat regardless of file size. Without a <title>, the opening
+        blocks are held back until the first <h1> supplies one, for at most
+        ``_TITLE_LOOKAHEAD`` characters of text; the file is read once.
+        """
+        encoding = self._source_encoding(path, config)
+        title_seen = False
+        started = False
+        pending: List[Block] = []
+        pending_size = 0
+        depth = 0  # open p/h* elements around the current position
+
+        context = etree.iterparse(
+            str(path), events=('start', 'end'), html=True,
+            encoding=libxml2_encoding(encoding), huge_tree=True,
+        )
+        for event, element in context:
+            tag = element.tag
+            if event == 'start':
+                if tag in _BLOCK_TAGS:
+                    depth += 1
+                continue
+
+            block = None
+            if tag in _BLOCK_TAGS:
+                depth -= 1
+                text = ''.join(element.itertext()).strip()
+                if tag == 'p':
+                    if text:
+                        block = Paragraph(text)
+                else:
+                    block = Heading(text, int(tag[1]))
+            elif tag == 'title' and not title_seen:
+                title_seen = True
+                text = ''.join(element.itertext()).strip()
                 if text:
-                    doc.add_paragraph(text)
-
-        return doc
+                    doc.metadata['title'] = text
+
+            if depth == 0:
+                # Children of an open block are still needed for its text
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+
+            if block is None:
+                continue
+            if started:
+                yield block
+                continue
+
+            # Metadata has to be final before the first block goes out
+            title_seen = True
+            if tag == 'h1' and text and 'title' not in doc.metadata:
+                doc.metadata['title'] = text
+            pending.append(block)
+            pending_size += len(block.data)
+            if 'title' in doc.metadata or tag == 'h1' or pending_size > _TITLE_LOOKAHEAD:
+                started = True
+                yield from pending
+                pending = []
+        yield from pending
 
     def _write_txt(self, doc: Document, path: Path) -> bool:
         """Write Document to plain text."""
@@ -72,11 +121,11 @@ class HtmlConverter(BaseConverter):
                 f.write('=' * len(doc.metadata['title']) + '\n\n')
 
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('\n' + block['data'].upper() + '\n')
-                    f.write('-' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('\n' + block.data.upper() + '\n')
+                    f.write('-' * len(block.data) + '\n\n')
         return True
 
     def _write_md(self, doc: Document, path: Path) -> bool:
@@ -86,8 +135,9 @@ class HtmlConverter(BaseConverter):
                 f.write(f"# {doc.metadata['title']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
+
@@ -1,12 +1,22 @@
 """Markdown format converter."""
 
+import re
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import markdown
-from bs4 import BeautifulSoup
 
-from convertext.converters.base import BaseConverter, Document
+from convertext.converters.base import BaseConverter, Document, StreamingDocument
+from convertext.converters.blocks import Block, Heading, Paragraph, Text
+from convertext.converters.markdown_reader import iter_markdown, reference_definitions
+from convertext.converters.utils import LineWriter
+
+# Sources are rendered in pieces of roughly this many characters
+_CHUNK_CHARS = 64 * 1024
+_LIST_ITEM = re.compile(r'(?:[*+-]|\d+[.)])\s')
+# Raw HTML blocks run until their element closes, blank lines included
+_HTML_BLOCK = re.compile(r'<([A-Za-z][A-Za-z0-9-]*)[\s/>]|<([A-Za-z][A-Za-z0-9-]*)$')
+_HTML_BLOCK_TAGS = frozenset(markdown.Markdown().block_level_elements)
 
 
 class MarkdownConverter(BaseConverter):
@@ -25,8 +35,9 @@ class MarkdownConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert Markdown to target format."""
-        doc = self._read_markdown(source_path, config)
+        doc = StreamingDocument(lambda d: self._iter_markdown(source_path, config, d))
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'html':
@@ -38,48 +49,50 @@ class MarkdownConverter(BaseConverter):
 
     def _read_markdown(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read Markdown into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
+        return StreamingDocument(lambda d: self._iter_markdown(path, config, d)).materialize()
 
-        html_content = markdown.markdown(content)
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def _iter_markdown(self, path: Path, config: Dict[str, Any], doc: Document) -> Iterator[Block]:
+        """Yield paragraphs and headings, rendering the source chunk by chunk.
 
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text(), level)
-            elif element.name == 'p':
-                doc.add_paragraph(element.get_text())
+        Files over one chunk are read twice: reference-style links may be
+        defined in any chunk, so a first pass collects the definitions.
+        """
+        encoding = self._source_encoding(path, config)
 
-        return doc
+        with open(path, 'r', encoding=encoding) as f:
+            references = None
+            if path.stat().st_size > _CHUNK_CHARS:
+                # Links may refer to definitions in any chunk: collect them first
+                references = {}
+                for chunk in _markdown_chunks(f, _CHUNK_CHARS):
+                    references.update(reference_definitions(chunk))
+                f.seek(0)
+            for chunk in _markdown_chunks(f, _CHUNK_CHARS):
+                yield from iter_markdown(chunk, references=references)
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-            '<title>Document</title>',
-            '</head>',
-            '<body>'
-        ]
-
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
-
-        html_parts.append('</body>')
-        html_parts.append('</html>')
-
         with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+                '<title>Document</title>',
+                '</head>',
+                '<body>'
+            ])
+
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
+
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -87,11 +100,11 @@ class MarkdownConverter(BaseConverter):
         """Write Document to plain text."""
         with open(path, 'w', encoding='utf-8') as f:
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write(block['data'].upper() + '\n')
-                    f.write('=' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write(block.data.upper() + '\n')
+                    f.write('=' * len(block.data) + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
@@ -102,3 +115,59 @@ class MarkdownConverter(BaseConverter):
                 .replace('>', '&gt;')
                 .replace('"', '&quot;')
                 .replace("'", '&#39;'))
+
+
+def _markdown_chunks(lines: Iterable[str], size: int) -> Iterator[str]:
+    """Split Markdown source into pieces that render independently.
+
+    A chunk only ends once it holds at least ``size`` characters, at a blank
+    line outside any fenced code block, raw HTML block or HTML comment that
+    is followed by an unindented line not starting a list item, so no
+    paragraph, list, code or HTML block is cut. Files smaller than ``size``
+    come back as a single chunk.
+    """
+    chunk: List[str] = []
+    length = 0
+    fence = None
+    html: Optional[str] = None
+    depth = 0
+    after_blank = False
+
+    for line in lines:
+        if (after_blank and length >= size and line.strip()
+                and not line[0].isspace() and not _LIST_ITEM.match(line)):
+            yield ''.join(chunk)
+            chunk = []
+            length = 0
+
+        stripped = line.lstrip()
+        if stripped.startswith(('```', '~~~')):
+            if fence is None:
+                fence = stripped[:3]
+            elif stripped.startswith(fence):
+                fence = None
+
+        if html is None and fence is None and (after_blank or not chunk):
+            if line.startswith('<!--'):
+                html, depth = '--', 0
+            else:
+                match = _HTML_BLOCK.match(line.rstrip('\n'))
+                tag = match and (match.group(1) or match.group(2)).lower()
+                if tag in _HTML_BLOCK_TAGS:
+                    html, depth = tag, 0
+        if html == '--':
+            if '-->' in line:
+                html = None
+        elif html is not None:
+            lowered = line.lower()
+            depth += (len(re.findall(rf'<{html}[\s/>]|<{html}$', lowered))
+                      - len(re.findall(rf'</{html}\s*>', lowered)))
+            if depth <= 0:
+                html = None
+
+        chunk.append(line)
+        length += len(line)
+        after_blank = fence is None and html is None and not line.strip()
+
+    if chunk:
+        yield ''.join(chunk)
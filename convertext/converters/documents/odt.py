@@ -6,6 +6,14 @@ import zipfile
 from lxml import etree
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.hints import ReadHints
+from convertext.converters.ranges import ReadRange
+from convertext.converters.utils import LineWriter
+
+
+_DRAW_IMAGE = '{urn:oasis:names:tc:opendocument:xmlns:drawing:1.0}image'
+_XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
 
 
 class OdtConverter(BaseConverter):
@@ -24,10 +32,11 @@ class OdtConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert ODT to target format."""
-        doc = self._read_odt(source_path, config)
+        target_fmt = target_path.suffix.lstrip('.').lower()
+        doc = self._read_odt(source_path, self._hinted(config, target_fmt))
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
-        target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
             return self._write_txt(doc, target_path)
         elif target_fmt == 'html':
@@ -38,8 +47,14 @@ class OdtConverter(BaseConverter):
         return False
 
     def _read_odt(self, path: Path, config: Dict[str, Any]) -> Document:
-        """Read ODT - native parser using zipfile + lxml."""
+        """Read ODT - native parser using zipfile + lxml.
+
+        Only meta.xml and content.xml are inflated; styles.xml never is.
+        Pictures are referenced, not read, and only when the hints ask for
+        images.
+        """
         doc = Document()
+        hints = ReadHints.from_config(config)
 
         with zipfile.ZipFile(path, 'r') as zf:
             # Parse metadata
@@ -61,19 +76,34 @@ class OdtConverter(BaseConverter):
             except:
                 pass
 
-            # Parse content
-            content_xml = etree.fromstring(zf.read('content.xml'))
+            if not hints.content:
+                return doc
+            members = set(zf.namelist()) if hints.images else set()
+
+            # Parse content incrementally: top-level elements of the text body
+            # are converted as they complete, so a read range can stop early
             ns = {
                 'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
                 'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
             }
+            office_text = f"{{{ns['office']}}}text"
+            office_body = f"{{{ns['office']}}}body"
+            rng = ReadRange.from_config(config)
+
+            with zf.open('content.xml') as content_file:
+                for _, elem in etree.iterparse(content_file, events=('end',)):
+                    parent = elem.getparent()
+                    if parent is None or parent.tag != office_text:
+                        continue
+                    grandparent = parent.getparent()
+                    if grandparent is None or grandparent.tag != office_body:
+                        continue
 
-            body = content_xml.find('.//office:body/office:text', ns)
-            if body is not None:
-                # Process headings and paragraphs in order
-                for elem in body:
                     tag = elem.tag.replace('{urn:oasis:names:tc:opendocument:xmlns:text:1.0}', '')
 
+                    if members:
+                        self._reference_images(elem, doc, path, members)
+
                     if tag == 'h':
                         # Heading
                         text = self._extract_text(elem).strip()
@@ -100,15 +130,31 @@ class OdtConverter(BaseConverter):
                             else:
                                 doc.add_paragraph(text)
 
+                    elem.clear()
+                    while elem.getprevious() is not None:
+                        del parent[0]
+                    if rng and rng.full(doc.content, units_as_blocks=True):
+                        break
+
         return doc
 
+    def _reference_images(self, element, doc: Document, path: Path, members):
+        """Add the archive pictures under element to doc.images, unread."""
+        for image in element.iter(_DRAW_IMAGE):
+            member = image.get(_XLINK_HREF, '')
+            if member in members:
+                fmt = member.rsplit('.', 1)[-1].lower().replace('jpeg', 'jpg')
+                doc.images.add_zip_member(member, path, member, fmt)
+
     def _extract_text(self, element) -> str:
         """Extract all text from an XML element."""
         text_parts = []
         if element.text:
             text_parts.append(element.text)
         for child in element:
-            text_parts.append(self._extract_text(child))
+            # Inline image data (office:binary-data) is not text
+            if child.tag != _DRAW_IMAGE:
+                text_parts.append(self._extract_text(child))
             if child.tail:
                 text_parts.append(child.tail)
         return ''.join(text_parts)
@@ -123,47 +169,46 @@ class OdtConverter(BaseConverter):
                 f.write(f"By: {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('\n' + block['data'].upper() + '\n')
-                    f.write('-' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('\n' + block.data.upper() + '\n')
+                    f.write('-' * len(block.data) + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
-        else:
-            html_parts.append('<title>Document</title>')
-
-        html_parts.append('</head>')
-        html_parts.append('<body>')
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<h1>{self._escape_html(doc.metadata['title'])}</h1>")
-        if doc.metadata.get('author'):
-            html_parts.append(f"<p><em>By {self._escape_html(doc.metadata['author'])}</em></p>")
-
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
-
-        html_parts.append('</body>')
-        html_parts.append('</html>')
-
         with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+            ])
+
+            if doc.metadata.get('title'):
+                html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
+            else:
+                html_parts.append('<title>Document</title>')
+
+            html_parts.append('</head>')
+            html_parts.append('<body>')
+
+            if doc.metadata.get('title'):
+                html_parts.append(f"<h1>{self._escape_html(doc.metadata['title'])}</h1>")
+            if doc.metadata.get('author'):
+                html_parts.append(f"<p><em>By {self._escape_html(doc.metadata['author'])}</em></p>")
+
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
+
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -176,10 +221,10 @@ class OdtConverter(BaseConverter):
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * (block['level'] + 1) + ' ' + block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * (block.level + 1) + ' ' + block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
@@ -3,14 +3,20 @@
 from pathlib import Path
 from typing import Any, Dict, List
 
-import pypdf
-
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.documents.pdf_extract import PdfTextExtractor
+from convertext.converters.documents.pdf_headings import FontHistogram, classify_pages, group_lines
+from convertext.converters.ranges import ReadRange
+from convertext.converters.utils import LineWriter
 
 
 class PDFConverter(BaseConverter):
     """PDF format converter."""
 
+    ranged_formats = ('pdf',)
+    cache_sections = ('documents', 'pdf')
+
     @property
     def input_formats(self) -> List[str]:
         return ['pdf']
@@ -24,8 +30,10 @@ class PDFConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert PDF to target format."""
-        doc = self._read_pdf(source_path, config)
+        doc = self._read_cached(self._read_pdf, source_path, config)
+        self._report_read(doc)
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
@@ -41,8 +49,8 @@ class PDFConverter(BaseConverter):
         """Read PDF into intermediate Document."""
         doc = Document()
 
-        with open(path, 'rb') as f:
-            reader = pypdf.PdfReader(f)
+        with PdfTextExtractor.from_config(path, config) as extractor:
+            reader = extractor.reader
 
             if reader.metadata:
                 doc.metadata = {
@@ -51,10 +59,29 @@ class PDFConverter(BaseConverter):
                     'subject': reader.metadata.get('/Subject', ''),
                 }
 
-            for page in reader.pages:
-                text = page.extract_text()
-                if text.strip():
-                    doc.add_paragraph(text)
+            rng = ReadRange.from_config(config)
+            count = len(reader.pages)
+            pages = rng.units(count) if rng else range(count)
+            fonts = FontHistogram() if config.get('pdf', {}).get('detect_headings', True) else None
+            capped = rng is not None and (rng.blocks is not None or rng.headings is not None)
+            for index, lines in classify_pages(extractor, pages, fonts, incremental=capped):
+                if lines is None:
+                    doc.add_text(f'[Page {index + 1} skipped: {extractor.errors[index]}]', 'skipped-page')
+                    continue
+                for level, texts in group_lines(lines):
+                    if level:
+                        doc.add_heading(' '.join(t.strip() for t in texts), level)
+                        continue
+                    text = '\n'.join(texts)
+                    if text.strip():
+                        doc.add_paragraph(text)
+                if rng and rng.full(doc.content):
+                    break
+
+            if extractor.errors:
+                doc.metadata['skipped_pages'] = extractor.skipped_pages()
+            if extractor.blank:
+                doc.metadata['blank_pages'] = len(extractor.blank)
 
         return doc
 
@@ -62,41 +89,40 @@ class PDFConverter(BaseConverter):
         """Write Document to plain text."""
         with open(path, 'w', encoding='utf-8') as f:
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
-        else:
-            html_parts.append('<title>Document</title>')
-
-        html_parts.append('</head>')
-        html_parts.append('<body>')
-
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
-
-        html_parts.append('</body>')
-        html_parts.append('</html>')
-
         with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+            ])
+
+            if doc.metadata.get('title'):
+                html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
+            else:
+                html_parts.append('<title>Document</title>')
+
+            html_parts.append('</head>')
+            html_parts.append('<body>')
+
+            for block in doc.content:
+                if isinstance(block, (Paragraph, Text)):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
+
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -109,10 +135,10 @@ class PDFConverter(BaseConverter):
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
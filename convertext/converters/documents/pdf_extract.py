@@ -0,0 +1,392 @@
+"""Page-parallel text extraction for the PDF readers.
+
+``page.extract_text()`` is CPU-bound pure Python, so with ``workers`` above
+1 large PDFs are split into page ranges that run in a process pool. Every
+worker maps the file into memory and opens its own ``pypdf.PdfReader`` once,
+then extracts whole ranges; results come back in page order. By default, and
+for small documents, pages are extracted in-process: batch runs already
+convert one file per job, and a pool per file would multiply processes.
+
+``lines()`` additionally reports the dominant font size and weight of every
+line, gathered through pypdf's ``visitor_text`` callback, for heading
+detection.
+
+Pages without text are skipped before extraction: a page whose resources
+hold no fonts and no form XObjects, or whose content stream has no
+text-showing operator, cannot produce text. Scanned pages cost a dictionary
+lookup or a regex search instead of a full ``extract_text()``, and are
+recorded in ``blank``.
+
+A page that raises or runs past the per-page timeout is retried with a cheap
+fallback that pulls the string operands of the page's text operators
+straight out of its content stream, under the same budget. If that fails as
+well the page yields empty text and is recorded in ``errors`` instead of
+failing the document. A worker process that dies takes only its pending
+ranges with it; those are redone in-process.
+
+The timeout is a ``SIGALRM`` timer, which only the main thread can take.
+Off the main thread (batch workers, embedding applications) pages are
+therefore extracted in a worker process - one with ``workers`` 1 - whose
+main thread enforces the timeout. Where the platform has no timers at all
+the timeout is not enforced, and a warning says so.
+"""
+
+import math
+import mmap
+import re
+import signal
+import threading
+import warnings
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import pypdf
+
+from convertext.converters.utils import process_pool_context
+
+DEFAULT_PAGE_TIMEOUT = 30.0
+
+#: One line of a page: (text, font size in points, bold). Size 0 means unknown.
+StyledLine = Tuple[str, float, bool]
+
+# Below this many pages a pool costs more to start than it saves
+_MIN_PARALLEL_PAGES = 32
+# Upper bound on pages per task, so progress and failures stay fine-grained
+_MAX_RANGE_PAGES = 64
+
+# String operands of Tj, ', " and TJ: (literal), <hex> and arrays of them
+_TEXT_OPERAND = re.compile(
+    rb'(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|\[[^\]]*\])\s*(?:Tj|TJ|\'|")'
+)
+_STRING = re.compile(rb'\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>')
+_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_ESCAPE = re.compile(rb'\\([0-7]{1,3}|\r\n|.)', re.S)
+# Any text-showing operator (Tj, TJ, ' or "); false positives only cost time
+_SHOWS_TEXT = re.compile(rb'T[jJ]|[)>\]]\s*[\'"]')
+
+# Status of a page skipped as blank; other statuses are None or a reason
+_BLANK = ''
+
+# Per-process reader opened by the pool initializer
+_worker_source: Optional['_MappedPdf'] = None
+
+
+class PageTimeout(BaseException):
+    """A page took longer than the per-page timeout to extract.
+
+    A BaseException, so the ``except Exception`` pypdf wraps around form
+    XObject extraction cannot swallow it.
+    """
+
+
+class _MappedPdf:
+    """A PdfReader over a read-only memory map of the file."""
+
+    def __init__(self, path: Union[str, Path]):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped; let pypdf report them
+            self._map = None
+        self.reader = pypdf.PdfReader(self._map if self._map is not None else self._file)
+
+    def close(self):
+        self.reader = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Objects still referencing the buffer; released with them
+                pass
+        self._file.close()
+
+
+def _timeout_supported() -> bool:
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+def _timeout_in_process(timeout: Optional[float]) -> bool:
+    """Whether pages can be extracted here with the per-page timeout enforced."""
+    if not timeout or _timeout_supported():
+        return True
+    if not hasattr(signal, 'setitimer'):
+        warnings.warn('per-page PDF timeout needs signal.setitimer; pages are extracted without one',
+                      RuntimeWarning, stacklevel=3)
+        return True
+    return False
+
+
+def _on_alarm(signum, frame):
+    raise PageTimeout()
+
+
+def _unescape(match: 're.Match[bytes]') -> bytes:
+    code = match.group(1)
+    if code[:1].isdigit():
+        return bytes((int(code, 8) & 0xFF,))
+    if code in (b'\r\n', b'\n', b'\r'):
+        return b''  # Line continuation
+    return _ESCAPES.get(code, code)
+
+
+def _decode_string(token: bytes) -> str:
+    if token[:1] == b'<':
+        digits = re.sub(rb'\s', b'', token[1:-1])
+        if len(digits) % 2:
+            digits += b'0'
+        return bytes.fromhex(digits.decode('ascii')).decode('latin-1')
+    return _ESCAPE.sub(_unescape, token[1:-1]).decode('latin-1')
+
+
+def _fallback_text(page: pypdf.PageObject) -> str:
+    """Cheap text for a page that extract_text() could not handle.
+
+    Ignores fonts, positioning and form XObjects, so glyphs in custom
+    encodings come out garbled, but it costs one regex pass per page.
+    """
+    contents = page.get_contents()
+    if contents is None:
+        return ''
+    lines = []
+    for match in _TEXT_OPERAND.finditer(contents.get_data()):
+        operand = match.group(1)
+        if operand[:1] == b'[':
+            lines.append(''.join(_decode_string(s) for s in _STRING.findall(operand)))
+        else:
+            lines.append(_decode_string(operand))
+    return '\n'.join(line for line in lines if line.strip())
+
+
+def _may_have_text(page: pypdf.PageObject) -> bool:
+    """False if page certainly shows no text; cheap compared to extract_text()."""
+    try:
+        resources = page.get('/Resources')
+        if resources is None:
+            return False
+        resources = resources.get_object()
+        xobjects = resources.get('/XObject')
+        if xobjects is not None:
+            xobjects = xobjects.get_object()
+            if any(xobject.get_object().get('/Subtype') == '/Form' for xobject in xobjects.values()):
+                return True  # Forms carry their own content; don't look inside
+        if '/Font' not in resources:
+            return False
+        contents = page.get_contents()
+        return contents is not None and _SHOWS_TEXT.search(contents.get_data()) is not None
+    except Exception:
+        # Malformed page: leave the verdict to extraction and its fallback
+        return True
+
+
+def _scale(matrix: Sequence[float]) -> float:
+    return math.hypot(matrix[2], matrix[3]) if matrix else 1.0
+
+
+def _styled_lines(page: pypdf.PageObject) -> List[StyledLine]:
+    """Lines of extract_text() with the size and weight covering most of each.
+
+    Joined with newlines, the line texts give back extract_text() exactly.
+    """
+    lines: List[StyledLine] = []
+    parts: List[str] = []
+    styles: Counter = Counter()
+
+    def visit(text, cm, tm, font, size):
+        if not text:
+            return
+        name = str(font.get('/BaseFont', '')) if font else ''
+        style = (round(size * _scale(tm) * _scale(cm) or size, 1), 'Bold' in name or 'Black' in name)
+        pieces = text.split('\n')
+        for piece in pieces[:-1]:
+            parts.append(piece)
+            styles[style] += len(piece.strip())
+            end_line()
+        parts.append(pieces[-1])
+        styles[style] += len(pieces[-1].strip())
+
+    def end_line():
+        size, bold = max(styles, key=styles.__getitem__) if styles else (0.0, False)
+        lines.append((''.join(parts), size, bold))
+        parts.clear()
+        styles.clear()
+
+    page.extract_text(visitor_text=visit)
+    end_line()
+    return lines
+
+
+def _extract_page(
+    page: pypdf.PageObject, use_alarm: bool, timeout: Optional[float], styled: bool = False
+) -> Union[str, List[StyledLine]]:
+    if use_alarm:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return _styled_lines(page) if styled else page.extract_text()
+    except (Exception, PageTimeout):
+        # A timed-out page gets a fresh budget for the fallback
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        text = _fallback_text(page)
+        return [(line, 0.0, False) for line in text.split('\n')] if styled else text
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _iter_range(
+    reader: pypdf.PdfReader, start: int, stop: int, timeout: Optional[float], styled: bool = False
+) -> Iterator[Tuple[Any, Optional[str]]]:
+    """Extract pages [start, stop) as (text, status) pairs; with styled, as
+    (lines, status) pairs. Status is None, _BLANK or the reason the page was
+    skipped."""
+    empty = [] if styled else ''
+    use_alarm = bool(timeout) and _timeout_supported()
+    previous = signal.signal(signal.SIGALRM, _on_alarm) if use_alarm else None
+    try:
+        for index in range(start, stop):
+            try:
+                if not _may_have_text(reader.pages[index]):
+                    yield empty, _BLANK
+                    continue
+                text = _extract_page(reader.pages[index], use_alarm, timeout, styled)
+            except PageTimeout:
+                yield empty, f'timed out after {timeout:g}s'
+            except Exception as e:
+                yield empty, f'{type(e).__name__}: {e}'
+            else:
+                yield text or empty, None
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous)
+
+
+def _init_worker(path: str):
+    global _worker_source
+    _worker_source = _MappedPdf(path)
+
+
+def _worker_extract(
+    start: int, stop: int, timeout: Optional[float], styled: bool
+) -> List[Tuple[Any, Optional[str]]]:
+    return list(_iter_range(_worker_source.reader, start, stop, timeout, styled))
+
+
+class PdfTextExtractor:
+    """Extract per-page text from a PDF, in parallel when it pays off.
+
+    Args:
+        path: PDF file
+        workers: Extraction processes; 1 (or None) extracts in-process
+        page_timeout: Seconds allowed per page; None or 0 disables it.
+            Only enforced on platforms with ``signal.setitimer``; off the
+            main thread, pages go to a worker process to enforce it.
+
+    Example:
+        >>> with PdfTextExtractor(path, workers=4) as extractor:
+        ...     metadata = extractor.reader.metadata
+        ...     for text in extractor.pages():
+        ...         print(len(text))
+        >>> extractor.errors   # {page_index: reason} for skipped pages
+        >>> extractor.blank    # indexes of pages without any text
+        >>> extractor.skipped_pages()   # the same, 1-based and sorted
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        workers: Optional[int] = 1,
+        page_timeout: Optional[float] = DEFAULT_PAGE_TIMEOUT,
+    ):
+        self.path = Path(path)
+        self.workers = max(1, workers or 1)
+        self.page_timeout = page_timeout
+        self.errors: Dict[int, str] = {}
+        self.blank: Set[int] = set()
+        self._source = _MappedPdf(self.path)
+        self.reader = self._source.reader
+
+    @classmethod
+    def from_config(cls, path: Union[str, Path], config: Dict[str, Any]) -> 'PdfTextExtractor':
+        """Build an extractor from the ``pdf`` config section."""
+        pdf_config = config.get('pdf', {})
+        return cls(
+            path,
+            workers=pdf_config.get('workers', 1),
+            page_timeout=pdf_config.get('page_timeout', DEFAULT_PAGE_TIMEOUT),
+        )
+
+    def __enter__(self) -> 'PdfTextExtractor':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.reader = None
+        self._source.close()
+
+    def pages(self, pages: Optional[range] = None) -> Iterator[str]:
+        """Yield the text of each page in order ('' for skipped pages).
+
+        Args:
+            pages: Contiguous page indexes to extract; all pages by default.
+                Closing the generator early cancels the ranges the pool has
+                not started, so readers can stop once they have enough.
+        """
+        return self._extract(pages, styled=False)
+
+    def lines(self, pages: Optional[range] = None) -> Iterator[List[StyledLine]]:
+        """Like pages(), but yield each page as styled lines ([] for skipped
+        pages). Lines recovered by the fallback have size 0."""
+        return self._extract(pages, styled=True)
+
+    def _extract(self, pages: Optional[range], styled: bool) -> Iterator[Any]:
+        if pages is None:
+            pages = range(len(self.reader.pages))
+        first, last = pages.start, pages.stop
+        count = len(pages)
+        in_process = self.workers == 1 or count < _MIN_PARALLEL_PAGES
+        if in_process and (not count or _timeout_in_process(self.page_timeout)):
+            yield from self._collect(first, _iter_range(self.reader, first, last, self.page_timeout, styled))
+            return
+
+        size = max(1, min(_MAX_RANGE_PAGES, math.ceil(count / (self.workers * 4))))
+        ranges = [(start, min(start + size, last)) for start in range(first, last, size)]
+        done = 0
+        try:
+            pool = ProcessPoolExecutor(
+                max_workers=min(self.workers, len(ranges)),
+                mp_context=process_pool_context(),
+                initializer=_init_worker,
+                initargs=(str(self.path),),
+            )
+            try:
+                futures = [pool.submit(_worker_extract, start, stop, self.page_timeout, styled)
+                           for start, stop in ranges]
+                for (start, _), future in zip(ranges, futures):
+                    results = future.result()
+                    done += 1
+                    yield from self._collect(start, results)
+            finally:
+                # Stopped early: drop queued ranges and don't wait for running ones
+                pool.shutdown(wait=done == len(ranges), cancel_futures=True)
+        except BrokenProcessPool:
+            # A worker died (crash, out of memory); redo what is left here
+            for start, stop in ranges[done:]:
+                yield from self._collect(start, _iter_range(self.reader, start, stop, self.page_timeout, styled))
+
+    def skipped_pages(self) -> List[int]:
+        """1-based numbers of the pages skipped so far."""
+        return sorted(index + 1 for index in self.errors)
+
+    def _collect(self, start: int, results: Iterable[Tuple[Any, Optional[str]]]) -> Iterator[Any]:
+        for index, (text, status) in enumerate(results, start):
+            if status == _BLANK:
+                self.blank.add(index)
+            elif status is not None:
+                self.errors[index] = status
+            yield text
@@ -0,0 +1,136 @@
+"""Heading detection for PDF text from font statistics.
+
+PDFs carry no structure, only glyphs in fonts. ``FontHistogram`` counts the
+characters set in each font size over the pages read; the most common size
+is the body text. Rarer, clearly larger sizes become heading levels, largest
+first, and short bold lines at body size rank below them. Counting is one
+pass over the lines and classifying another, so the cost stays linear in the
+document size.
+
+Statistics are gathered over every page read before any line is classified.
+Reads capped by a block or heading count classify each page as it arrives,
+against the pages read so far, so they can still stop early.
+"""
+
+import re
+from collections import Counter
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from convertext.converters.documents.pdf_extract import PdfTextExtractor, StyledLine
+
+#: A page as (text, heading level or None) lines; None for a skipped page
+ClassifiedPage = Optional[List[Tuple[str, Optional[int]]]]
+
+# A heading size is at least this much larger than the body size ...
+_MIN_RATIO = 1.15
+# ... and sets at most this share of all characters
+_MAX_SHARE = 0.1
+# Deepest heading level assigned
+_MAX_LEVEL = 4
+# Longer lines are never headings
+_MAX_HEADING_CHARS = 120
+# Bold body-size lines longer than this are emphasis, not headings
+_MAX_BOLD_HEADING_CHARS = 60
+
+_SENTENCE_END = re.compile(r'[.,;!?]["\'’”)\]]*$')
+
+
+class FontHistogram:
+    """Document-wide character counts per font size, and the heading
+    levels derived from them.
+
+    Example:
+        >>> fonts = FontHistogram()
+        >>> for lines in pages:
+        ...     fonts.add(lines)
+        >>> fonts.level('Chapter One', 20.0, True)
+        1
+    """
+
+    def __init__(self):
+        self._chars: Counter = Counter()
+        self._levels: Optional[Dict[float, int]] = None
+
+    def add(self, lines: List[StyledLine]):
+        """Count the characters of one page's lines."""
+        chars = self._chars
+        for text, size, _ in lines:
+            if size:
+                chars[size] += len(text.strip())
+        self._levels = None
+
+    @property
+    def body_size(self) -> float:
+        """The most common font size, 0 before any text was counted."""
+        common = self._chars.most_common(1)
+        return common[0][0] if common and common[0][1] else 0.0
+
+    def levels(self) -> Dict[float, int]:
+        """Heading level for each heading font size."""
+        if self._levels is None:
+            body = self.body_size
+            total = sum(self._chars.values())
+            sizes = sorted(
+                (size for size, count in self._chars.items()
+                 if size >= body * _MIN_RATIO and count <= total * _MAX_SHARE),
+                reverse=True,
+            )
+            self._levels = {size: min(level, _MAX_LEVEL) for level, size in enumerate(sizes, 1)}
+        return self._levels
+
+    def level(self, text: str, size: float, bold: bool) -> Optional[int]:
+        """Heading level of a line, or None for body text."""
+        text = text.strip()
+        if not text or not size or len(text) > _MAX_HEADING_CHARS:
+            return None
+        levels = self.levels()
+        if size in levels:
+            return levels[size]
+        if (bold and size == self.body_size and len(text) <= _MAX_BOLD_HEADING_CHARS
+                and not _SENTENCE_END.search(text)):
+            return min(len(levels) + 1, _MAX_LEVEL)
+        return None
+
+
+def classify_pages(
+    extractor: PdfTextExtractor,
+    pages: range,
+    fonts: Optional[FontHistogram],
+    incremental: bool = False,
+) -> Iterator[Tuple[int, ClassifiedPage]]:
+    """Yield (page index, classified lines) for pages.
+
+    Without fonts, headings are not detected and each page is a single
+    body line holding its whole text.
+    """
+    if fonts is None:
+        for index, text in enumerate(extractor.pages(pages), pages.start):
+            yield index, None if index in extractor.errors else [(text, None)]
+        return
+
+    read = []
+    for index, lines in enumerate(extractor.lines(pages), pages.start):
+        if index in extractor.errors:
+            lines = None
+        else:
+            fonts.add(lines)
+        if incremental:
+            yield index, _classify(lines, fonts)
+        else:
+            read.append((index, lines))
+    for index, lines in read:
+        yield index, _classify(lines, fonts)
+
+
+def _classify(lines: Optional[List[StyledLine]], fonts: FontHistogram) -> ClassifiedPage:
+    if lines is None:
+        return None
+    return [(text, fonts.level(text, size, bold)) for text, size, bold in lines]
+
+
+def group_lines(lines: List[Tuple[str, Optional[int]]]) -> Iterator[Tuple[Optional[int], List[str]]]:
+    """Group consecutive lines of the same heading level (None for body
+    text), so headings wrapped over several lines stay one heading."""
+    for level, group in groupby(lines, key=lambda line: line[1]):
+        yield level, [text for text, _ in group]
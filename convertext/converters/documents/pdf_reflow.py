@@ -0,0 +1,134 @@
+"""Line-to-paragraph reflow for extracted PDF text.
+
+``extract_text()`` returns a page as visual lines. Reflow joins them back into
+paragraphs from statistics computed over the whole page at once: line
+lengths against the page's typical full-line width, indents against its body
+indent, and terminal punctuation. Lines end a paragraph when they are blank,
+short and finish a sentence, precede an indented line, or are heading-like
+(short, capitalised, with no trailing punctuation). Words hyphenated across a line break are
+rejoined.
+
+A paragraph left open at the bottom of a page is held back and continued on
+the next page. Pages with only a few lines use the last full page's width.
+
+The classification is column-wise rather than line by line: every feature
+(length, indent, blank, terminal, short, heading, hyphen) is one list over
+all lines of the page, and paragraph ends are computed from those columns in
+one pass. That is the array formulation of line grouping and heading
+detection, kept in plain lists because NumPy is not a dependency here; a
+page holds at most a few hundred lines, so there is no per-element work
+left that vectorizing would remove.
+"""
+
+import re
+from typing import List, Tuple
+
+# Ends a sentence, possibly inside closing quotes or brackets
+_TERMINAL = re.compile(r'[.!?:;…]["\'’”)\]]*$')
+# A word broken across lines: letter, hyphen, end of line
+_HYPHENATED = re.compile(r'[^\W\d_]-$')
+# Lines ending like this continue on the next line, whatever their length
+_CONTINUED = re.compile(r'[,\-–—]$')
+
+# Fraction of the typical line width below which a line counts as short
+_SHORT = 0.85
+# Shorter than this fraction, an unpunctuated capitalised line is a heading
+_HEADING = 0.5
+# Pages with fewer lines than this borrow the previous page's line width
+_MIN_LINES = 5
+
+
+def _width(lengths: List[int]) -> Tuple[int, int]:
+    """Typical full-line length (the 90th percentile of non-blank lines),
+    and the number of lines it is based on."""
+    filled = sorted(n for n in lengths if n)
+    if not filled:
+        return 0, 0
+    return filled[min(len(filled) - 1, len(filled) * 9 // 10)], len(filled)
+
+
+class Reflow:
+    """Join the lines of consecutive pages into paragraphs.
+
+    Example:
+        >>> reflow = Reflow()
+        >>> for text in pages:
+        ...     for para in reflow.feed(text):
+        ...         doc.add_paragraph(para)
+        >>> for para in reflow.flush():
+        ...     doc.add_paragraph(para)
+    """
+
+    def __init__(self):
+        self._open = ''
+        self._width = 0
+
+    def feed(self, text: str) -> List[str]:
+        """Paragraphs completed by page text.
+
+        The page's last paragraph is held back unless it visibly ends there.
+        """
+        # Blank lines at the page edges say nothing about paragraph ends
+        raw = text.strip('\n').split('\n')
+        lines = [line.strip() for line in raw]
+        lengths = [len(line) for line in lines]
+        indents = [len(line) - len(line.lstrip()) for line in raw]
+        body_indent = min((i for i, n in zip(indents, lengths) if n), default=0)
+        width, filled = _width(lengths)
+        if filled >= _MIN_LINES:
+            self._width = width
+        else:
+            width = max(width, self._width)
+
+        blank = [n == 0 for n in lengths]
+        terminal = [bool(_TERMINAL.search(line)) for line in lines]
+        short = [n < width * _SHORT for n in lengths]
+        heading = [
+            0 < n < width * _HEADING and not t and not _CONTINUED.search(line)
+            and (line[0].isupper() or line[0].isdigit())
+            for line, n, t in zip(lines, lengths, terminal)
+        ]
+        indented = [n > 0 and i > body_indent for i, n in zip(indents, lengths)]
+        hyphen = [bool(_HYPHENATED.search(line)) for line in lines]
+        lower = [line[:1].islower() for line in lines]
+
+        if self._open:
+            # The held-back paragraph acts as one more full line before the page
+            lines.insert(0, self._open)
+            for column, value in ((blank, False), (terminal, False), (short, False),
+                                  (heading, False), (indented, False), (lower, False)):
+                column.insert(0, value)
+            hyphen.insert(0, bool(_HYPHENATED.search(self._open)))
+
+        # ends[i]: a paragraph ends after line i; joins[i]: line i ends in a
+        # word hyphenated across the break to line i + 1
+        ends = [
+            b or h or (s and t) or nb or nh or ni
+            for b, h, s, t, nb, nh, ni in zip(
+                blank, heading, short, terminal,
+                blank[1:] + [False], heading[1:] + [False], indented[1:] + [False],
+            )
+        ]
+        joins = [hy and nl for hy, nl in zip(hyphen, lower[1:] + [False])]
+
+        paragraphs = []
+        current = ''
+        for line, end, join in zip(lines, ends, joins):
+            if not line:
+                continue
+            current += line
+            if end:
+                paragraphs.append(current)
+                current = ''
+            elif join:
+                current = current[:-1]
+            else:
+                current += ' '
+        self._open = current.rstrip()
+        return paragraphs
+
+    def flush(self) -> List[str]:
+        """The paragraph still held back, if any."""
+        paragraphs = [self._open] if self._open else []
+        self._open = ''
+        return paragraphs
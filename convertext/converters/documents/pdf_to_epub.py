@@ -6,14 +6,21 @@ import zipfile
 from pathlib import Path
 from typing import Any, Dict, List
 
-import pypdf
-
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.documents.pdf_extract import PdfTextExtractor
+from convertext.converters.documents.pdf_headings import FontHistogram, classify_pages, group_lines
+from convertext.converters.documents.pdf_reflow import Reflow
+from convertext.converters.ranges import ReadRange
 
 
 class PdfToEpubConverter(BaseConverter):
     """Convert PDF directly to EPUB preserving structure and metadata."""
 
+    buffered_formats = ('epub',)
+    ranged_formats = ('pdf',)
+    cache_sections = ('documents', 'pdf')
+
     @property
     def input_formats(self) -> List[str]:
         return ['pdf']
@@ -27,8 +34,10 @@ class PdfToEpubConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert PDF to EPUB directly."""
-        doc = self._read_pdf(source_path, config)
+        doc = self._read_cached(self._read_pdf, source_path, config)
+        self._report_read(doc)
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         # Use PDF metadata for title/author, fall back to filename
         if not doc.metadata.get('title'):
@@ -36,14 +45,14 @@ class PdfToEpubConverter(BaseConverter):
         if not doc.metadata.get('author'):
             doc.metadata['author'] = 'Unknown'
 
-        return self._create_epub(doc, target_path, config)
+        return self._create_epub(self._buffer_for(doc, 'epub'), target_path, config)
 
     def _read_pdf(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read PDF into intermediate Document."""
         doc = Document()
 
-        with open(path, 'rb') as f:
-            reader = pypdf.PdfReader(f)
+        with PdfTextExtractor.from_config(path, config) as extractor:
+            reader = extractor.reader
 
             # Extract metadata
             if reader.metadata:
@@ -59,14 +68,36 @@ class PdfToEpubConverter(BaseConverter):
                     doc.metadata['subject'] = subject.strip()
 
             # Extract text content
-            for page in reader.pages:
-                text = page.extract_text()
-                if text.strip():
-                    # Split into paragraphs (each line is typically a paragraph or heading)
-                    for line in text.split('\n'):
-                        line = line.strip()
-                        if line:
-                            doc.add_paragraph(line)
+            rng = ReadRange.from_config(config)
+            count = len(reader.pages)
+            pages = rng.units(count) if rng else range(count)
+            fonts = FontHistogram() if config.get('pdf', {}).get('detect_headings', True) else None
+            capped = rng is not None and (rng.blocks is not None or rng.headings is not None)
+            reflow = Reflow()
+            for index, lines in classify_pages(extractor, pages, fonts, incremental=capped):
+                if lines is None:
+                    for para in reflow.flush():
+                        doc.add_paragraph(para)
+                    doc.add_text(f'[Page {index + 1} skipped: {extractor.errors[index]}]', 'skipped-page')
+                    continue
+                for level, texts in group_lines(lines):
+                    if level:
+                        for para in reflow.flush():
+                            doc.add_paragraph(para)
+                        doc.add_heading(' '.join(t.strip() for t in texts), level)
+                    else:
+                        # Rejoin the page's visual lines into paragraphs
+                        for para in reflow.feed('\n'.join(texts)):
+                            doc.add_paragraph(para)
+                if rng and rng.full(doc.content):
+                    break
+            for para in reflow.flush():
+                doc.add_paragraph(para)
+
+            if extractor.errors:
+                doc.metadata['skipped_pages'] = extractor.skipped_pages()
+            if extractor.blank:
+                doc.metadata['blank_pages'] = len(extractor.blank)
 
         return doc
 
@@ -77,17 +108,25 @@ class PdfToEpubConverter(BaseConverter):
         language = doc.metadata.get('language', 'en')
         uid = str(uuid.uuid4())
 
-        # Split content into chapters (simple approach: one chapter)
-        content_html = []
-        for block in doc.content:
-            if block['type'] == 'heading':
-                level = block['level']
-                content_html.append(f'<h{level}>{self._escape_html(block["data"])}</h{level}>')
-            elif block['type'] in ['paragraph', 'text']:
-                content_html.append(f'<p>{self._escape_html(block["data"])}</p>')
-
-        if not content_html:
-            content_html = ['<p>No content</p>']
+        # One chapter file per section; untitled sections after the first
+        # get a numbered title
+        chapters = []
+        chapter_titles = []
+
+        for i, section in enumerate(doc.sections, 1):
+            chapter = []
+            for block in doc.content[section.start:section.end]:
+                if isinstance(block, Heading):
+                    level = block.level
+                    chapter.append(f'<h{level}>{self._escape_html(block.data)}</h{level}>')
+                elif isinstance(block, (Paragraph, Text)):
+                    chapter.append(f'<p>{self._escape_html(block.data)}</p>')
+            chapters.append(chapter)
+            chapter_titles.append(section.title or (title if i == 1 else f'Chapter {i}'))
+
+        if not chapters:
+            chapters = [['<p>No content</p>']]
+            chapter_titles = [title]
 
         # Create EPUB ZIP structure
         with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
@@ -103,18 +142,32 @@ class PdfToEpubConverter(BaseConverter):
 </container>'''
             zf.writestr('META-INF/container.xml', container_xml)
 
-            # Chapter XHTML
-            xhtml = f'''<?xml version="1.0" encoding="UTF-8"?>
+            manifest_items = []
+            spine_items = []
+            toc_items = []
+
+            for i, (chapter, chapter_title) in enumerate(zip(chapters, chapter_titles), 1):
+                filename = f'chapter_{i:02d}.xhtml'
+                manifest_items.append(f'    <item id="chapter{i}" href="{filename}" media-type="application/xhtml+xml"/>')
+                spine_items.append(f'    <itemref idref="chapter{i}"/>')
+                toc_items.append(f'    <navPoint id="navPoint-{i}" playOrder="{i}">\n      <navLabel><text>{self._escape_html(chapter_title)}</text></navLabel>\n      <content src="{filename}"/>\n    </navPoint>')
+
+                # Chapter XHTML
+                xhtml = f'''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE html>
 <html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops">
 <head>
-  <title>{self._escape_html(title)}</title>
+  <title>{self._escape_html(chapter_title)}</title>
 </head>
 <body>
-{''.join(content_html)}
+{''.join(chapter)}
 </body>
 </html>'''
-            zf.writestr('OEBPS/chapter.xhtml', xhtml)
+                zf.writestr(f'OEBPS/{filename}', xhtml)
+
+            manifest_xml = ''.join(item + '\n' for item in manifest_items)
+            spine_xml = ''.join(item + '\n' for item in spine_items)
+            toc_xml = ''.join(item + '\n' for item in toc_items)
 
             # content.opf
             opf = f'''<?xml version="1.0" encoding="UTF-8"?>
@@ -128,10 +181,10 @@ class PdfToEpubConverter(BaseConverter):
   </metadata>
   <manifest>
     <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>
-    <item id="chapter" href="chapter.xhtml" media-type="application/xhtml+xml"/>
+{manifest_xml}
   </manifest>
   <spine toc="ncx">
-    <itemref idref="chapter"/>
+{spine_xml}
   </spine>
 </package>'''
             zf.writestr('OEBPS/content.opf', opf)
@@ -147,10 +200,7 @@ class PdfToEpubConverter(BaseConverter):
     <text>{self._escape_html(title)}</text>
   </docTitle>
   <navMap>
-    <navPoint id="navPoint-1" playOrder="1">
-      <navLabel><text>{self._escape_html(title)}</text></navLabel>
-      <content src="chapter.xhtml"/>
-    </navPoint>
+{toc_xml}
   </navMap>
 </ncx>'''
             zf.writestr('OEBPS/toc.ncx', ncx)
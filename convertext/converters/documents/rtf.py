@@ -10,6 +10,8 @@ except ImportError:
     RTF_AVAILABLE = False
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.utils import LineWriter
 
 
 class RtfConverter(BaseConverter):
@@ -35,6 +37,7 @@ class RtfConverter(BaseConverter):
 
         doc = self._read_rtf(source_path, config)
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
@@ -65,38 +68,37 @@ class RtfConverter(BaseConverter):
         """Write Document to plain text."""
         with open(path, 'w', encoding='utf-8') as f:
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-            '<title>Document</title>',
-            '</head>',
-            '<body>'
-        ]
-
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
-            elif block['type'] == 'text':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-
-        html_parts.append('</body>')
-        html_parts.append('</html>')
-
         with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+                '<title>Document</title>',
+                '</head>',
+                '<body>'
+            ])
+
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
+                elif isinstance(block, Text):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -104,12 +106,12 @@ class RtfConverter(BaseConverter):
         """Write Document to Markdown."""
         with open(path, 'w', encoding='utf-8') as f:
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
-                elif block['type'] == 'text':
-                    f.write(block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
+                elif isinstance(block, Text):
+                    f.write(block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
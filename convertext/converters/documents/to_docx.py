@@ -9,12 +9,18 @@ from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Image, Link, ListBlock, Paragraph, Run, Table, Text
+from convertext.converters.html_reader import read_html
+from convertext.converters.txt_reader import read_txt
 from convertext.converters.utils import hex_to_rgb
 
 
 class ToDocxConverter(BaseConverter):
     """Convert various formats to DOCX."""
 
+    buffered_formats = ('docx',)
+    image_formats = ('docx',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md', 'pdf', 'odt', 'epub', 'fb2', 'rtf']
@@ -54,77 +60,20 @@ class ToDocxConverter(BaseConverter):
                 doc = self._read_txt(tmp_path, config)
             self._apply_metadata_overrides(doc, source_path, config)
 
-            return self._create_docx(doc, target_path, config, target_path.stem)
+            return self._create_docx(self._buffer_for(doc, 'docx'), target_path, config, target_path.stem)
         finally:
             if tmp_path.exists():
                 tmp_path.unlink()
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read plain text into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-            for para in content.split('\n\n'):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_txt(path, encoding)
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read HTML into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'ul', 'ol']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    doc.add_paragraph(text)
-
-            elif element.name == 'table':
-                rows = []
-                headers = []
-                thead = element.find('thead')
-                if thead:
-                    header_row = thead.find('tr')
-                    if header_row:
-                        headers = [th.get_text().strip() for th in header_row.find_all(['th', 'td'])]
-
-                tbody = element.find('tbody') or element
-                for row in tbody.find_all('tr'):
-                    cells = [cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
-                    if cells:
-                        rows.append(cells)
-
-                if rows:
-                    doc.add_table(rows=rows, headers=headers if headers else None)
-
-            elif element.name in ['ul', 'ol']:
-                items = [li.get_text().strip() for li in element.find_all('li')]
-                if items:
-                    doc.add_list(items=items, ordered=(element.name == 'ol'))
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_html(path.read_bytes(), encoding=encoding, rich=True)
 
     def _create_docx(self, doc: Document, path: Path, config: Dict[str, Any], default_title: str) -> bool:
         """Create DOCX file using python-docx."""
@@ -135,38 +84,24 @@ class ToDocxConverter(BaseConverter):
         docx_doc.core_properties.subject = doc.metadata.get('subject', '')
 
         for block in doc.content:
-            if block['type'] == 'heading':
-                level = min(block['level'], 9)
-                docx_doc.add_heading(block['data'], level=level)
+            if isinstance(block, Heading):
+                level = min(block.level, 9)
+                docx_doc.add_heading(block.data, level=level)
 
-            elif block['type'] in ['paragraph', 'text']:
-                docx_doc.add_paragraph(block['data'])
-
-            elif block['type'] == 'run':
+            elif isinstance(block, Paragraph) and block.spans:
                 p = docx_doc.add_paragraph()
-                run = p.add_run(block['text'])
-
-                if block.get('bold'):
-                    run.bold = True
-                if block.get('italic'):
-                    run.italic = True
-                if block.get('underline'):
-                    run.underline = True
-
-                if block.get('color'):
-                    rgb = hex_to_rgb(block['color'])
-                    if rgb:
-                        run.font.color.rgb = RGBColor(*rgb)
+                for span in block.spans:
+                    self._add_run(p, span)
 
-                if block.get('font'):
-                    run.font.name = block['font']
+            elif isinstance(block, (Paragraph, Text)):
+                docx_doc.add_paragraph(block.data)
 
-                if block.get('size'):
-                    run.font.size = Pt(block['size'])
+            elif isinstance(block, Run):
+                self._add_run(docx_doc.add_paragraph(), block)
 
-            elif block['type'] == 'table':
-                headers = block.get('headers', [])
-                rows = block['rows']
+            elif isinstance(block, Table):
+                headers = block.headers or []
+                rows = block.rows
 
                 num_cols = len(headers) if headers else (len(rows[0]) if rows else 0)
                 num_rows = len(rows) + (1 if headers else 0)
@@ -175,35 +110,59 @@ class ToDocxConverter(BaseConverter):
                     table = docx_doc.add_table(rows=num_rows, cols=num_cols)
                     table.style = 'Light Grid Accent 1'
 
-                    row_idx = 0
+                    # Resolve each row's cells once; table.rows[i].cells
+                    # rebuilds the row list on every access
+                    docx_rows = iter(table.rows)
                     if headers:
+                        cells = next(docx_rows).cells
                         for col_idx, header in enumerate(headers):
-                            table.rows[row_idx].cells[col_idx].text = str(header)
-                        row_idx += 1
+                            cells[col_idx].text = str(header)
 
-                    for row_data in rows:
+                    for docx_row, row_data in zip(docx_rows, rows):
+                        cells = docx_row.cells
                         for col_idx, cell_data in enumerate(row_data):
                             if col_idx < num_cols:
-                                table.rows[row_idx].cells[col_idx].text = str(cell_data)
-                        row_idx += 1
+                                cells[col_idx].text = str(cell_data)
 
-            elif block['type'] == 'list':
-                for item in block['items']:
-                    style = 'List Number' if block.get('ordered') else 'List Bullet'
+            elif isinstance(block, ListBlock):
+                for item in block.items:
+                    style = 'List Number' if block.ordered else 'List Bullet'
                     docx_doc.add_paragraph(item, style=style)
 
-            elif block['type'] == 'image':
-                if block['name'] in doc.images:
-                    img_data = doc.images[block['name']]['data']
+            elif isinstance(block, Image):
+                if block.name in doc.images:
+                    img_data = doc.images[block.name]['data']
                     try:
                         docx_doc.add_picture(BytesIO(img_data), width=Inches(4))
                     except Exception:
                         pass
 
-            elif block['type'] == 'link':
+            elif isinstance(block, Link):
                 p = docx_doc.add_paragraph()
-                p.add_run(f"{block['text']} ")
-                p.add_run(f"({block['url']})").font.color.rgb = RGBColor(0, 0, 255)
+                p.add_run(f"{block.text} ")
+                p.add_run(f"({block.url})").font.color.rgb = RGBColor(0, 0, 255)
 
         docx_doc.save(str(path))
         return True
+
+    def _add_run(self, paragraph, block: Run):
+        """Append a formatted run block to a python-docx paragraph."""
+        run = paragraph.add_run(block.text)
+
+        if block.bold:
+            run.bold = True
+        if block.italic:
+            run.italic = True
+        if block.underline:
+            run.underline = True
+
+        if block.color:
+            rgb = hex_to_rgb(block.color)
+            if rgb:
+                run.font.color.rgb = RGBColor(*rgb)
+
+        if block.font:
+            run.font.name = block.font
+
+        if block.size:
+            run.font.size = Pt(block.size)
@@ -12,7 +12,7 @@ from reportlab.platypus import (
     SimpleDocTemplate,
     Paragraph,
     Spacer,
-    Table,
+    LongTable,
     TableStyle,
     Image,
     PageBreak,
@@ -21,13 +21,19 @@ from reportlab.platypus import (
 )
 from reportlab.lib import colors
 
+from convertext.converters import blocks
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.html_reader import read_html
+from convertext.converters.txt_reader import read_txt
 from convertext.converters.utils import escape_html, hex_to_rgb
 
 
 class ToPdfConverter(BaseConverter):
     """Convert various formats to PDF using ReportLab."""
 
+    buffered_formats = ('pdf',)
+    image_formats = ('pdf',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md', 'docx', 'odt', 'epub', 'fb2', 'rtf']
@@ -47,11 +53,13 @@ class ToPdfConverter(BaseConverter):
         if source_fmt in ['html', 'htm']:
             doc = self._read_html(source_path, config)
             self._apply_metadata_overrides(doc, source_path, config)
-            return self._create_pdf(doc, target_path, config)
+            self._apply_read_range(doc, source_path, config)
+            return self._create_pdf(self._buffer_for(doc, 'pdf'), target_path, config)
         elif source_fmt == 'txt':
             doc = self._read_txt(source_path, config)
             self._apply_metadata_overrides(doc, source_path, config)
-            return self._create_pdf(doc, target_path, config)
+            self._apply_read_range(doc, source_path, config)
+            return self._create_pdf(self._buffer_for(doc, 'pdf'), target_path, config)
 
         # Otherwise, convert to intermediate format first
         from convertext.registry import get_registry
@@ -77,77 +85,20 @@ class ToPdfConverter(BaseConverter):
                 doc = self._read_txt(tmp_path, config)
             self._apply_metadata_overrides(doc, source_path, config)
 
-            return self._create_pdf(doc, target_path, config)
+            return self._create_pdf(self._buffer_for(doc, 'pdf'), target_path, config)
         finally:
             if tmp_path.exists():
                 tmp_path.unlink()
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read plain text into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-            for para in content.split('\n\n'):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_txt(path, encoding)
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read HTML into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'ul', 'ol']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    doc.add_paragraph(text)
-
-            elif element.name == 'table':
-                rows = []
-                headers = []
-                thead = element.find('thead')
-                if thead:
-                    header_row = thead.find('tr')
-                    if header_row:
-                        headers = [th.get_text().strip() for th in header_row.find_all(['th', 'td'])]
-
-                tbody = element.find('tbody') or element
-                for row in tbody.find_all('tr'):
-                    cells = [cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
-                    if cells:
-                        rows.append(cells)
-
-                if rows:
-                    doc.add_table(rows=rows, headers=headers if headers else None)
-
-            elif element.name in ['ul', 'ol']:
-                items = [li.get_text().strip() for li in element.find_all('li')]
-                if items:
-                    doc.add_list(items=items, ordered=(element.name == 'ol'))
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_html(path.read_bytes(), encoding=encoding, rich=True)
 
     def _create_pdf(self, doc: Document, path: Path, config: Dict[str, Any]) -> bool:
         """Create PDF using ReportLab."""
@@ -200,28 +151,34 @@ class ToPdfConverter(BaseConverter):
             story.append(Paragraph(f"By {doc.metadata['author']}", author_style))
 
         for block in doc.content:
-            if block['type'] == 'heading':
-                level = min(block['level'], 6)
-                story.append(Paragraph(block['data'], heading_styles[level]))
-
-            elif block['type'] in ['paragraph', 'text']:
-                story.append(Paragraph(block['data'], styles['Normal']))
+            if isinstance(block, blocks.Heading):
+                level = min(block.level, 6)
+                story.append(Paragraph(block.data, heading_styles[level]))
+
+            elif isinstance(block, (blocks.Paragraph, blocks.Text)):
+                if isinstance(block, blocks.Paragraph) and block.spans:
+                    text = ''.join(self._format_run_for_pdf(span) for span in block.spans)
+                else:
+                    text = block.data
+                story.append(Paragraph(text, styles['Normal']))
                 story.append(Spacer(1, 0.2 * inch))
 
-            elif block['type'] == 'run':
+            elif isinstance(block, blocks.Run):
                 formatted_text = self._format_run_for_pdf(block)
                 story.append(Paragraph(formatted_text, styles['Normal']))
 
-            elif block['type'] == 'table':
-                headers = block.get('headers', [])
-                rows = block['rows']
+            elif isinstance(block, blocks.Table):
+                headers = block.headers or []
+                rows = block.rows
 
                 table_data = []
                 if headers:
                     table_data.append(headers)
                 table_data.extend(rows)
 
-                table = Table(table_data)
+                # LongTable lays out by row instead of re-measuring the whole
+                # table on every page split
+                table = LongTable(table_data)
                 table_style = [
                     ('BACKGROUND', (0, 0), (-1, 0 if headers else -1), colors.grey),
                     ('TEXTCOLOR', (0, 0), (-1, 0 if headers else -1), colors.whitesmoke),
@@ -236,18 +193,18 @@ class ToPdfConverter(BaseConverter):
                 story.append(table)
                 story.append(Spacer(1, 0.2 * inch))
 
-            elif block['type'] == 'list':
+            elif isinstance(block, blocks.ListBlock):
                 items = []
-                for item in block['items']:
+                for item in block.items:
                     items.append(ListItem(Paragraph(item, styles['Normal'])))
 
-                list_style = 'decimal' if block.get('ordered') else 'bullet'
+                list_style = 'decimal' if block.ordered else 'bullet'
                 story.append(ListFlowable(items, bulletType=list_style))
                 story.append(Spacer(1, 0.2 * inch))
 
-            elif block['type'] == 'image':
-                if block['name'] in doc.images:
-                    img_data = doc.images[block['name']]['data']
+            elif isinstance(block, blocks.Image):
+                if block.name in doc.images:
+                    img_data = doc.images[block.name]['data']
                     try:
                         img = Image(BytesIO(img_data), width=4 * inch)
                         story.append(img)
@@ -255,28 +212,28 @@ class ToPdfConverter(BaseConverter):
                     except Exception:
                         pass
 
-            elif block['type'] == 'link':
-                link_text = f'<a href="{block["url"]}" color="blue">{block["text"]}</a>'
+            elif isinstance(block, blocks.Link):
+                link_text = f'<a href="{block.url}" color="blue">{block.text}</a>'
                 story.append(Paragraph(link_text, styles['Normal']))
 
         pdf_doc.build(story)
         return True
 
-    def _format_run_for_pdf(self, block: Dict[str, Any]) -> str:
+    def _format_run_for_pdf(self, block: blocks.Run) -> str:
         """Format a run block for ReportLab Paragraph markup."""
-        text = escape_html(block['text'])
+        text = escape_html(block.text)
 
-        if block.get('bold'):
+        if block.bold:
             text = f'<b>{text}</b>'
-        if block.get('italic'):
+        if block.italic:
             text = f'<i>{text}</i>'
-        if block.get('underline'):
+        if block.underline:
             text = f'<u>{text}</u>'
 
-        if block.get('color'):
-            text = f'<font color="{block["color"]}">{text}</font>'
+        if block.color:
+            text = f'<font color="{block.color}">{text}</font>'
 
-        if block.get('size'):
-            text = f'<font size="{block["size"]}">{text}</font>'
+        if block.size:
+            text = f'<font size="{block.size}">{text}</font>'
 
         return text
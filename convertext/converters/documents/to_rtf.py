@@ -4,12 +4,17 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Link, ListBlock, Paragraph, Run, Table, Text
+from convertext.converters.html_reader import read_html
+from convertext.converters.txt_reader import read_txt
 from convertext.converters.utils import escape_rtf, hex_to_rgb
 
 
 class ToRtfConverter(BaseConverter):
     """Convert various formats to RTF using native implementation."""
 
+    buffered_formats = ('rtf',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md', 'pdf', 'docx', 'odt', 'epub', 'fb2']
@@ -48,77 +53,20 @@ class ToRtfConverter(BaseConverter):
                 doc = self._read_txt(tmp_path, config)
             self._apply_metadata_overrides(doc, source_path, config)
 
-            return self._create_rtf(doc, target_path, config)
+            return self._create_rtf(self._buffer_for(doc, 'rtf'), target_path, config)
         finally:
             if tmp_path.exists():
                 tmp_path.unlink()
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read plain text into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-            for para in content.split('\n\n'):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_txt(path, encoding)
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read HTML into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'table', 'ul', 'ol']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    doc.add_paragraph(text)
-
-            elif element.name == 'table':
-                rows = []
-                headers = []
-                thead = element.find('thead')
-                if thead:
-                    header_row = thead.find('tr')
-                    if header_row:
-                        headers = [th.get_text().strip() for th in header_row.find_all(['th', 'td'])]
-
-                tbody = element.find('tbody') or element
-                for row in tbody.find_all('tr'):
-                    cells = [cell.get_text().strip() for cell in row.find_all(['td', 'th'])]
-                    if cells:
-                        rows.append(cells)
-
-                if rows:
-                    doc.add_table(rows=rows, headers=headers if headers else None)
-
-            elif element.name in ['ul', 'ol']:
-                items = [li.get_text().strip() for li in element.find_all('li')]
-                if items:
-                    doc.add_list(items=items, ordered=(element.name == 'ol'))
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_html(path.read_bytes(), encoding=encoding, rich=True)
 
     def _create_rtf(self, doc: Document, path: Path, config: Dict[str, Any]) -> bool:
         """Create RTF file - native implementation."""
@@ -149,46 +97,26 @@ class ToRtfConverter(BaseConverter):
         )
 
         for block in doc.content:
-            if block['type'] == 'heading':
-                level = block.get('level', 1)
+            if isinstance(block, Heading):
+                level = block.level
                 size = 32 - (level * 4)
                 rtf_parts.append(
-                    f'\\pard\\fs{size}\\b {escape_rtf(block["data"])}\\b0\\fs24\\par'
+                    f'\\pard\\fs{size}\\b {escape_rtf(block.data)}\\b0\\fs24\\par'
                 )
 
-            elif block['type'] in ['paragraph', 'text']:
-                rtf_parts.append(f'\\pard {escape_rtf(block["data"])}\\par')
-
-            elif block['type'] == 'run':
-                rtf_text = ''
-                if block.get('bold'):
-                    rtf_text += '\\b '
-                if block.get('italic'):
-                    rtf_text += '\\i '
-                if block.get('underline'):
-                    rtf_text += '\\ul '
-
-                if block.get('color'):
-                    rgb = hex_to_rgb(block['color'])
-                    if rgb:
-                        rtf_text += '\\cf1 '
-
-                rtf_text += escape_rtf(block['text'])
-
-                if block.get('bold'):
-                    rtf_text += '\\b0 '
-                if block.get('italic'):
-                    rtf_text += '\\i0 '
-                if block.get('underline'):
-                    rtf_text += '\\ul0 '
-                if block.get('color'):
-                    rtf_text += '\\cf0 '
-
+            elif isinstance(block, Paragraph) and block.spans:
+                rtf_text = ''.join(self._format_run_for_rtf(span) for span in block.spans)
                 rtf_parts.append(f'\\pard {rtf_text}\\par')
 
-            elif block['type'] == 'table':
-                headers = block.get('headers', [])
-                rows = block['rows']
+            elif isinstance(block, (Paragraph, Text)):
+                rtf_parts.append(f'\\pard {escape_rtf(block.data)}\\par')
+
+            elif isinstance(block, Run):
+                rtf_parts.append(f'\\pard {self._format_run_for_rtf(block)}\\par')
+
+            elif isinstance(block, Table):
+                headers = block.headers or []
+                rows = block.rows
 
                 if headers:
                     rtf_parts.append(self._create_rtf_table_row(headers, bold=True))
@@ -198,9 +126,9 @@ class ToRtfConverter(BaseConverter):
 
                 rtf_parts.append('\\par')
 
-            elif block['type'] == 'list':
-                for i, item in enumerate(block['items'], 1):
-                    if block.get('ordered'):
+            elif isinstance(block, ListBlock):
+                for i, item in enumerate(block.items, 1):
+                    if block.ordered:
                         bullet = f'{i}.'
                     else:
                         bullet = '\\bullet'
@@ -209,10 +137,10 @@ class ToRtfConverter(BaseConverter):
                     )
                 rtf_parts.append('\\par')
 
-            elif block['type'] == 'link':
+            elif isinstance(block, Link):
                 rtf_parts.append(
-                    f'\\pard {escape_rtf(block["text"])} '
-                    f'(\\cf2 {escape_rtf(block["url"])}\\cf0)\\par'
+                    f'\\pard {escape_rtf(block.text)} '
+                    f'(\\cf2 {escape_rtf(block.url)}\\cf0)\\par'
                 )
 
         rtf_parts.append('}')
@@ -222,6 +150,34 @@ class ToRtfConverter(BaseConverter):
 
         return True
 
+    def _format_run_for_rtf(self, block: Run) -> str:
+        """Format a run block as inline RTF control words."""
+        rtf_text = ''
+        if block.bold:
+            rtf_text += '\\b '
+        if block.italic:
+            rtf_text += '\\i '
+        if block.underline:
+            rtf_text += '\\ul '
+
+        if block.color:
+            rgb = hex_to_rgb(block.color)
+            if rgb:
+                rtf_text += '\\cf1 '
+
+        rtf_text += escape_rtf(block.text)
+
+        if block.bold:
+            rtf_text += '\\b0 '
+        if block.italic:
+            rtf_text += '\\i0 '
+        if block.underline:
+            rtf_text += '\\ul0 '
+        if block.color:
+            rtf_text += '\\cf0 '
+
+        return rtf_text
+
     def _create_rtf_table_row(self, cells: List[str], bold: bool = False) -> str:
         """Create RTF table row."""
         cell_width = 2000
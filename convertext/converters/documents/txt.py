@@ -1,9 +1,12 @@
 """Plain text converter."""
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
-from convertext.converters.base import BaseConverter, Document
+from convertext.converters.base import BaseConverter, Document, StreamingDocument
+from convertext.converters.blocks import Block, Heading, Paragraph, Text
+from convertext.converters.txt_reader import iter_txt
+from convertext.converters.utils import LineWriter
 
 
 class TxtConverter(BaseConverter):
@@ -22,8 +25,9 @@ class TxtConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert plain text to target format."""
-        doc = self._read_txt(source_path, config)
+        doc = StreamingDocument(lambda d: self._iter_txt(source_path, config, d))
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
@@ -37,53 +41,46 @@ class TxtConverter(BaseConverter):
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read plain text into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
+        return StreamingDocument(lambda d: self._iter_txt(path, config, d)).materialize()
 
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-            for para in content.split('\n\n'):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-
-        return doc
+    def _iter_txt(self, path: Path, config: Dict[str, Any], doc: Document) -> Iterator[Block]:
+        """Yield blank-line separated paragraphs from a memory map of the file."""
+        encoding = self._source_encoding(path, config)
+        return iter_txt(path, encoding)
 
     def _write_txt(self, doc: Document, path: Path) -> bool:
         """Write Document to plain text."""
         with open(path, 'w', encoding='utf-8') as f:
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-            '<title>Document</title>',
-            '</head>',
-            '<body>'
-        ]
-
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
-            elif block['type'] == 'text':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-
-        html_parts.append('</body>')
-        html_parts.append('</html>')
-
         with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+                '<title>Document</title>',
+                '</head>',
+                '<body>'
+            ])
+
+            for block in doc.content:
+                if isinstance(block, (Paragraph, Text)):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
+
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -91,12 +88,10 @@ class TxtConverter(BaseConverter):
         """Write Document to Markdown."""
         with open(path, 'w', encoding='utf-8') as f:
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * block['level'] + ' ' + block['data'] + '\n\n')
-                elif block['type'] == 'text':
-                    f.write(block['data'] + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * block.level + ' ' + block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
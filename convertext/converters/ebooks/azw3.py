@@ -2,14 +2,24 @@
 
 import html as _html
 import random
+import re
 import struct
 import time
 from collections import namedtuple
+from contextlib import closing
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.ebooks.mobi_book import MobiBook
+from convertext.converters.ebooks.palmdoc import decompress
+from convertext.converters.html_reader import read_html
+from convertext.converters.markdown_reader import read_markdown
+from convertext.converters.ranges import ReadRange
+from convertext.converters.txt_reader import read_txt
+from convertext.converters.utils import LineWriter
 
 _FLIS = (b'FLIS\x00\x00\x00\x08\x00\x41\x00\x00\x00\x00\x00\x00'
          b'\xff\xff\xff\xff\x00\x01\x00\x03\x00\x00\x00\x03'
@@ -17,12 +27,20 @@ _FLIS = (b'FLIS\x00\x00\x00\x08\x00\x41\x00\x00\x00\x00\x00\x00'
 
 _EOF = b'\xe9\x8e\x0d\x0a'
 
+_BLOCK_END = re.compile(rb'</(?:p|h[1-6])\s*>', re.IGNORECASE)
+_HEADING_END = re.compile(rb'</h[1-6]\s*>', re.IGNORECASE)
+# KF8 text holds XHTML skeletons with their content fragments after them;
+# lxml ignores everything past </html>, so each piece is parsed on its own
+_DOC_END = re.compile(r'(?<=</html>)', re.IGNORECASE)
+
 ChunkInfo = namedtuple('ChunkInfo', 'pre_start pre_length insert_offset content_start content_length')
 
 
 class Azw3Converter(BaseConverter):
     """Read AZW3/AZW/MOBI files - native PDB/MOBI parser."""
 
+    ranged_formats = ('azw3', 'azw', 'mobi')
+
     @property
     def input_formats(self) -> List[str]:
         return ['azw3', 'azw', 'mobi']
@@ -37,6 +55,7 @@ class Azw3Converter(BaseConverter):
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         doc = self._read_azw3(source_path, config)
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
@@ -49,141 +68,61 @@ class Azw3Converter(BaseConverter):
         return False
 
     def _read_azw3(self, path: Path, config: Dict[str, Any]) -> Document:
-        """Read AZW3/MOBI file - native PDB parser."""
-        doc = Document()
+        """Read AZW3/MOBI file - native PDB parser.
 
-        with open(path, 'rb') as f:
-            f.seek(76)
-            num_records = struct.unpack('>H', f.read(2))[0]
-
-            f.seek(78)
-            records = []
-            for _ in range(num_records):
-                offset = struct.unpack('>I', f.read(4))[0]
-                records.append(offset)
-                f.read(4)
-
-            f.seek(records[0])
-            rec0_size = records[1] - records[0] if len(records) > 1 else 1024
-            rec0 = f.read(rec0_size)
-
-            compression = struct.unpack('>H', rec0[0:2])[0]
-            text_length = struct.unpack('>I', rec0[4:8])[0]
-            num_text_records = struct.unpack('>H', rec0[8:10])[0]
-
-            mobi_header_len = struct.unpack('>I', rec0[20:24])[0]
-            encoding_val = struct.unpack('>I', rec0[28:32])[0]
-
-            extra_data_flags = 0
-            if len(rec0) >= 244:
-                extra_data_flags = struct.unpack('>I', rec0[240:244])[0]
-
-            exth_flags = struct.unpack('>I', rec0[128:132])[0]
-            if exth_flags & 0x40:
-                exth_offset = 16 + mobi_header_len
-                if exth_offset + 12 <= len(rec0) and rec0[exth_offset:exth_offset+4] == b'EXTH':
-                    exth_len = struct.unpack('>I', rec0[exth_offset+4:exth_offset+8])[0]
-                    exth_count = struct.unpack('>I', rec0[exth_offset+8:exth_offset+12])[0]
-                    pos = exth_offset + 12
-                    for _ in range(exth_count):
-                        if pos + 8 > len(rec0):
-                            break
-                        rec_type = struct.unpack('>I', rec0[pos:pos+4])[0]
-                        rec_len = struct.unpack('>I', rec0[pos+4:pos+8])[0]
-                        rec_data = rec0[pos+8:pos+rec_len]
-                        if rec_type == 100:
-                            doc.metadata['author'] = rec_data.decode('utf-8', errors='ignore')
-                        elif rec_type == 503:
-                            doc.metadata['title'] = rec_data.decode('utf-8', errors='ignore')
-                        pos += rec_len
+        KF8 books are rebuilt part by part from their skeleton and fragment
+        indexes. MOBI 6 books, KF8 books read with a unit range (which
+        selects text records), and KF8 books whose indexes are broken or
+        point past the text are read from the text stream in order.
+        """
+        doc = Document()
+        rng = ReadRange.from_config(config)
+        workers = config.get('mobi', {}).get('workers')
+
+        try:
+            book = MobiBook(path, cache_size=0, workers=workers)
+        except (ValueError, struct.error):
+            # Unreadable KF8 indexes; raises again if the header is broken too
+            book = MobiBook(path, cache_size=0, workers=workers, indexes=False)
+
+        with book:
+            doc.metadata.update(book.metadata)
+            if book.parts and not (rng and rng.has_units):
+                try:
+                    with closing(book.chapters()) as chapters:
+                        for blocks in chapters:
+                            doc.content.extend(blocks)
+                            if rng and rng.full(doc.content):
+                                break
+                    return doc
+                except (ValueError, struct.error, IndexError):
+                    # A part that cannot be rebuilt: start over from the stream
+                    doc.content = []
+
+            # A read range selects text records; block and heading caps stop
+            # decompressing once enough closing tags have been seen
+            units = rng.units(book.text_record_count) if rng else None
+            blocks_seen = headings_seen = 0
 
             html_parts = []
-            for i in range(1, num_text_records + 1):
-                if i >= len(records) - 1:
-                    break
-
-                f.seek(records[i])
-                record_data = f.read(records[i + 1] - records[i])
-
-                # Strip trailing bytes per extra_data_flags bits (sequential, high bits first)
-                n = 0
-                for bit in range(15, 0, -1):
-                    if extra_data_flags & (1 << bit):
-                        b = record_data[-1 - n]
-                        sz = b & 0x7f
-                        if not (b & 0x80):
-                            sz = (sz << 7) | (record_data[-2 - n] & 0x7f)
-                            n += 1
-                        n += sz + 1
-                if extra_data_flags & 1:
-                    b = record_data[-1 - n]
-                    n += (b & 3) + 1
-                if n:
-                    record_data = record_data[:-n]
+            with closing(book.text_records(units)) as texts:
+                for text in texts:
+                    html_parts.append(text.decode(book.encoding, errors='ignore'))
+                    if rng:
+                        blocks_seen += len(_BLOCK_END.findall(text))
+                        headings_seen += len(_HEADING_END.findall(text))
+                        if ((rng.blocks is not None and blocks_seen >= rng.blocks)
+                                or (rng.headings is not None and headings_seen > rng.headings)):
+                            break
 
-                try:
-                    if compression == 2:
-                        text = self._palmdoc_decompress(record_data)
-                    else:
-                        text = record_data
-                    html_parts.append(text.decode('utf-8', errors='ignore'))
-                except Exception:
-                    continue
-
-            html_content = ''.join(html_parts)
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            title_tag = soup.find('title')
-            if title_tag and not doc.metadata.get('title'):
-                doc.metadata['title'] = title_tag.get_text()
-
-            for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                if element.name.startswith('h'):
-                    level = int(element.name[1])
-                    text = element.get_text().strip()
-                    if text:
-                        doc.add_heading(text, level)
-                elif element.name == 'p':
-                    text = element.get_text().strip()
-                    if text:
-                        doc.add_paragraph(text)
+            for part in _DOC_END.split(''.join(html_parts)):
+                read_html(part, doc)
 
         return doc
 
     def _palmdoc_decompress(self, data: bytes) -> bytes:
         """Decompress PalmDOC compressed data."""
-        result = []
-        i = 0
-
-        while i < len(data):
-            c = data[i]
-            i += 1
-
-            if c == 0:
-                result.append(0)
-            elif 1 <= c <= 8:
-                result.extend(data[i:i + c])
-                i += c
-            elif 0x09 <= c <= 0x7F:
-                result.append(c)
-            elif 0xC0 <= c:
-                result.append(0x20)
-                result.append(c ^ 0x80)
-            else:
-                if i < len(data):
-                    c2 = data[i]
-                    i += 1
-                    dist = ((c << 8 | c2) >> 3) & 0x7FF
-                    length = (c2 & 0x07) + 3
-                    start = len(result) - dist
-                    if start >= 0:
-                        for _ in range(length):
-                            if start < len(result):
-                                result.append(result[start])
-                                start += 1
-
-        return bytes(result)
+        return decompress(data)
 
     def _write_txt(self, doc: Document, path: Path) -> bool:
         with open(path, 'w', encoding='utf-8') as f:
@@ -194,43 +133,42 @@ class Azw3Converter(BaseConverter):
                 f.write(f"By: {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('\n' + block['data'].upper() + '\n')
-                    f.write('-' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('\n' + block.data.upper() + '\n')
+                    f.write('-' * len(block.data) + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
-        html_parts = [
-            '<!DOCTYPE html>', '<html>', '<head>', '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<title>{_esc(doc.metadata['title'])}</title>")
-        else:
-            html_parts.append('<title>Document</title>')
+        with open(path, 'w', encoding='utf-8') as f:
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>', '<html>', '<head>', '<meta charset="utf-8">',
+            ])
 
-        html_parts.append('</head>')
-        html_parts.append('<body>')
+            if doc.metadata.get('title'):
+                html_parts.append(f"<title>{_esc(doc.metadata['title'])}</title>")
+            else:
+                html_parts.append('<title>Document</title>')
 
-        if doc.metadata.get('title'):
-            html_parts.append(f"<h1>{_esc(doc.metadata['title'])}</h1>")
-        if doc.metadata.get('author'):
-            html_parts.append(f"<p><em>By {_esc(doc.metadata['author'])}</em></p>")
+            html_parts.append('</head>')
+            html_parts.append('<body>')
 
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{_esc(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{_esc(block['data'])}</h{level}>")
+            if doc.metadata.get('title'):
+                html_parts.append(f"<h1>{_esc(doc.metadata['title'])}</h1>")
+            if doc.metadata.get('author'):
+                html_parts.append(f"<p><em>By {_esc(doc.metadata['author'])}</em></p>")
 
-        html_parts.append('</body>')
-        html_parts.append('</html>')
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    html_parts.append(f"<p>{_esc(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{_esc(block.data)}</h{level}>")
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -242,16 +180,20 @@ class Azw3Converter(BaseConverter):
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * (block['level'] + 1) + ' ' + block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * (block.level + 1) + ' ' + block.data + '\n\n')
         return True
 
 
 class ToAzw3Converter(BaseConverter):
     """Convert to KF8/AZW3 format for Kindle."""
 
+    buffered_formats = ('azw3', 'mobi')
+    ranged_formats = ('epub',)
+    image_formats = ('azw3', 'mobi')
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md', 'epub']
@@ -274,88 +216,32 @@ class ToAzw3Converter(BaseConverter):
             doc = self._read_markdown(source_path, config)
         elif source_fmt == 'epub':
             from convertext.converters.ebooks.epub import EpubConverter
-            doc = EpubConverter()._read_epub(source_path, config)
+            reader = EpubConverter()
+            target_fmt = target_path.suffix.lstrip('.').lower()
+            doc = reader._read_cached(reader._read_epub, source_path, self._hinted(config, target_fmt))
         else:
             return False
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
+        doc = self._buffer_for(doc, target_path.suffix.lstrip('.').lower())
         return self._create_kf8(doc, target_path, target_path.stem)
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        lines = content.split('\n')
-        i = 0
-
-        if len(lines) >= 2 and lines[1].strip() and all(c == '=' for c in lines[1].strip()):
-            doc.metadata['title'] = lines[0].strip()
-            i = 2
-            if i < len(lines) and lines[i].startswith('By:'):
-                doc.metadata['author'] = lines[i][3:].strip()
-                i += 1
-            while i < len(lines) and not lines[i].strip():
-                i += 1
-
-        remaining = '\n'.join(lines[i:])
-        for para in remaining.split('\n\n'):
-            if para.strip():
-                doc.add_paragraph(para.strip())
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_txt(path, encoding, header=True)
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    doc.add_paragraph(text)
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_html(path.read_bytes(), encoding=encoding)
 
     def _read_markdown(self, path: Path, config: Dict[str, Any]) -> Document:
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
+        encoding = self._source_encoding(path, config)
 
         with open(path, 'r', encoding=encoding) as f:
             content = f.read()
 
-        import markdown
-        from bs4 import BeautifulSoup
-        html_content = markdown.markdown(content)
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text(), level)
-            elif element.name == 'p':
-                doc.add_paragraph(element.get_text())
-
-        return doc
+        return read_markdown(content)
 
     def _create_kf8(self, doc: Document, path: Path, default_title: str) -> bool:
         """Create KF8/AZW3 file with proper skeleton/chunk INDX records."""
@@ -512,24 +398,14 @@ def _split_text_records(text_data: bytes) -> list:
 def _build_kf8_content(doc: Document, title: str):
     """Build KF8 text stream with skeleton/chunk structure.
 
-    Each h1-delimited section becomes a separate chunk with its own skeleton.
-    Returns (text_bytes, list_of_ChunkInfo, toc_entries).
+    Each section of ``doc.sections`` becomes a separate chunk with its own
+    skeleton. Returns (text_bytes, list_of_ChunkInfo, toc_entries).
     """
-    chunks_content = []
-    chapter_titles = []
-    current = []
-    for block in doc.content:
-        if block['type'] == 'heading' and block['level'] == 1:
-            if current:
-                chunks_content.append(current)
-            current = [block]
-            chapter_titles.append(block['data'])
-        else:
-            current.append(block)
-    if current:
-        chunks_content.append(current)
+    sections = doc.sections
+    chunks_content = [doc.content[s.start:s.end] for s in sections]
+    chapter_titles = [s.title if s.level == 1 else None for s in sections]
     if not chunks_content:
-        chunks_content = [[{'type': 'paragraph', 'data': ' '}]]
+        chunks_content = [[Paragraph(' ')]]
 
     text_parts = []
     chunk_infos = []
@@ -551,11 +427,11 @@ def _build_kf8_content(doc: Document, title: str):
 
         body_parts = []
         for block in blocks:
-            if block['type'] in ('paragraph', 'text'):
-                body_parts.append(f'<p>{_esc(block["data"])}</p>')
-            elif block['type'] == 'heading':
-                level = block['level']
-                body_parts.append(f'<h{level}>{_esc(block["data"])}</h{level}>')
+            if isinstance(block, (Paragraph, Text)):
+                body_parts.append(f'<p>{_esc(block.data)}</p>')
+            elif isinstance(block, Heading):
+                level = block.level
+                body_parts.append(f'<h{level}>{_esc(block.data)}</h{level}>')
         body = ''.join(body_parts).encode('utf-8')
 
         pre_start = offset
@@ -571,10 +447,10 @@ def _build_kf8_content(doc: Document, title: str):
 
     # Build TOC entries from chapter titles and chunk positions
     toc_entries = []
-    for i, ci in enumerate(chunk_infos):
-        if i < len(chapter_titles):
+    for ci, chapter_title in zip(chunk_infos, chapter_titles):
+        if chapter_title is not None:
             section_len = ci.pre_length + ci.content_length
-            toc_entries.append({'label': chapter_titles[i], 'offset': ci.pre_start, 'length': section_len})
+            toc_entries.append({'label': chapter_title, 'offset': ci.pre_start, 'length': section_len})
 
     return b''.join(text_parts), chunk_infos, toc_entries
 
@@ -691,9 +567,11 @@ def _build_chunk_indx(chunk_infos: list, text_length: int) -> list:
     cncx_strings = [f"P-//*[@aid='{_to_base32(i)}']" for i in range(len(chunk_infos))]
     cncx_rec, cncx_offsets = _build_cncx(cncx_strings)
 
+    # Keyed by insert position: the skeleton's text offset plus the
+    # insertion point within it
     entries = []
     for i, ci in enumerate(chunk_infos):
-        label = f'{ci.content_start:010d}'
+        label = f'{ci.pre_start + ci.insert_offset:010d}'
         label_enc = struct.pack('B', len(label)) + label.encode('ascii')
         # All 4 tags are single-bit masks, so 0x0F = all present with 1 entry each
         cb = b'\x0F'
@@ -701,12 +579,12 @@ def _build_chunk_indx(chunk_infos: list, text_length: int) -> list:
             _encint(cncx_offsets[i]) +     # cncx_offset
             _encint(i) +                    # file_number (skeleton index)
             _encint(0) +                    # sequence_number (first chunk in skeleton)
-            _encint(ci.insert_offset) +    # insertion point within skeleton
+            _encint(0) +                    # offset among the skeleton's chunks
             _encint(ci.content_length)     # length of content to insert from rawml
         )
         entries.append(label_enc + cb + vals)
 
-    last_key = f'{chunk_infos[-1].content_start:010d}'
+    last_key = f'{chunk_infos[-1].pre_start + chunk_infos[-1].insert_offset:010d}'
     header_rec = _build_indx_header(tagx, last_key, len(entries), len(entries), num_cncx=1)
     data_rec = _build_indx_data(entries)
     return [header_rec, data_rec, cncx_rec]
@@ -1,18 +1,28 @@
 """EPUB format converter - native Python implementation."""
 
 import datetime as dt
+from contextlib import closing
 from pathlib import Path
 from typing import Any, Dict, List
 import zipfile
-from lxml import etree
-from bs4 import BeautifulSoup
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.ebooks.epub_book import EpubBook
+from convertext.converters.ebooks.epub_spine import read_spine
+from convertext.converters.hints import ReadHints
+from convertext.converters.html_reader import read_html
+from convertext.converters.markdown_reader import read_markdown
+from convertext.converters.ranges import ReadRange
+from convertext.converters.txt_reader import read_txt
+from convertext.converters.utils import LineWriter
 
 
 class EpubConverter(BaseConverter):
     """Lightweight EPUB format converter (native Python)."""
 
+    ranged_formats = ('epub',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['epub']
@@ -26,10 +36,11 @@ class EpubConverter(BaseConverter):
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
         """Convert EPUB to target format."""
-        doc = self._read_epub(source_path, config)
+        target_fmt = target_path.suffix.lstrip('.').lower()
+        doc = self._read_cached(self._read_epub, source_path, self._hinted(config, target_fmt))
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
-        target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
             return self._write_txt(doc, target_path)
         elif target_fmt == 'html':
@@ -42,90 +53,30 @@ class EpubConverter(BaseConverter):
     def _read_epub(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read EPUB - native parser using zipfile + lxml."""
         doc = Document()
-
-        with zipfile.ZipFile(path, 'r') as zf:
-            # Find OPF file location from container.xml
-            container = etree.fromstring(zf.read('META-INF/container.xml'))
-            opf_path = container.find('.//{urn:oasis:names:tc:opendocument:xmlns:container}rootfile').get('full-path')
-
-            # Parse OPF for metadata and spine
-            opf = etree.fromstring(zf.read(opf_path))
-            opf_dir = str(Path(opf_path).parent)
-
-            # Extract metadata
-            ns = {'opf': 'http://www.idpf.org/2007/opf', 'dc': 'http://purl.org/dc/elements/1.1/'}
-
-            title = opf.find('.//dc:title', ns)
-            if title is not None and title.text:
-                doc.metadata['title'] = title.text
-
-            creator = opf.find('.//dc:creator', ns)
-            if creator is not None and creator.text:
-                doc.metadata['author'] = creator.text
-
-            lang = opf.find('.//dc:language', ns)
-            if lang is not None and lang.text:
-                doc.metadata['language'] = lang.text
-
-            for tag, key in [('dc:description', 'description'), ('dc:publisher', 'publisher'),
-                             ('dc:subject', 'subject'), ('dc:date', 'date')]:
-                el = opf.find(f'.//{tag}', ns)
-                if el is not None and el.text:
-                    doc.metadata[key] = el.text.strip()
-
-            # Get spine order (reading order)
-            manifest = {item.get('id'): item.get('href')
-                       for item in opf.findall('.//opf:manifest/opf:item', ns)}
-            manifest_types = {item.get('id'): item.get('media-type', '')
-                             for item in opf.findall('.//opf:manifest/opf:item', ns)}
-
-            # Extract cover image
-            cover_id = None
-            cover_meta = opf.find('.//opf:metadata/opf:meta[@name="cover"]', ns)
-            if cover_meta is not None:
-                cover_id = cover_meta.get('content')
-            if not cover_id:
-                for item in opf.findall('.//opf:manifest/opf:item', ns):
-                    if 'cover-image' in (item.get('properties') or ''):
-                        cover_id = item.get('id')
-                        break
-            if cover_id and cover_id in manifest:
-                cover_href = manifest[cover_id]
-                if opf_dir and opf_dir != '.':
-                    cover_href = f"{opf_dir}/{cover_href}"
-                try:
-                    cover_data = zf.read(cover_href)
-                    fmt = manifest_types.get(cover_id, '').split('/')[-1].replace('jpeg', 'jpg')
-                    doc.images['cover'] = {'data': cover_data, 'format': fmt or 'jpg'}
-                except (KeyError, Exception):
-                    pass
-
-            spine_items = opf.findall('.//opf:spine/opf:itemref', ns)
-
-            # Read content in spine order
-            for itemref in spine_items:
-                idref = itemref.get('idref')
-                if idref in manifest:
-                    content_path = manifest[idref]
-                    if opf_dir and opf_dir != '.':
-                        content_path = f"{opf_dir}/{content_path}"
-
-                    try:
-                        content = zf.read(content_path).decode('utf-8', errors='ignore')
-                        soup = BeautifulSoup(content, 'html.parser')
-
-                        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                            if element.name.startswith('h'):
-                                level = int(element.name[1])
-                                text = element.get_text().strip()
-                                if text:
-                                    doc.add_heading(text, level)
-                            elif element.name == 'p':
-                                text = element.get_text().strip()
-                                if text:
-                                    doc.add_paragraph(text)
-                    except Exception:
-                        continue
+        hints = ReadHints.from_config(config)
+
+        with EpubBook(path) as book:
+            doc.metadata.update(book.metadata)
+
+            # Referenced, not read: even image targets load it only on use
+            if hints.images and book.cover and book.has_member(book.manifest[book.cover].member):
+                cover = book.manifest[book.cover]
+                fmt = cover.media_type.split('/')[-1].replace('jpeg', 'jpg')
+                doc.images.add_zip_member('cover', path, cover.member, fmt or 'jpg')
+
+            members = book.spine if hints.content else []
+            rng = ReadRange.from_config(config)
+            if rng:
+                members = members[rng.start:rng.stop]
+
+        epub_config = config.get('epub', {})
+        spine = read_spine(path, members, epub_config.get('workers'), epub_config.get('processes') or 0)
+        with closing(spine):
+            for blocks in spine:
+                if blocks:
+                    doc.content.extend(blocks)
+                if rng and rng.full(doc.content):
+                    break
 
         return doc
 
@@ -139,47 +90,46 @@ class EpubConverter(BaseConverter):
                 f.write(f"By: {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('\n' + block['data'].upper() + '\n')
-                    f.write('-' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('\n' + block.data.upper() + '\n')
+                    f.write('-' * len(block.data) + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
-        else:
-            html_parts.append('<title>Document</title>')
+        with open(path, 'w', encoding='utf-8') as f:
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+            ])
 
-        html_parts.append('</head>')
-        html_parts.append('<body>')
+            if doc.metadata.get('title'):
+                html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
+            else:
+                html_parts.append('<title>Document</title>')
 
-        if doc.metadata.get('title'):
-            html_parts.append(f"<h1>{self._escape_html(doc.metadata['title'])}</h1>")
-        if doc.metadata.get('author'):
-            html_parts.append(f"<p><em>By {self._escape_html(doc.metadata['author'])}</em></p>")
+            html_parts.append('</head>')
+            html_parts.append('<body>')
 
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
+            if doc.metadata.get('title'):
+                html_parts.append(f"<h1>{self._escape_html(doc.metadata['title'])}</h1>")
+            if doc.metadata.get('author'):
+                html_parts.append(f"<p><em>By {self._escape_html(doc.metadata['author'])}</em></p>")
 
-        html_parts.append('</body>')
-        html_parts.append('</html>')
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -192,10 +142,10 @@ class EpubConverter(BaseConverter):
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * (block['level'] + 1) + ' ' + block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * (block.level + 1) + ' ' + block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
@@ -211,6 +161,8 @@ class EpubConverter(BaseConverter):
 class ToEpubConverter(BaseConverter):
     """Convert various formats to EPUB."""
 
+    buffered_formats = ('epub',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md']
@@ -235,71 +187,28 @@ class ToEpubConverter(BaseConverter):
         else:
             return False
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
-        return self._create_epub(doc, target_path, config, target_path.stem)
+        return self._create_epub(self._buffer_for(doc, 'epub'), target_path, config, target_path.stem)
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read plain text into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-            for para in content.split('\n\n'):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_txt(path, encoding)
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read HTML into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    doc.add_paragraph(text)
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_html(path.read_bytes(), encoding=encoding)
 
     def _read_markdown(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read Markdown into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
+        encoding = self._source_encoding(path, config)
 
         with open(path, 'r', encoding=encoding) as f:
             content = f.read()
 
-        import markdown
-        html_content = markdown.markdown(content)
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text(), level)
-            elif element.name == 'p':
-                doc.add_paragraph(element.get_text())
-
-        return doc
+        return read_markdown(content)
 
     def _create_epub(self, doc: Document, path: Path, config: Dict[str, Any], default_title: str) -> bool:
         """Create EPUB from Document - native implementation."""
@@ -310,34 +219,25 @@ class ToEpubConverter(BaseConverter):
         language = doc.metadata.get('language', 'en')
         uid = str(uuid.uuid4())
 
-        # Split content into chapters
+        # One chapter file per section; untitled sections get a numbered title
         chapters = []
-        current_chapter = []
         chapter_titles = []
 
-        for block in doc.content:
-            if block['type'] == 'heading' and block['level'] == 1:
-                if current_chapter:
-                    chapters.append(current_chapter)
-                    current_chapter = []
-                chapter_titles.append(block['data'])
-                current_chapter.append(f'<h1>{self._escape_html(block["data"])}</h1>')
-            elif block['type'] == 'paragraph':
-                current_chapter.append(f'<p>{self._escape_html(block["data"])}</p>')
-            elif block['type'] == 'heading':
-                level = block['level']
-                current_chapter.append(f'<h{level}>{self._escape_html(block["data"])}</h{level}>')
-
-        if current_chapter:
-            chapters.append(current_chapter)
+        for i, section in enumerate(doc.sections, 1):
+            chapter = []
+            for block in doc.content[section.start:section.end]:
+                if isinstance(block, Paragraph):
+                    chapter.append(f'<p>{self._escape_html(block.data)}</p>')
+                elif isinstance(block, Heading):
+                    level = block.level
+                    chapter.append(f'<h{level}>{self._escape_html(block.data)}</h{level}>')
+            chapters.append(chapter)
+            chapter_titles.append(section.title or f'Chapter {i}')
 
         if not chapters:
             chapters = [['<p>No content</p>']]
             chapter_titles = ['Content']
 
-        if not chapter_titles:
-            chapter_titles = [f'Chapter {i+1}' for i in range(len(chapters))]
-
         # Create EPUB ZIP structure
         with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
             # mimetype (must be uncompressed and first)
@@ -376,6 +276,10 @@ class ToEpubConverter(BaseConverter):
 </html>'''
                 zf.writestr(f'OEBPS/{filename}', xhtml)
 
+            manifest_xml = ''.join(item + '\n' for item in manifest_items)
+            spine_xml = ''.join(item + '\n' for item in spine_items)
+            toc_xml = ''.join(item + '\n' for item in toc_items)
+
             # content.opf
             opf = f'''<?xml version="1.0" encoding="UTF-8"?>
 <package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="uid">
@@ -388,10 +292,10 @@ class ToEpubConverter(BaseConverter):
   </metadata>
   <manifest>
     <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>
-{''.join([item + '\n' for item in manifest_items])}
+{manifest_xml}
   </manifest>
   <spine toc="ncx">
-{''.join([item + '\n' for item in spine_items])}
+{spine_xml}
   </spine>
 </package>'''
             zf.writestr('OEBPS/content.opf', opf)
@@ -407,7 +311,7 @@ class ToEpubConverter(BaseConverter):
     <text>{self._escape_html(title)}</text>
   </docTitle>
   <navMap>
-{''.join([item + '\n' for item in toc_items])}
+{toc_xml}
   </navMap>
 </ncx>'''
             zf.writestr('OEBPS/toc.ncx', ncx)
@@ -0,0 +1,252 @@
+"""Lazy, random-access view of an EPUB.
+
+``EpubBook`` reads ``META-INF/container.xml`` and the OPF package document
+when opened: metadata, manifest and spine. Nothing else is read until asked
+for. The table of contents is parsed on first access, a chapter (spine
+item) is inflated and parsed when it is requested, and images are read from
+the archive by name. Recently used chapters are kept in a small LRU cache,
+so previews and chapter-level extraction over many books touch only the
+members they need.
+
+Example:
+    >>> with EpubBook(path) as book:
+    ...     book.metadata['title'], len(book)
+    ...     [entry['title'] for entry in book.toc]
+    ...     blocks = book.chapter(3)
+    ...     cover = book.image(book.cover) if book.cover else None
+"""
+
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Union
+
+from lxml import etree
+
+from convertext.converters.blocks import Block
+from convertext.converters.ebooks.epub_spine import parse_member
+
+_CONTAINER_NS = 'urn:oasis:names:tc:opendocument:xmlns:container'
+NS = {
+    'opf': 'http://www.idpf.org/2007/opf',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'ncx': 'http://www.daisy.org/z3986/2005/ncx/',
+    'xhtml': 'http://www.w3.org/1999/xhtml',
+    'epub': 'http://www.idpf.org/2007/ops',
+}
+_METADATA = (('dc:title', 'title'), ('dc:creator', 'author'), ('dc:language', 'language'),
+             ('dc:description', 'description'), ('dc:publisher', 'publisher'),
+             ('dc:subject', 'subject'), ('dc:date', 'date'))
+# Title, author and language keep their whitespace, as they always have
+_STRIPPED = frozenset(('description', 'publisher', 'subject', 'date'))
+
+#: Decoded chapters kept per book
+DEFAULT_CACHE_SIZE = 8
+
+
+class ManifestItem(NamedTuple):
+    """One manifest entry; member is the full path inside the archive."""
+    id: str
+    member: str
+    media_type: str
+    properties: str
+
+
+class EpubBook:
+    """An EPUB whose chapters and images load on demand.
+
+    Args:
+        path: EPUB file
+        cache_size: Decoded chapters to keep; 0 disables the cache
+
+    Raises:
+        KeyError, zipfile.BadZipFile, etree.XMLSyntaxError: If the archive,
+            container or package document is broken
+    """
+
+    def __init__(self, path: Union[str, Path], cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self._zf = zipfile.ZipFile(self.path)
+        self._lock = threading.Lock()
+        self._chapters: 'OrderedDict[int, List[Block]]' = OrderedDict()
+        self._toc: Optional[List[Dict[str, Any]]] = None
+        try:
+            self._read_package()
+        except Exception:
+            self._zf.close()
+            raise
+
+    def _read_package(self):
+        container = etree.fromstring(self._zf.read('META-INF/container.xml'))
+        self.opf_path = container.find(f'.//{{{_CONTAINER_NS}}}rootfile').get('full-path')
+        opf = etree.fromstring(self._zf.read(self.opf_path))
+        opf_dir = posixpath.dirname(self.opf_path)
+
+        #: Dublin Core metadata: title, author, language, description, ...
+        self.metadata: Dict[str, str] = {}
+        for tag, key in _METADATA:
+            el = opf.find(f'.//{tag}', NS)
+            if el is not None and el.text:
+                self.metadata[key] = el.text.strip() if key in _STRIPPED else el.text
+
+        #: Manifest items by id
+        self.manifest: Dict[str, ManifestItem] = {}
+        for item in opf.findall('.//opf:manifest/opf:item', NS):
+            href = item.get('href') or ''
+            self.manifest[item.get('id')] = ManifestItem(
+                item.get('id'),
+                f'{opf_dir}/{href}' if opf_dir and opf_dir != '.' else href,
+                item.get('media-type', ''),
+                item.get('properties') or '',
+            )
+
+        spine = opf.find('.//opf:spine', NS)
+        itemrefs = spine.findall('opf:itemref', NS) if spine is not None else []
+        #: Archive members of the spine items, in reading order
+        self.spine: List[str] = [self.manifest[ref.get('idref')].member
+                                 for ref in itemrefs if ref.get('idref') in self.manifest]
+        self._ncx_id = spine.get('toc') if spine is not None else None
+        self._spine_index = {member: i for i, member in enumerate(self.spine)}
+
+        #: Manifest id of the cover image, or None
+        self.cover: Optional[str] = None
+        cover_meta = opf.find('.//opf:metadata/opf:meta[@name="cover"]', NS)
+        if cover_meta is not None:
+            self.cover = cover_meta.get('content')
+        if not self.cover:
+            self.cover = next((item.id for item in self.manifest.values()
+                               if 'cover-image' in item.properties), None)
+        if self.cover not in self.manifest:
+            self.cover = None
+
+    def __len__(self) -> int:
+        return len(self.spine)
+
+    def __enter__(self) -> 'EpubBook':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the archive. Cached chapters stay readable."""
+        with self._lock:
+            self._zf.close()
+
+    def has_member(self, member: str) -> bool:
+        """Whether the archive contains member."""
+        try:
+            self._zf.getinfo(member)
+            return True
+        except KeyError:
+            return False
+
+    def read(self, member: str) -> bytes:
+        """Raw bytes of an archive member."""
+        with self._lock:
+            return self._zf.read(member)
+
+    def chapter(self, index: int) -> List[Block]:
+        """Blocks of spine item index (negative counts from the end).
+
+        Raises:
+            IndexError: If there is no such spine item
+        """
+        if index < 0:
+            index += len(self.spine)
+        if not 0 <= index < len(self.spine):
+            raise IndexError(f'chapter {index} out of range ({len(self.spine)} spine items)')
+        with self._lock:
+            blocks = self._chapters.get(index)
+            if blocks is not None:
+                self._chapters.move_to_end(index)
+                return blocks
+        blocks = parse_member(self.read(self.spine[index]))
+        if self.cache_size > 0:
+            with self._lock:
+                self._chapters[index] = blocks
+                while len(self._chapters) > self.cache_size:
+                    self._chapters.popitem(last=False)
+        return blocks
+
+    def chapters(self, start: int = 0, stop: Optional[int] = None) -> Iterator[List[Block]]:
+        """Blocks of the spine items from start to stop, one list each."""
+        for index in range(*slice(start, stop).indices(len(self.spine))):
+            yield self.chapter(index)
+
+    def image(self, item_id: str) -> bytes:
+        """Bytes of the manifest item item_id (an image, usually)."""
+        return self.read(self.manifest[item_id].member)
+
+    @property
+    def toc(self) -> List[Dict[str, Any]]:
+        """Table of contents entries, parsed on first access.
+
+        Each entry has ``title``, ``level`` (1 for top-level entries),
+        ``href`` (member path plus any fragment) and ``chapter``, the spine
+        index of the entry's member or None. Read from the EPUB 3 nav
+        document if there is one, else from the NCX.
+        """
+        if self._toc is None:
+            self._toc = self._read_nav() or self._read_ncx()
+        return self._toc
+
+    def _read_nav(self) -> List[Dict[str, Any]]:
+        nav_item = next((item for item in self.manifest.values() if 'nav' in item.properties.split()), None)
+        if nav_item is None:
+            return []
+        root = etree.fromstring(self.read(nav_item.member))
+        for nav in root.iter(f'{{{NS["xhtml"]}}}nav'):
+            if nav.get(f'{{{NS["epub"]}}}type') == 'toc':
+                entries: List[Dict[str, Any]] = []
+                self._nav_entries(nav.find('xhtml:ol', NS), nav_item.member, 1, entries)
+                return entries
+        return []
+
+    def _nav_entries(self, ol, base: str, level: int, entries: List[Dict[str, Any]]):
+        if ol is None:
+            return
+        for li in ol.findall('xhtml:li', NS):
+            link = li.find('xhtml:a', NS)
+            if link is None:
+                link = li.find('xhtml:span', NS)
+            if link is not None:
+                entries.append(self._entry(''.join(link.itertext()), link.get('href'), base, level))
+            self._nav_entries(li.find('xhtml:ol', NS), base, level + 1, entries)
+
+    def _read_ncx(self) -> List[Dict[str, Any]]:
+        ncx_item = self.manifest.get(self._ncx_id) if self._ncx_id else None
+        if ncx_item is None:
+            ncx_item = next((item for item in self.manifest.values()
+                             if item.media_type == 'application/x-dtbncx+xml'), None)
+        if ncx_item is None:
+            return []
+        root = etree.fromstring(self.read(ncx_item.member))
+        entries: List[Dict[str, Any]] = []
+        stack = [(point, 1) for point in reversed(root.findall('ncx:navMap/ncx:navPoint', NS))]
+        while stack:
+            point, level = stack.pop()
+            label = point.find('ncx:navLabel/ncx:text', NS)
+            content = point.find('ncx:content', NS)
+            entries.append(self._entry(
+                ''.join(label.itertext()) if label is not None else '',
+                content.get('src') if content is not None else None,
+                ncx_item.member, level,
+            ))
+            stack.extend((child, level + 1) for child in reversed(point.findall('ncx:navPoint', NS)))
+        return entries
+
+    def _entry(self, title: str, href: Optional[str], base: str, level: int) -> Dict[str, Any]:
+        target = chapter = None
+        if href:
+            member, _, fragment = href.partition('#')
+            if member:
+                member = posixpath.normpath(posixpath.join(posixpath.dirname(base), member))
+            else:
+                member = base
+            target = f'{member}#{fragment}' if fragment else member
+            chapter = self._spine_index.get(member)
+        return {'title': title.strip(), 'level': level, 'href': target, 'chapter': chapter}
@@ -0,0 +1,143 @@
+"""Concurrent reading of EPUB spine items.
+
+With ``workers`` above 1, spine members are inflated and parsed on a
+thread pool; by default they are read one by one. zlib and lxml's parser
+release the GIL, so both scale across cores; each thread opens its
+own ``ZipFile`` handle, so members are not read through one shared file
+position. With ``processes``, the threads only inflate and hand each member
+to a process pool for parsing, which also spreads the Python-level block
+building.
+
+Results come back in spine order, and at most a few members per worker are
+in flight, so a reader that stops early (a read range) does not pay for the
+rest of the book.
+
+Example:
+    >>> for blocks in read_spine(path, ['OEBPS/ch1.xhtml', 'OEBPS/ch2.xhtml'], workers=4):
+    ...     doc.content.extend(blocks or ())
+"""
+
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Deque, Iterator, List, Optional, Sequence
+
+from convertext.converters.blocks import Block
+from convertext.converters.html_reader import read_html
+from convertext.converters.utils import process_pool_context
+
+# Members in flight per worker thread
+_LOOKAHEAD = 2
+
+
+def parse_member(data: bytes) -> List[Block]:
+    """Blocks of one spine item's XHTML."""
+    return read_html(data, title=False).content
+
+
+def read_spine(
+    path: Path,
+    members: Sequence[str],
+    workers: Optional[int] = 1,
+    processes: int = 0,
+) -> Iterator[Optional[List[Block]]]:
+    """Yield the blocks of each member of the EPUB at path, in order.
+
+    A member that is missing or cannot be parsed yields None.
+
+    Args:
+        path: EPUB file
+        members: Zip member names in spine order
+        workers: Threads inflating (and without processes, parsing)
+            members; 1 (or None) reads them one by one
+        processes: Parse in this many processes; 0 parses on the threads
+    """
+    workers = max(1, workers or 1)
+    if workers == 1 or len(members) < 2:
+        with zipfile.ZipFile(path) as zf:
+            for member in members:
+                yield _read_member(zf, member)
+        return
+
+    reader = _SpineReader(path, processes)
+    pool = ThreadPoolExecutor(max_workers=min(workers, len(members)))
+    pending: Deque[Future] = deque()
+    remaining = iter(members)
+    try:
+        for member in remaining:
+            pending.append(pool.submit(reader.read, member))
+            if len(pending) >= workers * _LOOKAHEAD:
+                break
+        while pending:
+            blocks = pending.popleft().result()
+            member = next(remaining, None)
+            if member is not None:
+                pending.append(pool.submit(reader.read, member))
+            yield blocks
+    finally:
+        # Stopped early: drop queued members and don't wait for running ones
+        pool.shutdown(wait=not pending, cancel_futures=True)
+        reader.close()
+
+
+def _read_member(zf: zipfile.ZipFile, member: str) -> Optional[List[Block]]:
+    try:
+        return parse_member(zf.read(member))
+    except Exception:
+        return None
+
+
+class _SpineReader:
+    """Reads members of one EPUB with a ZipFile handle per thread."""
+
+    def __init__(self, path: Path, processes: int):
+        self.path = path
+        self._local = threading.local()
+        self._handles: List[zipfile.ZipFile] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._processes = None
+        if processes > 0:
+            self._processes = ProcessPoolExecutor(
+                max_workers=processes, mp_context=process_pool_context(),
+            )
+
+    def read(self, member: str) -> Optional[List[Block]]:
+        zf = getattr(self._local, 'zf', None)
+        if zf is None:
+            zf = self._local.zf = zipfile.ZipFile(self.path)
+            with self._lock:
+                if self._closed:
+                    zf.close()
+                    return None
+                self._handles.append(zf)
+        if self._processes is None:
+            return _read_member(zf, member)
+
+        try:
+            data = zf.read(member)
+        except Exception:
+            return None
+        try:
+            return self._processes.submit(parse_member, data).result()
+        except BrokenProcessPool:
+            # A worker died (crash, out of memory); parse here instead
+            pass
+        except Exception:
+            return None
+        try:
+            return parse_member(data)
+        except Exception:
+            return None
+
+    def close(self):
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._closed = True
+            for zf in self._handles:
+                zf.close()
+            self._handles.clear()
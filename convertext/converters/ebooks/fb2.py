@@ -5,11 +5,19 @@ from typing import Any, Dict, List
 from lxml import etree
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Text
+from convertext.converters.html_reader import read_html
+from convertext.converters.markdown_reader import read_markdown
+from convertext.converters.ranges import ReadRange
+from convertext.converters.txt_reader import read_txt
+from convertext.converters.utils import LineWriter
 
 
 class FB2Converter(BaseConverter):
     """FictionBook 2.0 format converter."""
 
+    ranged_formats = ('fb2',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['fb2']
@@ -25,6 +33,7 @@ class FB2Converter(BaseConverter):
         """Convert FB2 to target format."""
         doc = self._read_fb2(source_path, config)
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
         target_fmt = target_path.suffix.lstrip('.').lower()
         if target_fmt == 'txt':
@@ -37,49 +46,75 @@ class FB2Converter(BaseConverter):
         return False
 
     def _read_fb2(self, path: Path, config: Dict[str, Any]) -> Document:
-        """Read FB2 into intermediate Document."""
-        doc = Document()
+        """Read FB2 into intermediate Document.
 
-        # Parse FB2 XML
-        tree = etree.parse(str(path))
-        root = tree.getroot()
+        The XML is parsed incrementally: each top-level body element is
+        converted once complete and then discarded, so a read range stops
+        parsing as soon as it is covered. Native range units are the
+        top-level sections of the bodies.
+        """
+        doc = Document()
 
         # FB2 namespace
         ns = {'fb': 'http://www.gribuser.ru/xml/fictionbook/2.0'}
-
-        # Extract metadata
-        title_info = root.find('.//fb:title-info', ns)
-        if title_info is not None:
-            title = title_info.find('fb:book-title', ns)
-            if title is not None and title.text:
-                doc.metadata['title'] = title.text
-
-            authors = title_info.findall('fb:author', ns)
-            author_names = []
-            for author in authors:
-                first_name = author.find('fb:first-name', ns)
-                last_name = author.find('fb:last-name', ns)
-                if first_name is not None or last_name is not None:
-                    name_parts = []
-                    if first_name is not None and first_name.text:
-                        name_parts.append(first_name.text)
-                    if last_name is not None and last_name.text:
-                        name_parts.append(last_name.text)
-                    author_names.append(' '.join(name_parts))
-            if author_names:
-                doc.metadata['author'] = ', '.join(author_names)
-
-            lang = title_info.find('fb:lang', ns)
-            if lang is not None and lang.text:
-                doc.metadata['language'] = lang.text
-
-        # Extract body content
-        bodies = root.findall('.//fb:body', ns)
-        for body in bodies:
-            self._parse_fb2_section(body, doc, ns)
+        title_info_tag = f"{{{ns['fb']}}}title-info"
+        body_tag = f"{{{ns['fb']}}}body"
+        section_tag = f"{{{ns['fb']}}}section"
+
+        rng = ReadRange.from_config(config)
+        sections = 0
+
+        for _, element in etree.iterparse(str(path), events=('end',)):
+            if element.tag == title_info_tag:
+                self._read_fb2_metadata(element, doc, ns)
+                continue
+
+            parent = element.getparent()
+            if parent is None or parent.tag != body_tag:
+                continue
+
+            # Titles and epigraphs between sections belong to the section before
+            if element.tag == section_tag:
+                unit = sections
+                sections += 1
+            else:
+                unit = max(sections - 1, 0)
+            if rng is None or rng.includes(unit):
+                self._parse_fb2_section((element,), doc, ns)
+
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+            if rng and (rng.past(sections) or rng.full(doc.content)):
+                break
 
         return doc
 
+    def _read_fb2_metadata(self, title_info, doc: Document, ns: Dict[str, str]):
+        """Extract metadata from the title-info element."""
+        title = title_info.find('fb:book-title', ns)
+        if title is not None and title.text:
+            doc.metadata['title'] = title.text
+
+        authors = title_info.findall('fb:author', ns)
+        author_names = []
+        for author in authors:
+            first_name = author.find('fb:first-name', ns)
+            last_name = author.find('fb:last-name', ns)
+            if first_name is not None or last_name is not None:
+                name_parts = []
+                if first_name is not None and first_name.text:
+                    name_parts.append(first_name.text)
+                if last_name is not None and last_name.text:
+                    name_parts.append(last_name.text)
+                author_names.append(' '.join(name_parts))
+        if author_names:
+            doc.metadata['author'] = ', '.join(author_names)
+
+        lang = title_info.find('fb:lang', ns)
+        if lang is not None and lang.text:
+            doc.metadata['language'] = lang.text
+
     def _parse_fb2_section(self, element, doc: Document, ns: Dict[str, str], level: int = 1):
         """Recursively parse FB2 sections."""
         for child in element:
@@ -126,47 +161,46 @@ class FB2Converter(BaseConverter):
                 f.write(f"By: {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] in ['text', 'paragraph']:
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('\n' + block['data'].upper() + '\n')
-                    f.write('-' * len(block['data']) + '\n\n')
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('\n' + block.data.upper() + '\n')
+                    f.write('-' * len(block.data) + '\n\n')
         return True
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML."""
-        html_parts = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get('title'):
-            html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
-        else:
-            html_parts.append('<title>Document</title>')
+        with open(path, 'w', encoding='utf-8') as f:
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                '<!DOCTYPE html>',
+                '<html>',
+                '<head>',
+                '<meta charset="utf-8">',
+            ])
 
-        html_parts.append('</head>')
-        html_parts.append('<body>')
+            if doc.metadata.get('title'):
+                html_parts.append(f"<title>{self._escape_html(doc.metadata['title'])}</title>")
+            else:
+                html_parts.append('<title>Document</title>')
 
-        if doc.metadata.get('title'):
-            html_parts.append(f"<h1>{self._escape_html(doc.metadata['title'])}</h1>")
-        if doc.metadata.get('author'):
-            html_parts.append(f"<p><em>By {self._escape_html(doc.metadata['author'])}</em></p>")
+            html_parts.append('</head>')
+            html_parts.append('<body>')
 
-        for block in doc.content:
-            if block['type'] == 'paragraph':
-                html_parts.append(f"<p>{self._escape_html(block['data'])}</p>")
-            elif block['type'] == 'heading':
-                level = block['level']
-                html_parts.append(f"<h{level}>{self._escape_html(block['data'])}</h{level}>")
+            if doc.metadata.get('title'):
+                html_parts.append(f"<h1>{self._escape_html(doc.metadata['title'])}</h1>")
+            if doc.metadata.get('author'):
+                html_parts.append(f"<p><em>By {self._escape_html(doc.metadata['author'])}</em></p>")
 
-        html_parts.append('</body>')
-        html_parts.append('</html>')
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    html_parts.append(f"<p>{self._escape_html(block.data)}</p>")
+                elif isinstance(block, Heading):
+                    level = block.level
+                    html_parts.append(f"<h{level}>{self._escape_html(block.data)}</h{level}>")
 
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(html_parts))
+            html_parts.append('</body>')
+            html_parts.append('</html>')
 
         return True
 
@@ -179,10 +213,10 @@ class FB2Converter(BaseConverter):
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block['type'] == 'paragraph':
-                    f.write(block['data'] + '\n\n')
-                elif block['type'] == 'heading':
-                    f.write('#' * (block['level'] + 1) + ' ' + block['data'] + '\n\n')
+                if isinstance(block, Paragraph):
+                    f.write(block.data + '\n\n')
+                elif isinstance(block, Heading):
+                    f.write('#' * (block.level + 1) + ' ' + block.data + '\n\n')
         return True
 
     def _escape_html(self, text: str) -> str:
@@ -198,6 +232,8 @@ class FB2Converter(BaseConverter):
 class ToFB2Converter(BaseConverter):
     """Convert various formats to FB2."""
 
+    buffered_formats = ('fb2',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md']
@@ -222,73 +258,28 @@ class ToFB2Converter(BaseConverter):
         else:
             return False
         self._apply_metadata_overrides(doc, source_path, config)
+        self._apply_read_range(doc, source_path, config)
 
-        return self._create_fb2(doc, target_path, config, target_path.stem)
+        return self._create_fb2(self._buffer_for(doc, 'fb2'), target_path, config, target_path.stem)
 
     def _read_txt(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read plain text into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-            for para in content.split('\n\n'):
-                if para.strip():
-                    doc.add_paragraph(para.strip())
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_txt(path, encoding)
 
     def _read_html(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read HTML into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
-
-        with open(path, 'r', encoding=encoding) as f:
-            content = f.read()
-
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(content, 'html.parser')
-
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text().strip():
-            doc.metadata['title'] = title_tag.get_text().strip()
-        else:
-            h1_tag = soup.find('h1')
-            if h1_tag and h1_tag.get_text().strip():
-                doc.metadata['title'] = h1_tag.get_text().strip()
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text().strip(), level)
-            elif element.name == 'p':
-                text = element.get_text().strip()
-                if text:
-                    doc.add_paragraph(text)
-
-        return doc
+        encoding = self._source_encoding(path, config)
+        return read_html(path.read_bytes(), encoding=encoding)
 
     def _read_markdown(self, path: Path, config: Dict[str, Any]) -> Document:
         """Read Markdown into Document."""
-        doc = Document()
-        encoding = config.get('documents', {}).get('encoding', 'utf-8')
+        encoding = self._source_encoding(path, config)
 
         with open(path, 'r', encoding=encoding) as f:
             content = f.read()
 
-        import markdown
-        from bs4 import BeautifulSoup
-        html_content = markdown.markdown(content)
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        for element in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-            if element.name.startswith('h'):
-                level = int(element.name[1])
-                doc.add_heading(element.get_text(), level)
-            elif element.name == 'p':
-                doc.add_paragraph(element.get_text())
-
-        return doc
+        return read_markdown(content)
 
     def _create_fb2(self, doc: Document, path: Path, config: Dict[str, Any], default_title: str) -> bool:
         """Create FB2 from Document."""
@@ -322,15 +313,15 @@ class ToFB2Converter(BaseConverter):
         # Add content
         current_section = body
         for block in doc.content:
-            if block['type'] == 'heading':
+            if isinstance(block, Heading):
                 # Create new section for each heading
                 current_section = etree.SubElement(body, "{%s}section" % NS)
                 title = etree.SubElement(current_section, "{%s}title" % NS)
                 p = etree.SubElement(title, "{%s}p" % NS)
-                p.text = block['data']
-            elif block['type'] == 'paragraph':
+                p.text = block.data
+            elif isinstance(block, Paragraph):
                 p = etree.SubElement(current_section, "{%s}p" % NS)
-                p.text = block['data']
+                p.text = block.data
 
         # Write to file
         tree = etree.ElementTree(root)
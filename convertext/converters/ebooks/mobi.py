@@ -8,9 +8,13 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from convertext.converters.base import BaseConverter, Document
+from convertext.converters.blocks import Heading, Paragraph, Run, Text
 from convertext.converters.ebooks.azw3 import (
     _prepare_cover_records, _build_ncx_indx,
 )
+from convertext.converters.html_reader import read_html
+from convertext.converters.markdown_reader import read_markdown
+from convertext.converters.txt_reader import read_txt
 
 _PALM_EPOCH = 2082844800  # seconds from 1904-01-01 to Unix epoch (1970-01-01)
 
@@ -33,6 +37,10 @@ def _build_fcis(text_length: int) -> bytes:
 class ToMobiConverter(BaseConverter):
     """Convert documents to MOBI v6 format for Kindle."""
 
+    buffered_formats = ('mobi',)
+    ranged_formats = ('epub',)
+    image_formats = ('mobi',)
+
     @property
     def input_formats(self) -> List[str]:
         return ['txt', 'html', 'md', 'epub']
@@ -45,77 +53,40 @@ class ToMobiConverter(BaseConverter):
         return source in self.input_formats and target in self.output_formats
 
     def convert(self, source_path: Path, target_path: Path, config: Dict[str, Any]) -> bool:
-        doc = self._read_source(source_path, config)
+        doc = self._read_source(source_path, self._hinted(config, 'mobi'))
         self._apply_metadata_overrides(doc, source_path, config)
-        return _write_mobi(doc, target_path)
+        self._apply_read_range(doc, source_path, config)
+        return _write_mobi(self._buffer_for(doc, 'mobi'), target_path)
 
     def _read_source(self, path: Path, config: Dict[str, Any]) -> Document:
         fmt = path.suffix.lstrip('.').lower()
-        enc = config.get('documents', {}).get('encoding', 'utf-8')
         if fmt == 'txt':
-            return _read_txt(path, enc)
+            return _read_txt(path, self._source_encoding(path, config))
         elif fmt in ('html', 'htm'):
-            return _read_html(path, enc)
+            return _read_html(path, self._source_encoding(path, config))
         elif fmt in ('md', 'markdown'):
-            return _read_markdown(path, enc)
+            return _read_markdown(path, self._source_encoding(path, config))
         elif fmt == 'epub':
             from convertext.converters.ebooks.epub import EpubConverter
-            return EpubConverter()._read_epub(path, config)
+            reader = EpubConverter()
+            return reader._read_cached(reader._read_epub, path, config)
         raise ValueError(f"Unsupported source format: {fmt}")
 
 
 # ── Document readers ──────────────────────────────────────────────────────────
 
 def _read_txt(path: Path, encoding: str) -> Document:
-    doc = Document()
-    with open(path, 'r', encoding=encoding) as f:
-        content = f.read()
-    lines = content.split('\n')
-    i = 0
-    if len(lines) >= 2 and lines[1].strip() and all(c == '=' for c in lines[1].strip()):
-        doc.metadata['title'] = lines[0].strip()
-        i = 2
-        if i < len(lines) and lines[i].startswith('By:'):
-            doc.metadata['author'] = lines[i][3:].strip()
-            i += 1
-        while i < len(lines) and not lines[i].strip():
-            i += 1
-    for para in '\n'.join(lines[i:]).split('\n\n'):
-        if para.strip():
-            doc.add_paragraph(para.strip())
-    return doc
+    return read_txt(path, encoding, header=True)
 
 
 def _read_html(path: Path, encoding: str) -> Document:
-    from bs4 import BeautifulSoup
-    doc = Document()
-    with open(path, 'r', encoding=encoding) as f:
-        content = f.read()
-    soup = BeautifulSoup(content, 'html.parser')
-    t = soup.find('title')
-    if t and t.get_text().strip():
-        doc.metadata['title'] = t.get_text().strip()
-    for el in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-        if el.name.startswith('h'):
-            doc.add_heading(el.get_text().strip(), int(el.name[1]))
-        elif el.name == 'p' and el.get_text().strip():
-            doc.add_paragraph(el.get_text().strip())
-    return doc
+    return read_html(path.read_bytes(), encoding=encoding)
 
 
 def _read_markdown(path: Path, encoding: str) -> Document:
-    import markdown
-    from bs4 import BeautifulSoup
-    doc = Document()
     with open(path, 'r', encoding=encoding) as f:
         content = f.read()
-    soup = BeautifulSoup(markdown.markdown(content), 'html.parser')
-    for el in soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-        if el.name.startswith('h'):
-            doc.add_heading(el.get_text().strip(), int(el.name[1]))
-        elif el.name == 'p' and el.get_text().strip():
-            doc.add_paragraph(el.get_text().strip())
-    return doc
+    return read_markdown(content)
 
 
 # ── MOBI v6 binary building ───────────────────────────────────────────────────
@@ -125,26 +96,26 @@ def _doc_to_html(doc: Document) -> tuple:
     parts = ['<html><head><meta charset="utf-8"/></head><body>']
     toc_entries = []
     first_h1 = True
-    for block in doc.content:
-        btype = block.get('type')
-        if btype == 'heading':
-            level = block.get('level', 1)
-            text = html.escape(block.get('data', ''))
-            if level == 1:
-                if not first_h1:
-                    parts.append('<mbp:pagebreak/>')
-                offset = len('\n'.join(parts).encode('utf-8')) + 1  # +1 for upcoming \n
-                toc_entries.append({'label': block.get('data', ''), 'offset': offset})
-                first_h1 = False
-            parts.append(f'<h{level}>{text}</h{level}>')
-        elif btype in ('paragraph', 'text'):
-            text = html.escape(block.get('data', ''))
-            if text:
-                parts.append(f'<p>{text}</p>')
-        elif btype == 'run':
-            text = html.escape(block.get('text', ''))
-            if text:
-                parts.append(f'<p>{text}</p>')
+    for section in doc.sections:
+        if section.level == 1:
+            if not first_h1:
+                parts.append('<mbp:pagebreak/>')
+            offset = len('\n'.join(parts).encode('utf-8')) + 1  # +1 for upcoming \n
+            toc_entries.append({'label': section.title, 'offset': offset})
+            first_h1 = False
+        for block in doc.content[section.start:section.end]:
+            if isinstance(block, Heading):
+                level = block.level
+                text = html.escape(block.data)
+                parts.append(f'<h{level}>{text}</h{level}>')
+            elif isinstance(block, (Paragraph, Text)):
+                text = html.escape(block.data)
+                if text:
+                    parts.append(f'<p>{text}</p>')
+            elif isinstance(block, Run):
+                text = html.escape(block.text)
+                if text:
+                    parts.append(f'<p>{text}</p>')
     parts.append('</body></html>')
     html_str = '\n'.join(parts)
     html_len = len(html_str.encode('utf-8'))
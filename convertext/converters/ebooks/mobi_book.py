@@ -0,0 +1,495 @@
+"""Lazy, random-access view of a MOBI/AZW3 book.
+
+A KF8 (AZW3) text stream is not a run of XHTML documents. Each part (one
+XHTML file of the source book) is stored as a skeleton, the document with
+its body content cut out, followed by fragments to insert back into it.
+The skeleton (SKEL) index gives each skeleton's position and fragment
+count, the fragment (FRAG) index each fragment's insert position and
+length, the FDST table the flows (XHTML first, then CSS and SVG) and the
+NCX index the table of contents as text positions.
+
+``MobiBook`` reads record 0, the EXTH metadata and these indexes when
+opened. A part is rebuilt from the text records that hold it, and only
+those are decompressed; recently used parts are kept parsed in a small LRU
+cache. Books without KF8 indexes (MOBI 6) have no parts; their text records
+are read in order with ``text_records``.
+
+Example:
+    >>> with MobiBook(path) as book:
+    ...     book.metadata['title'], len(book)
+    ...     [entry['title'] for entry in book.toc]
+    ...     blocks = book.chapter(3)
+"""
+
+import struct
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from convertext.converters.blocks import Block, Heading, Paragraph
+from convertext.converters.ebooks.palmdoc import iter_text_records, record_text
+from convertext.converters.ebooks.pdb import PdbReader
+from convertext.converters.html_reader import read_html
+
+#: Index field value for "no such record"
+NULL_INDEX = 0xFFFFFFFF
+#: Parsed parts kept per book
+DEFAULT_CACHE_SIZE = 8
+
+# Compression, unused, text length, text record count, text record size
+_PALMDOC = struct.Struct('>HHIHH')
+# EXTH record types read into metadata
+_EXTH_METADATA = {100: 'author', 503: 'title'}
+# EXTH record holding the index of a joint file's KF8 record 0
+_EXTH_KF8_BOUNDARY = 121
+_CODECS = {65001: 'utf-8', 1252: 'cp1252'}
+
+
+class Fragment(NamedTuple):
+    """FRAG index entry: where a fragment goes back into its skeleton."""
+    insert: int
+    length: int
+
+
+class Part(NamedTuple):
+    """One XHTML file of a KF8 book.
+
+    start and length locate the skeleton in the text; its fragments follow
+    it, up to end.
+    """
+    start: int
+    length: int
+    end: int
+    fragments: Tuple[Fragment, ...]
+
+
+class MobiBook:
+    """A MOBI/AZW3 book whose parts load on demand.
+
+    Args:
+        path: MOBI, AZW or AZW3 file
+        cache_size: Parsed parts to keep; 0 disables the cache
+        workers: Processes decompressing text records when many are read
+            at once (see ``palmdoc.iter_text_records``); 1 decodes in-process
+        indexes: Read the KF8 skeleton, fragment and NCX indexes; without
+            them ``parts`` stays empty and only the text records are read
+
+    Raises:
+        ValueError, struct.error: If the file or its indexes are broken
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        workers: Optional[int] = 1,
+        indexes: bool = True,
+    ):
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.workers = workers
+        self.indexes = indexes
+        self._pdb = PdbReader(self.path)
+        self._lock = threading.Lock()
+        self._chapters: 'OrderedDict[int, List[Block]]' = OrderedDict()
+        self._record_starts: List[int] = [0]
+        self._uniform: Optional[bool] = None
+        try:
+            self._read_header()
+        except Exception:
+            self._pdb.close()
+            raise
+
+    def _read_header(self):
+        self._base = 0
+        self._parse_record0(self._pdb.record(0))
+        boundary = self._exth.get(_EXTH_KF8_BOUNDARY)
+        if boundary is not None and not self.is_kf8:
+            # Joint MOBI 6 + KF8 file: the KF8 book starts after a BOUNDARY record
+            index = int.from_bytes(boundary, 'big')
+            if 0 < index < len(self._pdb) and self._pdb.record(index - 1)[:8] == b'BOUNDARY':
+                self._base = index
+                self._parse_record0(self._pdb.record(index))
+
+        #: Parts of a KF8 book, in order; empty for MOBI 6
+        self.parts: List[Part] = []
+        #: (start, end) of each flow; flow 0 is the XHTML text
+        self.flows: List[Tuple[int, int]] = [(0, self.text_length)]
+        self._ncx: List[Dict[str, Any]] = []
+        self._toc: Optional[List[Dict[str, Any]]] = None
+        if not (self.is_kf8 and self.indexes):
+            return
+
+        fragments = [
+            (int(key), tags[6][1])
+            for key, tags in read_index(self._pdb, self._base + self._indexes['frag'])[0]
+        ]
+        first = 0
+        for _, tags in read_index(self._pdb, self._base + self._indexes['skel'])[0]:
+            count = tags[1][0]
+            start, length = tags[6][:2]
+            frags = tuple(Fragment(*f) for f in fragments[first:first + count])
+            first += count
+            self.parts.append(Part(start, length, start + length + sum(f.length for f in frags), frags))
+
+        if self._indexes['fdst'] != NULL_INDEX:
+            fdst = self._pdb.record(self._base + self._indexes['fdst'])
+            if fdst[:4] == b'FDST':
+                offset, count = struct.unpack_from('>II', fdst, 4)
+                self.flows = list(struct.iter_unpack('>II', fdst[offset:offset + 8 * count])) or self.flows
+
+        if self._indexes['ncx'] != NULL_INDEX:
+            entries, cncx = read_index(self._pdb, self._base + self._indexes['ncx'])
+            for _, tags in entries:
+                self._ncx.append({
+                    'title': cncx.get(tags[3][0], '') if 3 in tags else '',
+                    'level': tags[4][0] + 1 if 4 in tags else 1,
+                    'offset': tags[1][0] if 1 in tags else None,
+                    'fragment': tags[6][0] if 6 in tags else None,
+                })
+
+    def _parse_record0(self, rec0: memoryview):
+        (self.compression, _, self.text_length, self.text_record_count,
+         self.record_size) = _PALMDOC.unpack_from(rec0)
+        header_len, _, codepage, _, version = struct.unpack_from('>IIIII', rec0, 20)
+        self.encoding = _CODECS.get(codepage, 'cp1252')
+        self.version = version
+
+        self.extra_flags = 0
+        if header_len >= 0xE4 and len(rec0) >= 0xF4:
+            self.extra_flags = struct.unpack_from('>I', rec0, 0xF0)[0]
+
+        self._indexes = dict.fromkeys(('fdst', 'ncx', 'frag', 'skel'), NULL_INDEX)
+        if header_len >= 0xF0 and len(rec0) >= 0x100:
+            self._indexes['fdst'] = struct.unpack_from('>I', rec0, 0xC0)[0]
+            self._indexes['ncx'], self._indexes['frag'], self._indexes['skel'] = \
+                struct.unpack_from('>III', rec0, 0xF4)
+        if version < 8:
+            self._indexes.update(fdst=NULL_INDEX, frag=NULL_INDEX, skel=NULL_INDEX)
+
+        self._exth: Dict[int, bytes] = {}
+        exth_flags = struct.unpack_from('>I', rec0, 0x80)[0] if len(rec0) >= 0x84 else 0
+        pos = 16 + header_len
+        if exth_flags & 0x40 and rec0[pos:pos + 4] == b'EXTH' and pos + 12 <= len(rec0):
+            count = struct.unpack_from('>I', rec0, pos + 8)[0]
+            pos += 12
+            for _ in range(count):
+                if pos + 8 > len(rec0):
+                    break
+                rec_type, rec_len = struct.unpack_from('>II', rec0, pos)
+                self._exth[rec_type] = bytes(rec0[pos + 8:pos + rec_len])
+                pos += max(rec_len, 8)
+
+        #: Title and author, from EXTH or the full name field
+        self.metadata: Dict[str, str] = {}
+        for rec_type, key in _EXTH_METADATA.items():
+            if rec_type in self._exth:
+                self.metadata[key] = self._exth[rec_type].decode(self.encoding, errors='ignore')
+        if 'title' not in self.metadata:
+            name_offset, name_len = struct.unpack_from('>II', rec0, 0x54)
+            name = bytes(rec0[name_offset:name_offset + name_len]).decode(self.encoding, errors='ignore')
+            if name:
+                self.metadata['title'] = name
+
+    @property
+    def is_kf8(self) -> bool:
+        """Whether the book has KF8 skeleton and fragment indexes."""
+        return self._indexes['skel'] != NULL_INDEX and self._indexes['frag'] != NULL_INDEX
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def __enter__(self) -> 'MobiBook':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the file. Cached parts stay readable."""
+        self._pdb.close()
+
+    def text_records(self, indices: Optional[range] = None) -> Iterator[bytes]:
+        """Yield decompressed text records (0-based, all by default) in order."""
+        if indices is None:
+            indices = range(self.text_record_count)
+        stop = min(indices.stop, self.text_record_count)
+        return iter_text_records(
+            self._pdb, range(self._base + 1 + indices.start, self._base + 1 + stop),
+            self.extra_flags, compressed=self.compression == 2, workers=self.workers,
+        )
+
+    def part(self, index: int) -> bytes:
+        """The rebuilt XHTML of part index."""
+        return next(self._parts(range(index, index + 1)))[1]
+
+    def chapter(self, index: int) -> List[Block]:
+        """Blocks of part index (negative counts from the end).
+
+        NCX entries pointing into the part become headings: a paragraph
+        with the entry's title is promoted, and a part without any heading
+        gets one.
+
+        Raises:
+            IndexError: If there is no such part
+        """
+        if index < 0:
+            index += len(self.parts)
+        if not 0 <= index < len(self.parts):
+            raise IndexError(f'part {index} out of range ({len(self.parts)} parts)')
+        return next(self.chapters(index, index + 1))
+
+    def chapters(self, start: int = 0, stop: Optional[int] = None) -> Iterator[List[Block]]:
+        """Blocks of the parts from start to stop, one list each.
+
+        The text records they span are decompressed once, as one run.
+        """
+        indices = range(*slice(start, stop).indices(len(self.parts)))
+        with self._lock:
+            cached = {index: self._chapters[index] for index in indices if index in self._chapters}
+            for index in cached:
+                self._chapters.move_to_end(index)
+        missing = [index for index in indices if index not in cached]
+        parts = self._parts(range(missing[0], missing[-1] + 1) if missing else range(0))
+        with closing(parts):
+            for index in indices:
+                if index in cached:
+                    yield cached[index]
+                    continue
+                for built, html in parts:
+                    if built == index:
+                        break
+                else:
+                    raise ValueError(f'part {index} is missing: text ends before its fragments')
+                yield self._parse(index, html)
+
+    @property
+    def toc(self) -> List[Dict[str, Any]]:
+        """Table of contents entries from the NCX.
+
+        Each entry has ``title``, ``level`` (1 for top-level entries) and
+        ``chapter``, the index of the part it points into or None.
+        """
+        if self._toc is not None:
+            return self._toc
+        toc = []
+        for entry in self._ncx:
+            chapter = None
+            if entry['fragment'] is not None:
+                chapter = self._part_of_fragment(entry['fragment'])
+            elif entry['offset'] is not None:
+                chapter = next((i for i, part in enumerate(self.parts)
+                                if part.start <= entry['offset'] < part.end), None)
+            toc.append({'title': entry['title'], 'level': entry['level'], 'chapter': chapter})
+        self._toc = toc
+        return toc
+
+    def _part_of_fragment(self, fragment: int) -> Optional[int]:
+        for i, part in enumerate(self.parts):
+            if fragment < len(part.fragments):
+                return i
+            fragment -= len(part.fragments)
+        return None
+
+    def _parse(self, index: int, html: bytes) -> List[Block]:
+        blocks = read_html(html, encoding=self.encoding, title=False).content
+        _apply_toc(blocks, [e for e in self.toc if e['chapter'] == index])
+        if self.cache_size > 0:
+            with self._lock:
+                self._chapters[index] = blocks
+                while len(self._chapters) > self.cache_size:
+                    self._chapters.popitem(last=False)
+        return blocks
+
+    def _parts(self, indices: range) -> Iterator[Tuple[int, bytes]]:
+        """Yield (index, XHTML) of parts, decompressing their text once."""
+        if not indices:
+            return
+        first = self.parts[indices.start]
+        record, buffer_start = self._record_at(first.start)
+        buffer = bytearray()
+        texts = self.text_records(range(record, self.text_record_count))
+        with closing(texts):
+            for index in indices:
+                part = self.parts[index]
+                if part.start < buffer_start:
+                    raise ValueError(f'part {index} starts before part {indices.start}')
+                while buffer_start + len(buffer) < part.end:
+                    text = next(texts, None)
+                    if text is None:
+                        break
+                    buffer += text
+                # Text before the part is no longer needed
+                cut = min(part.start - buffer_start, len(buffer))
+                del buffer[:cut]
+                buffer_start += cut
+                yield index, _rebuild(part, buffer, buffer_start)
+
+    def _record_at(self, offset: int) -> Tuple[int, int]:
+        """Text record holding offset, and where that record starts."""
+        size = self.record_size
+        if self._uniform is None:
+            self._uniform = self._records_uniform()
+        if self._uniform:
+            record = min(offset // size, max(self.text_record_count - 1, 0))
+            return record, record * size
+
+        # Records end early (a writer kept characters whole): find the
+        # record by the lengths of those before it, decoded once per book
+        starts = self._record_starts
+        while starts[-1] <= offset and len(starts) <= self.text_record_count:
+            text = record_text(self._pdb, self._base + len(starts), self.extra_flags,
+                               self.compression == 2)
+            starts.append(starts[-1] + len(text))
+        record = min(bisect_right(starts, offset) - 1, max(self.text_record_count - 1, 0))
+        return record, starts[record]
+
+    def _records_uniform(self) -> bool:
+        """Whether every text record but the last holds record_size bytes.
+
+        No record holds more, so this is the case exactly when the text
+        length adds up, which needs only the last record decoded.
+        """
+        count, size = self.text_record_count, self.record_size
+        if not count or not size:
+            return False
+        last = record_text(self._pdb, self._base + count, self.extra_flags, self.compression == 2)
+        return (count - 1) * size + len(last) == self.text_length
+
+
+def _rebuild(part: Part, text: bytearray, text_start: int) -> bytes:
+    """Insert the fragments of part back into its skeleton.
+
+    text holds the book text from text_start on, at least up to part.end.
+    Insert positions are absolute; one outside the body (as written by
+    older versions of this converter) inserts at the end of the body.
+    """
+    pos = part.start - text_start
+    html = bytes(text[pos:pos + part.length])
+    pos += part.length
+    for fragment in part.fragments:
+        piece = bytes(text[pos:pos + fragment.length])
+        pos += fragment.length
+        at = fragment.insert - part.start
+        body_end = html.rfind(b'</body')
+        if not 0 <= at <= len(html) or 0 <= body_end < at:
+            at = body_end if body_end >= 0 else len(html)
+        html = html[:at] + piece + html[at:]
+    return html
+
+
+def _apply_toc(blocks: List[Block], entries: List[Dict[str, Any]]):
+    """Turn the NCX titles of a part into headings (see MobiBook.chapter)."""
+    for entry in entries:
+        title = ' '.join(entry['title'].split())
+        level = min(entry['level'], 6)
+        if not title or any(isinstance(b, Heading) and ' '.join(b.data.split()) == title
+                            for b in blocks):
+            continue
+        for i, block in enumerate(blocks):
+            if isinstance(block, Paragraph) and ' '.join(block.data.split()) == title:
+                blocks[i] = Heading(block.data, level)
+                break
+        else:
+            if not any(isinstance(b, Heading) for b in blocks):
+                blocks.insert(0, Heading(title, level))
+
+
+def read_index(pdb: PdbReader, first: int) -> Tuple[List[Tuple[str, Dict[int, List[int]]]], Dict[int, str]]:
+    """Entries and CNCX strings of the INDX index whose header is record first.
+
+    Returns (entries, cncx): entries are (key, {tag: values}) in order,
+    cncx maps string offsets (plus 0x10000 per CNCX record) to strings.
+
+    Raises:
+        ValueError: If record first is not an INDX header
+    """
+    header = pdb.record(first)
+    if header[:4] != b'INDX':
+        raise ValueError(f'record {first} is not an INDX header')
+    header_len = struct.unpack_from('>I', header, 4)[0]
+    data_records = struct.unpack_from('>I', header, 24)[0]
+    cncx_records = struct.unpack_from('>I', header, 52)[0]
+    encoding = _CODECS.get(struct.unpack_from('>I', header, 28)[0], 'utf-8')
+
+    tags: List[Tuple[int, int, int, int]] = []
+    control_bytes = 0
+    if header[header_len:header_len + 4] == b'TAGX':
+        tagx_len, control_bytes = struct.unpack_from('>II', header, header_len + 4)
+        tags = list(struct.iter_unpack('4B', header[header_len + 12:header_len + tagx_len]))
+
+    entries = []
+    for index in range(first + 1, first + 1 + data_records):
+        data = pdb.record(index)
+        idxt, count = struct.unpack_from('>II', data, 20)
+        offsets = struct.unpack_from(f'>{count}H', data, idxt + 4) + (idxt,)
+        for start, end in zip(offsets, offsets[1:]):
+            key_len = data[start]
+            key = bytes(data[start + 1:start + 1 + key_len]).decode(encoding, errors='ignore')
+            entries.append((key, _tag_values(data, start + 1 + key_len, end, tags, control_bytes)))
+
+    cncx: Dict[int, str] = {}
+    for n in range(cncx_records):
+        record = pdb.record(first + 1 + data_records + n)
+        pos = 0
+        while pos < len(record) and record[pos]:   # zero bytes pad the record
+            length, size = _decint(record, pos)
+            text = bytes(record[pos + size:pos + size + length])
+            cncx[n * 0x10000 + pos] = text.decode(encoding, errors='ignore')
+            pos += size + length
+    return entries, cncx
+
+
+def _tag_values(data: memoryview, pos: int, end: int, tags, control_bytes: int) -> Dict[int, List[int]]:
+    """Decode the tag values of one index entry (after its key)."""
+    controls = data[pos:pos + control_bytes]
+    pos += control_bytes
+    found = []
+    control = 0
+    for tag, per_entry, mask, end_flag in tags:
+        if end_flag:
+            control += 1
+            continue
+        value = controls[control] & mask if control < len(controls) else 0
+        if not value:
+            continue
+        if value == mask and bin(mask).count('1') > 1:
+            # All mask bits set: a byte length of the values follows
+            byte_len, size = _decint(data, pos)
+            pos += size
+            found.append((tag, None, byte_len, per_entry))
+        else:
+            shift = (mask & -mask).bit_length() - 1
+            found.append((tag, value >> shift, None, per_entry))
+
+    values: Dict[int, List[int]] = {}
+    for tag, count, byte_len, per_entry in found:
+        out = values.setdefault(tag, [])
+        if count is not None:
+            for _ in range(count * per_entry):
+                value, size = _decint(data, pos)
+                pos += size
+                out.append(value)
+        else:
+            stop = pos + byte_len
+            while pos < min(stop, end):
+                value, size = _decint(data, pos)
+                pos += size
+                out.append(value)
+    return values
+
+
+def _decint(data: memoryview, pos: int) -> Tuple[int, int]:
+    """Forward variable-width integer at pos: (value, bytes used).
+
+    The last byte has bit 7 set (see azw3._encint).
+    """
+    value = 0
+    for size, b in enumerate(data[pos:pos + 5], 1):
+        value = (value << 7) | (b & 0x7F)
+        if b & 0x80:
+            return value, size
+    return value, len(data[pos:pos + 5])
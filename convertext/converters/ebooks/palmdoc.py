@@ -0,0 +1,157 @@
+"""PalmDOC decompression for MOBI/AZW3 text records.
+
+PalmDOC is LZ77 with a byte-oriented token stream. Each text record is
+compressed on its own (4 KB of text per record), so records decode
+independently. One regex splits a record into tokens, so runs of literal
+bytes are copied with one slice each; back-reference distances and
+lengths come from a precomputed table and are copied as bytearray slices.
+Only overlapping references (distance shorter than length), which repeat
+their last bytes, are built by repetition.
+
+Large books can be decoded in parallel (``workers`` above 1; by default
+records are decoded in-process): contiguous ranges of records go to a
+process pool whose workers map the file themselves, so only the decoded
+text crosses the process boundary. Results come back in record order, and
+a reader that stops early (a read range) cancels the ranges not started.
+
+Example:
+    >>> text = decompress(record)
+    >>> for text in iter_text_records(pdb, range(1, 200), extra_flags, workers=4):
+    ...     html_parts.append(text.decode('utf-8'))
+"""
+
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, List, Optional, Tuple, Union
+
+from convertext.converters.ebooks.pdb import PdbReader, strip_trailing_entries
+from convertext.converters.utils import process_pool_context
+
+# Text records before a pool is worth starting
+_MIN_PARALLEL_RECORDS = 64
+# Upper bound on records per pool task
+_MAX_RANGE_RECORDS = 64
+
+# One token per match: a run of bytes that stand for themselves (0x00,
+# 0x09-0x7F), a back-reference (0x80-0xBF plus one byte), a space pair
+# (0xC0-0xFF) or a count byte 1-8 with that many bytes copied as they are;
+# a count cut off by the end of data copies what is left
+_TOKENS = re.compile(
+    rb'([\x00\x09-\x7f]+)|([\x80-\xbf].)|([\xc0-\xff])|('
+    + rb'|'.join(rb'\x%02x.{%d}' % (n, n) for n in range(1, 9)) + rb'|[\x01-\x08].*)',
+    re.DOTALL,
+)
+
+
+def _reference(high: int, low: int) -> Tuple[int, int]:
+    """Distance and length of a back-reference; distance 0 copies nothing."""
+    dist = ((high << 8 | low) >> 3) & 0x7FF
+    return dist, (low & 7) + 3 if dist else 0
+
+
+# Back-reference bytes -> (distance, length)
+_REFERENCES = {bytes((high, low)): _reference(high, low)
+               for high in range(0x80, 0xC0) for low in range(256)}
+# Space pair byte -> a space followed by the byte XOR 0x80
+_SPACE_PAIRS = tuple(bytes((0x20, c ^ 0x80)) for c in range(256))
+
+# Per-process reader opened by the pool initializer
+_worker_source: Optional[PdbReader] = None
+
+
+def decompress(data: Union[bytes, memoryview]) -> bytes:
+    """Decompress one PalmDOC-compressed record.
+
+    Back-references that point before the start of the output are dropped,
+    as is a back-reference cut off by the end of data. A literal count cut
+    off by the end of data copies the bytes that remain.
+    """
+    out = bytearray()
+    references, space_pairs = _REFERENCES, _SPACE_PAIRS
+    for literals, reference, space_pair, copied in _TOKENS.findall(data):
+        if literals:
+            out += literals
+        elif reference:
+            dist, length = references[reference]
+            start = len(out) - dist
+            if start < 0:
+                continue
+            if dist >= length:
+                out += out[start:start + length]
+            else:
+                # Overlapping: the last dist bytes repeat
+                out += (out[start:] * (length // dist + 1))[:length]
+        elif space_pair:
+            out += space_pairs[space_pair[0]]
+        else:
+            out += copied[1:]
+    return bytes(out)
+
+
+def iter_text_records(
+    pdb: PdbReader,
+    indices: range,
+    extra_flags: int,
+    compressed: bool = True,
+    workers: Optional[int] = 1,
+) -> Iterator[bytes]:
+    """Yield the text of the records at indices, in order.
+
+    Args:
+        pdb: Open reader of the book
+        indices: Record indexes of the text records to read
+        extra_flags: Extra data flags of the MOBI header (trailing entries)
+        compressed: Whether records are PalmDOC-compressed; if not they are
+            only stripped of trailing entries
+        workers: Decoding processes; 1 (or None) decodes in-process.
+            Small books are always decoded in-process.
+    """
+    indices = range(indices.start, min(indices.stop, len(pdb)))
+    workers = max(1, workers or 1)
+    if not compressed or workers == 1 or len(indices) < _MIN_PARALLEL_RECORDS:
+        for index in indices:
+            yield record_text(pdb, index, extra_flags, compressed)
+        return
+
+    size = max(1, min(_MAX_RANGE_RECORDS, math.ceil(len(indices) / (workers * 4))))
+    ranges = [indices[start:start + size] for start in range(0, len(indices), size)]
+    done = 0
+    try:
+        pool = ProcessPoolExecutor(
+            max_workers=min(workers, len(ranges)),
+            mp_context=process_pool_context(),
+            initializer=_init_worker,
+            initargs=(str(pdb.path),),
+        )
+        try:
+            futures = [pool.submit(_worker_decompress, chunk.start, chunk.stop, extra_flags)
+                       for chunk in ranges]
+            for future in futures:
+                texts = future.result()
+                done += 1
+                yield from texts
+        finally:
+            # Stopped early: drop queued ranges and don't wait for running ones
+            pool.shutdown(wait=done == len(ranges), cancel_futures=True)
+    except BrokenProcessPool:
+        # A worker died (crash, out of memory); decode what is left here
+        for chunk in ranges[done:]:
+            for index in chunk:
+                yield record_text(pdb, index, extra_flags, compressed)
+
+
+def record_text(pdb: PdbReader, index: int, extra_flags: int, compressed: bool = True) -> bytes:
+    """Text of record index: trailing entries stripped, decompressed if compressed."""
+    record = strip_trailing_entries(pdb.record(index), extra_flags)
+    return decompress(record) if compressed else bytes(record)
+
+
+def _init_worker(path: str):
+    global _worker_source
+    _worker_source = PdbReader(path)
+
+
+def _worker_decompress(start: int, stop: int, extra_flags: int) -> List[bytes]:
+    return [record_text(_worker_source, index, extra_flags, True) for index in range(start, stop)]
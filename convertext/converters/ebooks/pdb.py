@@ -0,0 +1,135 @@
+"""Palm database (PDB) container reading on a memory map.
+
+MOBI, AZW and AZW3 books are PDB files: a 78-byte header, a table of
+record offsets, then the records back to back. ``PdbReader`` maps the
+file, parses the offset table in one pass, and hands out records as
+``memoryview`` slices of the map, so a record is only copied when its
+bytes are decompressed or decoded. Record 0 (the MOBI header and EXTH
+metadata), the text records and the image records are all read through
+the same reader.
+
+Example:
+    >>> with PdbReader(path) as pdb:
+    ...     header = pdb.record(0)
+    ...     text = strip_trailing_entries(pdb.record(1), extra_flags)
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator, List, Union
+
+# Database name, attributes, dates, type and creator; record count at 76
+_HEADER = struct.Struct('>32sHHIIIIII4s4sIIH')
+# Record data offset, attributes and unique id (ignored)
+_ENTRY = struct.Struct('>II')
+
+
+class PdbReader:
+    """Records of a PDB file as zero-copy views.
+
+    Args:
+        path: PDB file (MOBI, AZW, AZW3, ...)
+
+    Raises:
+        ValueError: If the file is too short for its header and record table
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._file.close()
+            raise ValueError(f'{self.path.name}: not a PDB file (empty)')
+        self._view = memoryview(self._map)
+        try:
+            self._read_table()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_table(self):
+        size = len(self._view)
+        if size < _HEADER.size:
+            raise ValueError(f'{self.path.name}: not a PDB file (truncated header)')
+        header = _HEADER.unpack_from(self._view)
+        #: Database name, type and creator (e.g. b'BOOK', b'MOBI')
+        self.name: bytes = header[0].rstrip(b'\x00')
+        self.type: bytes = header[9]
+        self.creator: bytes = header[10]
+        count = header[13]
+
+        table_end = _HEADER.size + count * _ENTRY.size
+        if table_end > size:
+            raise ValueError(f'{self.path.name}: not a PDB file (truncated record table)')
+        starts = [offset for offset, _ in _ENTRY.iter_unpack(self._view[_HEADER.size:table_end])]
+        # A record ends where the next begins; the last one at the end of file
+        self._bounds: List[int] = [min(offset, size) for offset in starts] + [size]
+
+    def __len__(self) -> int:
+        return len(self._bounds) - 1
+
+    def __enter__(self) -> 'PdbReader':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Unmap the file. Views still held keep the map alive until released."""
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            # Record views still reference the map; it is freed with them
+            pass
+        self._file.close()
+
+    def record(self, index: int) -> memoryview:
+        """Record index as a view into the map.
+
+        Raises:
+            IndexError: If there is no such record
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f'record {index} out of range ({len(self)} records)')
+        start, end = self._bounds[index], self._bounds[index + 1]
+        return self._view[start:max(start, end)]
+
+    def records(self, indices: Iterable[int]) -> Iterator[memoryview]:
+        """Views of the records at indices, stopping at the last record."""
+        for index in indices:
+            if index >= len(self):
+                return
+            yield self.record(index)
+
+
+def strip_trailing_entries(record: memoryview, extra_flags: int) -> memoryview:
+    """record without the trailing entries MOBI appends to text records.
+
+    extra_flags is the extra data flags field of the MOBI header. Each set
+    bit above bit 0 adds an entry whose size is a backward-encoded varint
+    at the very end; bit 0 adds multibyte overlap bytes, whose count is in
+    the low two bits of the last remaining byte. Entries are removed last
+    first, highest bit first. Returns a slice of the same buffer.
+    """
+    n = 0
+    for bit in range(15, 0, -1):
+        if extra_flags & (1 << bit):
+            size = shift = 0
+            # Varint read backwards: up to four bytes, the first has bit 7 set
+            for pos in range(1, 5):
+                if n + pos > len(record):
+                    break
+                b = record[-n - pos]
+                size |= (b & 0x7f) << shift
+                shift += 7
+                if b & 0x80:
+                    break
+            n += size
+    if extra_flags & 1 and n < len(record):
+        n += (record[-1 - n] & 3) + 1
+    return record[:len(record) - min(n, len(record))]
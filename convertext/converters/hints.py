@@ -0,0 +1,55 @@
+"""Read hints: what the target writer will use from a Document.
+
+A converter knows its writer; its reader does not. Before reading, the
+converter records in the config what the writer needs, and readers skip
+the work whose result would be ignored: zip members that are not
+inflated, formatting that is not collected. Without hints readers read
+everything, so a hint can only ever save work, never lose needed output.
+
+Hints travel in the config like the read range and are part of the parse
+cache key, so a text-only parse is never served to a writer that needs
+images.
+
+Example:
+    >>> config = ReadHints(images=False, styles=False).apply(config)
+    >>> hints = ReadHints.from_config(config)   # in the reader
+    >>> if hints.images:
+    ...     doc.images.add_zip_member('cover', path, member, 'jpg')
+"""
+
+from typing import Any, Dict
+
+#: Config key the hints are stored under
+CONFIG_KEY = '_read_hints'
+
+
+class ReadHints:
+    """What a reader has to produce.
+
+    Attributes:
+        images: The writer uses ``doc.images``
+        styles: The writer uses run formatting (paragraph spans)
+        content: The writer uses content blocks; False reads metadata only
+    """
+
+    __slots__ = ('images', 'styles', 'content')
+
+    def __init__(self, images: bool = True, styles: bool = True, content: bool = True):
+        self.images = images
+        self.styles = styles
+        self.content = content
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ReadHints':
+        """Hints stored in config; everything is needed if there are none."""
+        return cls(**config.get(CONFIG_KEY, {}))
+
+    def as_dict(self) -> Dict[str, bool]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def apply(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """A shallow copy of config carrying these hints."""
+        return {**config, CONFIG_KEY: self.as_dict()}
+
+    def __repr__(self) -> str:
+        return f'ReadHints({", ".join(f"{k}={v}" for k, v in self.as_dict().items())})'
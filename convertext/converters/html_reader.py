@@ -0,0 +1,141 @@
+"""Shared HTML -> Document reading on lxml.
+
+Readers of HTML, XHTML (EPUB spine items, KF8 text) and rendered Markdown
+parse with lxml's C HTML parser and walk the tree once in document order.
+A matched element (paragraph, heading and, with ``rich``, table or list)
+becomes one block and its subtree is not searched again, so nested
+paragraphs, such as ones inside list items, are not emitted twice.
+
+Example:
+    >>> doc = read_html(path.read_bytes(), encoding='utf-8', rich=True)
+    >>> for block in iter_blocks(parse_html('<h1>T</h1><p>x</p>')):
+    ...     print(block)
+"""
+
+from typing import Iterator, Optional, Union
+
+from lxml import etree
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import Block, Heading, ListBlock, Paragraph, Table
+from convertext.converters.charset import libxml2_encoding
+
+#: Elements read as paragraphs and headings
+BLOCK_TAGS = frozenset(('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+#: BLOCK_TAGS plus the structures rich readers keep
+RICH_TAGS = BLOCK_TAGS | {'table', 'ul', 'ol'}
+
+
+def parse_html(content: Union[str, bytes], encoding: str = 'utf-8') -> Optional[etree._Element]:
+    """Parse an HTML or XHTML document or fragment; None if it is empty.
+
+    Bytes are decoded with encoding; str is used as is.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+        encoding = 'utf-8'
+    if not content.strip():
+        return None
+    parser = etree.HTMLParser(encoding=libxml2_encoding(encoding), huge_tree=True)
+    return etree.fromstring(content, parser)
+
+
+def text_of(element: etree._Element) -> str:
+    """Stripped text of element and its descendants."""
+    return ''.join(element.itertext()).strip()
+
+
+def html_title(root: etree._Element) -> Optional[str]:
+    """Text of <title>, else of the first <h1>; None if both are empty."""
+    for tag in ('title', 'h1'):
+        element = next(root.iter(tag), None)
+        if element is not None:
+            text = text_of(element)
+            if text:
+                return text
+    return None
+
+
+def iter_blocks(root: Optional[etree._Element], rich: bool = False) -> Iterator[Block]:
+    """Yield the blocks under root in document order.
+
+    Paragraphs and headings without text are dropped. With rich, tables and
+    lists become Table and ListBlock blocks.
+    """
+    if root is None:
+        return
+    tags = RICH_TAGS if rich else BLOCK_TAGS
+    stack = [iter(root)]
+    while stack:
+        for element in stack[-1]:
+            tag = element.tag
+            if tag not in tags:
+                if len(element):
+                    stack.append(iter(element))
+                    break
+                continue
+            block = _block(element, tag)
+            if block is not None:
+                yield block
+        else:
+            stack.pop()
+
+
+def _block(element: etree._Element, tag: str) -> Optional[Block]:
+    if tag == 'p':
+        text = text_of(element)
+        return Paragraph(text) if text else None
+    if tag[0] == 'h':
+        text = text_of(element)
+        return Heading(text, int(tag[1])) if text else None
+    if tag == 'table':
+        return _table(element)
+    items = [text_of(li) for li in element.iter('li')]
+    return ListBlock(items, tag == 'ol') if items else None
+
+
+def _table(table: etree._Element) -> Optional[Table]:
+    headers = []
+    thead = next(table.iter('thead'), None)
+    if thead is not None:
+        header_row = next(thead.iter('tr'), None)
+        if header_row is not None:
+            headers = [text_of(cell) for cell in header_row.iter('th', 'td')]
+
+    body = next(table.iter('tbody'), table)
+    rows = []
+    for row in body.iter('tr'):
+        cells = [text_of(cell) for cell in row.iter('td', 'th')]
+        if cells:
+            rows.append(cells)
+    return Table(rows, headers or None) if rows else None
+
+
+def read_html(
+    content: Union[str, bytes],
+    doc: Optional[Document] = None,
+    encoding: str = 'utf-8',
+    rich: bool = False,
+    title: bool = True,
+) -> Document:
+    """Parse content and append its blocks to doc (a new Document by default).
+
+    Args:
+        content: HTML, XHTML or an HTML fragment
+        doc: Document to extend
+        encoding: Encoding of content if it is bytes
+        rich: Also read tables and lists
+        title: Set ``metadata['title']`` from <title> or the first <h1>,
+            unless doc already has a title
+    """
+    if doc is None:
+        doc = Document()
+    root = parse_html(content, encoding)
+    if root is None:
+        return doc
+    if title and not doc.metadata.get('title'):
+        found = html_title(root)
+        if found:
+            doc.metadata['title'] = found
+    doc.content.extend(iter_blocks(root, rich))
+    return doc
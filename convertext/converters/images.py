@@ -0,0 +1,215 @@
+"""Lazy image storage for Document.images.
+
+Images are held as references - a member of a zip archive or a slice of a
+spill file - and their bytes are read only when ``entry['data']`` is
+accessed. Nothing is cached after the read, so the bytes are released as
+soon as the caller drops them; the store only keeps one open handle per zip
+archive, so its central directory is read once. Images added as raw bytes
+stay in memory up to a limit and are spilled to an anonymous temp file
+beyond it.
+
+References hold their store weakly, so a Document's store - with its zip
+handles and spill file - is released as soon as the Document is dropped,
+without waiting for the cycle collector.
+
+Entries still look like the ``{'data': bytes, 'format': str}`` dicts writers
+expect, so ``doc.images[name]['data']`` keeps working.
+"""
+
+import tempfile
+import threading
+import weakref
+import zipfile
+from abc import abstractmethod
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+DEFAULT_MEMORY_LIMIT = 32 * 1024 * 1024
+
+
+class ImageRef(Mapping):
+    """A stored image: ``format`` is known up front, ``data`` loads on access.
+
+    Abstract: subclasses implement ``load``.
+    """
+
+    __slots__ = ('format',)
+
+    def __init__(self, format: str):
+        self.format = format
+
+    @abstractmethod
+    def load(self) -> bytes:
+        """Read the image bytes."""
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'data':
+            return self.load()
+        if key == 'format':
+            return self.format
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(('data', 'format'))
+
+    def __len__(self) -> int:
+        return 2
+
+
+class BytesRef(ImageRef):
+    """Image bytes held in memory."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: bytes, format: str):
+        super().__init__(format)
+        self.data = data
+
+    def load(self) -> bytes:
+        return self.data
+
+
+class ZipMemberRef(ImageRef):
+    """Image stored as a member of a zip archive (EPUB, DOCX, ODT, CBZ).
+
+    With a live store, the archive is read through the store's shared
+    handle; otherwise it is opened for each load.
+    """
+
+    __slots__ = ('path', 'member', '_store')
+
+    def __init__(self, path: Path, member: str, format: str, store: Optional['ImageStore'] = None):
+        super().__init__(format)
+        self.path = path
+        self.member = member
+        self._store = weakref.ref(store) if store is not None else None
+
+    def load(self) -> bytes:
+        store = self._store() if self._store is not None else None
+        if store is not None:
+            return store._archive(self.path).read(self.member)
+        with zipfile.ZipFile(self.path) as zf:
+            return zf.read(self.member)
+
+
+class _SpillRef(ImageRef):
+    """Image spilled to the owning store's temp file."""
+
+    __slots__ = ('_store', 'offset', 'size')
+
+    def __init__(self, store: 'ImageStore', offset: int, size: int, format: str):
+        super().__init__(format)
+        self._store = weakref.ref(store)
+        self.offset = offset
+        self.size = size
+
+    def load(self) -> bytes:
+        store = self._store()
+        if store is None:
+            raise ValueError("Image store has been released")
+        return store._read_spill(self.offset, self.size)
+
+
+class ImageStore(MutableMapping):
+    """Mapping of image name to ImageRef with a cap on in-memory bytes.
+
+    Assigning a ``{'data': ..., 'format': ...}`` dict stores the bytes like
+    ``add_bytes``; assigning an ImageRef stores the reference as-is.
+
+    Example:
+        >>> store = ImageStore()
+        >>> store.add_zip_member('cover', Path('book.epub'), 'OEBPS/cover.jpg', 'jpg')
+        >>> store['cover']['format']   # no bytes read yet
+        'jpg'
+    """
+
+    def __init__(self, memory_limit: int = DEFAULT_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.memory_used = 0
+        self._entries: Dict[str, ImageRef] = {}
+        self._spill = None
+        self._spill_size = 0
+        self._archives: Dict[Path, zipfile.ZipFile] = {}
+        self._lock = threading.Lock()
+
+    def add_bytes(self, name: str, data: bytes, format: str):
+        """Store image bytes, spilling to disk once over the memory limit."""
+        data = bytes(data)
+        self._discard(name)
+        if self.memory_used + len(data) <= self.memory_limit:
+            self.memory_used += len(data)
+            self._set(name, BytesRef(data, format))
+        else:
+            self._set(name, self._write_spill(data, format))
+
+    def add_zip_member(self, name: str, path: Union[str, Path], member: str, format: str):
+        """Reference a zip archive member; read on access."""
+        self._set(name, ZipMemberRef(Path(path), member, format, self))
+
+    def close(self):
+        """Release the spill file and zip archives. Spilled entries become unreadable."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+            for archive in self._archives.values():
+                archive.close()
+            self._archives.clear()
+
+    def _set(self, name: str, ref: ImageRef):
+        self._discard(name)
+        self._entries[name] = ref
+
+    def _discard(self, name: str):
+        old = self._entries.pop(name, None)
+        if isinstance(old, BytesRef):
+            self.memory_used -= len(old.data)
+
+    def _write_spill(self, data: bytes, format: str) -> ImageRef:
+        with self._lock:
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile(prefix='convertext-img-')
+            offset = self._spill_size
+            self._spill.seek(offset)
+            self._spill.write(data)
+            self._spill_size += len(data)
+        return _SpillRef(self, offset, len(data), format)
+
+    def _archive(self, path: Path) -> zipfile.ZipFile:
+        """The shared open handle of a zip archive; reads on it are thread-safe."""
+        with self._lock:
+            archive = self._archives.get(path)
+            if archive is None:
+                archive = self._archives[path] = zipfile.ZipFile(path)
+            return archive
+
+    def _read_spill(self, offset: int, size: int) -> bytes:
+        with self._lock:
+            if self._spill is None:
+                raise ValueError("Image store has been closed")
+            self._spill.seek(offset)
+            return self._spill.read(size)
+
+    def __getitem__(self, name: str) -> ImageRef:
+        return self._entries[name]
+
+    def __setitem__(self, name: str, value: Mapping):
+        if isinstance(value, ImageRef):
+            self._set(name, value)
+        else:
+            self.add_bytes(name, value['data'], value.get('format', ''))
+
+    def __delitem__(self, name: str):
+        if name not in self._entries:
+            raise KeyError(name)
+        self._discard(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f'ImageStore({len(self)} images, {self.memory_used} bytes in memory)'
@@ -0,0 +1,219 @@
+"""Shared Markdown -> Document reading without an HTML round trip.
+
+Python-Markdown parses the source into an ElementTree and runs its inline
+processors over it; ``convert`` would then serialize that tree to an HTML
+string, which readers parsed straight back into a tree. Here the tree is
+walked directly into blocks, skipping the serializer, the postprocessors
+and the second parse. Each thread keeps one Markdown engine and resets it
+between sources instead of rebuilding its extension registries per call.
+
+Without ``rich`` the blocks are those the HTML round trip produced: every
+paragraph and heading in document order, wherever it sits (loose list
+items, block quotes, raw HTML), empty headings included, with Markdown's
+default syntax only - tight list items, code blocks and tables are not
+paragraphs, and pipe tables stay paragraph text. ``rich`` adds the tables
+extension and maps lists, tables, links and images to their own blocks.
+
+Raw HTML blocks in the source are stashed by Markdown and read with the
+shared HTML reader. A source rendered in pieces passes the reference-style
+link definitions of the whole file, collected with
+``reference_definitions``, so links resolve in every piece.
+
+Example:
+    >>> doc = read_markdown('# Title\\n\\nSome *text*.')
+    >>> for block in iter_markdown(chunk, rich=True):
+    ...     print(block)
+"""
+
+import re
+import threading
+from html import unescape
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+import markdown
+from markdown.blockprocessors import ReferenceProcessor
+from markdown.util import AMP_SUBSTITUTE
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import Block, Heading, Image, Link, ListBlock, Paragraph, Table
+from convertext.converters.html_reader import iter_blocks, parse_html
+
+_HEADINGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+# Containers whose children are read as blocks of their own
+_CONTAINERS = frozenset(('blockquote', 'div'))
+_PLACEHOLDER = re.compile(markdown.util.HTML_PLACEHOLDER % r'(\d+)')
+_TAG = re.compile(r'<[^>]*>')
+
+_local = threading.local()
+
+# Link id -> (url, title), as Markdown keeps them in ``Markdown.references``
+References = Dict[str, Tuple[str, Optional[str]]]
+
+
+def _engine(rich: bool) -> markdown.Markdown:
+    """This thread's Markdown engine for rich or plain reading, reset for a new source."""
+    name = 'rich_md' if rich else 'md'
+    md = getattr(_local, name, None)
+    if md is None:
+        md = markdown.Markdown(extensions=['tables'] if rich else [])
+        # Only adds whitespace for the serializer
+        md.treeprocessors.deregister('prettify')
+        setattr(_local, name, md)
+    return md.reset()
+
+
+def _parse(
+    source: str, references: Optional[References] = None, rich: bool = False
+) -> Tuple[ElementTree.Element, List[str]]:
+    """Run Markdown up to (not including) serialization.
+
+    Returns the element tree and the stashed raw HTML blocks. Both are
+    independent of the engine afterwards, so blocks can be read lazily
+    while the engine parses another source. references are added after
+    the source's own definitions, as the whole file's last definitions win.
+    """
+    md = _engine(rich)
+    lines = source.split('\n')
+    for preprocessor in md.preprocessors:
+        lines = preprocessor.run(lines)
+    root = md.parser.parseDocument(lines).getroot()
+    if references:
+        md.references.update(references)
+    for treeprocessor in md.treeprocessors:
+        new_root = treeprocessor.run(root)
+        if new_root is not None:
+            root = new_root
+    return root, list(md.htmlStash.rawHtmlBlocks)
+
+
+class _Walker:
+    """Turns one parsed Markdown tree into blocks."""
+
+    def __init__(self, stash: List, rich: bool):
+        self.stash = stash
+        self.rich = rich
+
+    def text(self, element: ElementTree.Element) -> str:
+        text = ''.join(element.itertext())
+        if '\x02' in text:
+            text = _PLACEHOLDER.sub(self._inline_html, text).replace(AMP_SUBSTITUTE, '&')
+        return text.strip()
+
+    def _inline_html(self, match: 're.Match') -> str:
+        raw = self._raw(int(match.group(1)))
+        return unescape(_TAG.sub('', raw)) if isinstance(raw, str) else ''.join(raw.itertext())
+
+    def _raw(self, index: int):
+        return self.stash[index] if index < len(self.stash) else ''
+
+    def blocks(self, parent: ElementTree.Element) -> Iterator[Block]:
+        for element in parent:
+            tag = element.tag
+            if tag in _HEADINGS:
+                text = self.text(element)
+                if text or not self.rich:
+                    yield Heading(text, int(tag[1]))
+            elif tag == 'p':
+                yield from self._paragraph(element)
+            elif tag in ('ul', 'ol'):
+                if self.rich:
+                    items = list(self._items(element))
+                    if items:
+                        yield ListBlock(items, tag == 'ol')
+                else:
+                    # Only loose items hold paragraphs
+                    for li in element.findall('li'):
+                        yield from self.blocks(li)
+            elif tag == 'pre':
+                if self.rich:
+                    # Code block text is already HTML-escaped
+                    text = unescape(''.join(element.itertext())).strip('\n')
+                    if text.strip():
+                        yield Paragraph(text)
+            elif tag == 'table':
+                table = self._table(element)
+                if table is not None:
+                    yield table
+            elif tag in _CONTAINERS:
+                yield from self.blocks(element)
+
+    def _items(self, list_element: ElementTree.Element) -> Iterator[str]:
+        """Item texts, with nested list items following their parent item."""
+        for li in list_element.findall('li'):
+            nested = [child for child in li if child.tag in ('ul', 'ol')]
+            for child in nested:
+                li.remove(child)
+            text = self.text(li)
+            if text:
+                yield text
+            for child in nested:
+                yield from self._items(child)
+
+    def _paragraph(self, p: ElementTree.Element) -> Iterator[Block]:
+        lead = (p.text or '').strip()
+        if not len(p):
+            match = _PLACEHOLDER.fullmatch(lead)
+            if match:
+                # A raw HTML block
+                raw = self._raw(int(match.group(1)))
+                if isinstance(raw, str):
+                    yield from iter_blocks(parse_html(raw), self.rich)
+                else:
+                    yield from self.blocks(raw)
+                return
+        elif self.rich and len(p) == 1 and not lead and not (p[0].tail or '').strip():
+            child = p[0]
+            if child.tag == 'img':
+                yield Image(child.get('src', ''))
+                return
+            if child.tag == 'a':
+                yield Link(self.text(child), child.get('href', ''))
+                return
+        text = self.text(p)
+        if text:
+            yield Paragraph(text)
+
+    def _table(self, table: ElementTree.Element) -> Optional[Table]:
+        headers = []
+        thead = table.find('thead')
+        if thead is not None:
+            headers = [self.text(cell) for row in thead.iter('tr') for cell in row]
+        body = table.find('tbody')
+        rows = [[self.text(cell) for cell in row] for row in (body if body is not None else table).iter('tr')]
+        rows = [row for row in rows if row]
+        return Table(rows, headers or None) if rows else None
+
+
+def reference_definitions(source: str) -> References:
+    """Reference-style link definitions (``[id]: url "title"``) in source."""
+    references = {}
+    for match in ReferenceProcessor.RE.finditer(source):
+        link = match.group(2).lstrip('<').rstrip('>')
+        references[match.group(1).strip().lower()] = (link, match.group(5) or match.group(6))
+    return references
+
+
+def iter_markdown(
+    source: str, rich: bool = False, references: Optional[References] = None
+) -> Iterator[Block]:
+    """Yield the blocks of Markdown source in document order.
+
+    Without rich, only paragraphs and headings (see the module docstring).
+    With rich, code blocks become paragraphs, and lists, tables, and
+    paragraphs holding only a link or an image become ListBlock, Table,
+    Link and Image blocks. references are link definitions from outside
+    source, e.g. from other pieces of the same file.
+    """
+    if not source.strip():
+        return
+    root, stash = _parse(source, references, rich)
+    yield from _Walker(stash, rich).blocks(root)
+
+
+def read_markdown(source: str, doc: Optional[Document] = None, rich: bool = False) -> Document:
+    """Parse source and append its blocks to doc (a new Document by default)."""
+    if doc is None:
+        doc = Document()
+    doc.content.extend(iter_markdown(source, rich))
+    return doc
@@ -3,7 +3,8 @@
 from pathlib import Path
 from typing import Dict, Any
 from convertext.converters.base import Document
-from convertext.converters.utils import escape_html
+from convertext.converters.blocks import Heading, Image, Link, ListBlock, Paragraph, Run, Table, Text
+from convertext.converters.utils import LineWriter, escape_html, run_to_html, run_to_markdown
 
 
 class TextWriterMixin:
@@ -19,46 +20,45 @@ class TextWriterMixin:
                 f.write(f"By: {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block["type"] in ["text", "paragraph"]:
-                    f.write(block["data"] + "\n\n")
+                if isinstance(block, (Paragraph, Text)):
+                    f.write(block.data + "\n\n")
 
-                elif block["type"] == "heading":
-                    f.write("\n" + block["data"].upper() + "\n")
-                    f.write("-" * len(block["data"]) + "\n\n")
+                elif isinstance(block, Heading):
+                    f.write("\n" + block.data.upper() + "\n")
+                    f.write("-" * len(block.data) + "\n\n")
 
-                elif block["type"] == "run":
-                    text = block["text"]
-                    if block.get("bold"):
+                elif isinstance(block, Run):
+                    text = block.text
+                    if block.bold:
                         text = f"**{text}**"
-                    if block.get("italic"):
+                    if block.italic:
                         text = f"*{text}*"
                     f.write(text)
 
-                elif block["type"] == "table":
-                    headers = block.get("headers", [])
-                    rows = block["rows"]
+                elif isinstance(block, Table):
+                    headers = block.headers
 
                     if headers:
                         f.write(" | ".join(headers) + "\n")
                         f.write("-" * (len(" | ".join(headers))) + "\n")
 
-                    for row in rows:
-                        f.write(" | ".join(str(cell) for cell in row) + "\n")
+                    for row in block.iter_rows():
+                        f.write(" | ".join(row) + "\n")
                     f.write("\n")
 
-                elif block["type"] == "list":
-                    for i, item in enumerate(block["items"], 1):
-                        if block.get("ordered"):
+                elif isinstance(block, ListBlock):
+                    for i, item in enumerate(block.items, 1):
+                        if block.ordered:
                             f.write(f"{i}. {item}\n")
                         else:
                             f.write(f"• {item}\n")
                     f.write("\n")
 
-                elif block["type"] == "link":
-                    f.write(f"{block['text']} ({block['url']})\n")
+                elif isinstance(block, Link):
+                    f.write(f"{block.text} ({block.url})\n")
 
-                elif block["type"] == "image":
-                    f.write(f"[Image: {block['name']}]\n")
+                elif isinstance(block, Image):
+                    f.write(f"[Image: {block.name}]\n")
 
         return True
 
@@ -68,111 +68,94 @@ class HtmlWriterMixin:
 
     def _write_html(self, doc: Document, path: Path) -> bool:
         """Write Document to HTML with styles, tables, images, links."""
-        html_parts = [
-            "<!DOCTYPE html>",
-            "<html>",
-            "<head>",
-            '<meta charset="utf-8">',
-        ]
-
-        if doc.metadata.get("title"):
-            html_parts.append(
-                f"<title>{escape_html(doc.metadata['title'])}</title>"
-            )
-        else:
-            html_parts.append("<title>Document</title>")
-
-        html_parts.append("</head>")
-        html_parts.append("<body>")
-
-        if doc.metadata.get("title"):
-            html_parts.append(f"<h1>{escape_html(doc.metadata['title'])}</h1>")
-        if doc.metadata.get("author"):
-            html_parts.append(
-                f"<p><em>By {escape_html(doc.metadata['author'])}</em></p>"
-            )
-
-        for block in doc.content:
-            if block["type"] == "paragraph":
-                html_parts.append(f"<p>{escape_html(block['data'])}</p>")
-
-            elif block["type"] == "heading":
-                level = min(block["level"], 6)
+        with open(path, "w", encoding="utf-8") as f:
+            html_parts = LineWriter(f)
+            html_parts.extend([
+                "<!DOCTYPE html>",
+                "<html>",
+                "<head>",
+                '<meta charset="utf-8">',
+            ])
+
+            if doc.metadata.get("title"):
                 html_parts.append(
-                    f"<h{level}>{escape_html(block['data'])}</h{level}>"
+                    f"<title>{escape_html(doc.metadata['title'])}</title>"
                 )
+            else:
+                html_parts.append("<title>Document</title>")
 
-            elif block["type"] == "text":
-                html_parts.append(f"<p>{escape_html(block['data'])}</p>")
-
-            elif block["type"] == "run":
-                span_content = escape_html(block["text"])
-                styles = []
-
-                if block.get("bold"):
-                    span_content = f"<strong>{span_content}</strong>"
-                if block.get("italic"):
-                    span_content = f"<em>{span_content}</em>"
-                if block.get("underline"):
-                    styles.append("text-decoration: underline")
-
-                if block.get("color"):
-                    styles.append(f"color: {block['color']}")
-                if block.get("font"):
-                    styles.append(f"font-family: {block['font']}")
-                if block.get("size"):
-                    styles.append(f"font-size: {block['size']}pt")
-
-                if styles:
-                    style_attr = "; ".join(styles)
-                    span_content = f'<span style="{style_attr}">{span_content}</span>'
-
-                html_parts.append(f"<p>{span_content}</p>")
-
-            elif block["type"] == "table":
-                html_parts.append('<table border="1">')
-
-                if block.get("headers"):
-                    html_parts.append("<thead><tr>")
-                    for header in block["headers"]:
-                        html_parts.append(f"<th>{escape_html(str(header))}</th>")
-                    html_parts.append("</tr></thead>")
-
-                html_parts.append("<tbody>")
-                for row in block["rows"]:
-                    html_parts.append("<tr>")
-                    for cell in row:
-                        html_parts.append(f"<td>{escape_html(str(cell))}</td>")
-                    html_parts.append("</tr>")
-                html_parts.append("</tbody>")
-                html_parts.append("</table>")
-
-            elif block["type"] == "list":
-                tag = "ol" if block.get("ordered") else "ul"
-                html_parts.append(f"<{tag}>")
-                for item in block["items"]:
-                    html_parts.append(f"<li>{escape_html(item)}</li>")
-                html_parts.append(f"</{tag}>")
-
-            elif block["type"] == "link":
+            html_parts.append("</head>")
+            html_parts.append("<body>")
+
+            if doc.metadata.get("title"):
+                html_parts.append(f"<h1>{escape_html(doc.metadata['title'])}</h1>")
+            if doc.metadata.get("author"):
                 html_parts.append(
-                    f'<p><a href="{escape_html(block["url"])}">'
-                    f'{escape_html(block["text"])}</a></p>'
+                    f"<p><em>By {escape_html(doc.metadata['author'])}</em></p>"
                 )
 
-            elif block["type"] == "image":
-                img_name = block["name"]
-                if img_name in doc.images:
+            for block in doc.content:
+                if isinstance(block, Paragraph):
+                    if block.spans:
+                        html_parts.append(
+                            "<p>" + "".join(map(run_to_html, block.spans)) + "</p>"
+                        )
+                    else:
+                        html_parts.append(f"<p>{escape_html(block.data)}</p>")
+
+                elif isinstance(block, Heading):
+                    level = min(block.level, 6)
                     html_parts.append(
-                        f'<img src="data:image/{doc.images[img_name]["format"]};'
-                        f'base64,..." alt="{escape_html(img_name)}">'
+                        f"<h{level}>{escape_html(block.data)}</h{level}>"
                     )
 
-        html_parts.append("</body>")
-        html_parts.append("</html>")
+                elif isinstance(block, Text):
+                    html_parts.append(f"<p>{escape_html(block.data)}</p>")
+
+                elif isinstance(block, Run):
+                    html_parts.append(f"<p>{run_to_html(block)}</p>")
+
+                elif isinstance(block, Table):
+                    html_parts.append('<table border="1">')
+
+                    if block.headers:
+                        html_parts.append("<thead><tr>")
+                        for header in block.headers:
+                            html_parts.append(f"<th>{escape_html(str(header))}</th>")
+                        html_parts.append("</tr></thead>")
+
+                    html_parts.append("<tbody>")
+                    for row in block.iter_rows():
+                        html_parts.append("<tr>")
+                        for cell in row:
+                            html_parts.append(f"<td>{escape_html(cell)}</td>")
+                        html_parts.append("</tr>")
+                    html_parts.append("</tbody>")
+                    html_parts.append("</table>")
+
+                elif isinstance(block, ListBlock):
+                    tag = "ol" if block.ordered else "ul"
+                    html_parts.append(f"<{tag}>")
+                    for item in block.items:
+                        html_parts.append(f"<li>{escape_html(item)}</li>")
+                    html_parts.append(f"</{tag}>")
+
+                elif isinstance(block, Link):
+                    html_parts.append(
+                        f'<p><a href="{escape_html(block.url)}">'
+                        f'{escape_html(block.text)}</a></p>'
+                    )
 
-        with open(path, "w", encoding="utf-8") as f:
-            f.write("\n".join(html_parts))
+                elif isinstance(block, Image):
+                    img_name = block.name
+                    if img_name in doc.images:
+                        html_parts.append(
+                            f'<img src="data:image/{doc.images[img_name]["format"]};'
+                            f'base64,..." alt="{escape_html(img_name)}">'
+                        )
+
+            html_parts.append("</body>")
+            html_parts.append("</html>")
 
         return True
 
@@ -189,54 +172,50 @@ class MarkdownWriterMixin:
                 f.write(f"**Author:** {doc.metadata['author']}\n\n")
 
             for block in doc.content:
-                if block["type"] == "paragraph":
-                    f.write(block["data"] + "\n\n")
+                if isinstance(block, Paragraph):
+                    if block.spans:
+                        f.write("".join(map(run_to_markdown, block.spans)) + "\n\n")
+                    else:
+                        f.write(block.data + "\n\n")
 
-                elif block["type"] == "text":
-                    f.write(block["data"] + "\n\n")
+                elif isinstance(block, Text):
+                    f.write(block.data + "\n\n")
 
-                elif block["type"] == "heading":
-                    f.write("#" * block["level"] + " " + block["data"] + "\n\n")
+                elif isinstance(block, Heading):
+                    f.write("#" * block.level + " " + block.data + "\n\n")
 
-                elif block["type"] == "run":
-                    text = block["text"]
-                    if block.get("bold"):
-                        text = f"**{text}**"
-                    if block.get("italic"):
-                        text = f"*{text}*"
-                    if block.get("underline"):
-                        text = f"<u>{text}</u>"
-                    f.write(text)
+                elif isinstance(block, Run):
+                    f.write(run_to_markdown(block))
 
-                elif block["type"] == "table":
-                    headers = block.get("headers", [])
-                    rows = block["rows"]
+                elif isinstance(block, Table):
+                    headers = block.headers
+                    rows = block.iter_rows()
 
                     if headers:
                         f.write("| " + " | ".join(headers) + " |\n")
                         f.write("|" + "|".join([" --- "] * len(headers)) + "|\n")
-                    elif rows:
-                        first_row = rows[0]
-                        f.write("| " + " | ".join(str(cell) for cell in first_row) + " |\n")
-                        f.write("|" + "|".join([" --- "] * len(first_row)) + "|\n")
-                        rows = rows[1:]
+                    else:
+                        first_row = next(rows, None)
+                        if first_row is not None:
+                            f.write("| " + " | ".join(first_row) + " |\n")
+                            f.write("|" + "|".join([" --- "] * len(first_row)) + "|\n")
 
                     for row in rows:
-                        f.write("| " + " | ".join(str(cell) for cell in row) + " |\n")
+                        f.write("| " + " | ".join(row) + " |\n")
                     f.write("\n")
 
-                elif block["type"] == "list":
-                    for i, item in enumerate(block["items"], 1):
-                        if block.get("ordered"):
+                elif isinstance(block, ListBlock):
+                    for i, item in enumerate(block.items, 1):
+                        if block.ordered:
                             f.write(f"{i}. {item}\n")
                         else:
                             f.write(f"- {item}\n")
                     f.write("\n")
 
-                elif block["type"] == "link":
-                    f.write(f"[{block['text']}]({block['url']})\n\n")
+                elif isinstance(block, Link):
+                    f.write(f"[{block.text}]({block.url})\n\n")
 
-                elif block["type"] == "image":
-                    f.write(f"![{block['name']}]({block['name']})\n\n")
+                elif isinstance(block, Image):
+                    f.write(f"![{block.name}]({block.name})\n\n")
 
         return True
@@ -0,0 +1,173 @@
+"""Partial reads: convert only part of a source.
+
+A read range (``--range`` / ``documents.range``) limits how much of a source
+is read, so previews cost as much as the preview rather than the book:
+
+    ``1-20``        native units 1 to 20 (1-based, inclusive); also ``7``,
+                    ``5-`` and ``-10``
+    ``blocks:200``  the first 200 content blocks
+    ``headings:3``  content up to (not including) the 4th heading
+
+Parts combine with commas, e.g. ``1-50,blocks:100``. Native units are PDF
+pages, EPUB spine items, KF8/MOBI text records and FB2 top-level sections;
+readers for these stop parsing once the range is covered. For other formats
+the unit range selects blocks.
+"""
+
+import re
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from convertext.converters.blocks import Block, Heading
+
+#: Range used by ``--preview``
+PREVIEW_RANGE = 'blocks:200'
+
+_UNITS = re.compile(r'(\d*)\s*-\s*(\d*)|(\d+)')
+
+
+class ReadRange:
+    """Parsed read range, with the bookkeeping for one read.
+
+    ``start``/``stop`` select native units as a 0-based half-open interval;
+    ``blocks`` and ``headings`` cap the content. Each read gets its own
+    instance (``from_config`` returns a fresh one), because ``full()`` keeps
+    its scan position between calls.
+
+    Example:
+        >>> rng = ReadRange.parse('1-20,headings:2')
+        >>> for page in rng.units(page_count):
+        ...     read_page(page)
+        ...     if rng.full(doc):
+        ...         break
+        >>> rng.trim(doc)
+    """
+
+    def __init__(
+        self,
+        start: int = 0,
+        stop: Optional[int] = None,
+        blocks: Optional[int] = None,
+        headings: Optional[int] = None,
+    ):
+        self.start = start
+        self.stop = stop
+        self.blocks = blocks
+        self.headings = headings
+        self._scanned = 0
+        self._seen = 0
+        self._cut: Optional[int] = None
+
+    @classmethod
+    def parse(cls, spec: str) -> 'ReadRange':
+        """Parse a range spec such as ``'1-20'`` or ``'blocks:200'``.
+
+        Raises:
+            ValueError: If the spec is malformed or selects nothing.
+        """
+        rng = cls()
+        for part in spec.split(','):
+            part = part.strip().lower()
+            key, sep, value = part.partition(':')
+            if sep:
+                if key not in ('blocks', 'headings') or not value.strip().isdigit():
+                    raise ValueError(f"Invalid read range {part!r}")
+                setattr(rng, key, int(value))
+                continue
+            match = _UNITS.fullmatch(part)
+            if not match or part == '-':
+                raise ValueError(f"Invalid read range {part!r}")
+            first, last, single = match.groups()
+            if single:
+                first = last = single
+            if first == '0' or last == '0':
+                raise ValueError(f"Read range {part!r} is 1-based")
+            rng.start = int(first) - 1 if first else 0
+            rng.stop = int(last) if last else None
+            if rng.stop is not None and rng.stop <= rng.start:
+                raise ValueError(f"Empty read range {part!r}")
+        return rng
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional['ReadRange']:
+        """The ``documents.range`` setting, or None to read everything."""
+        spec = config.get('documents', {}).get('range')
+        if spec is None or spec == '':
+            return None
+        return cls.parse(str(spec))
+
+    @property
+    def has_units(self) -> bool:
+        return self.start > 0 or self.stop is not None
+
+    def units(self, count: int) -> range:
+        """Indexes of the native units to read out of count."""
+        stop = count if self.stop is None else min(self.stop, count)
+        return range(min(self.start, stop), stop)
+
+    def includes(self, unit: int) -> bool:
+        """Whether native unit index ``unit`` is in the range."""
+        return self.start <= unit and (self.stop is None or unit < self.stop)
+
+    def past(self, units_read: int) -> bool:
+        """Whether reading units_read native units covers the range."""
+        return self.stop is not None and units_read >= self.stop
+
+    def full(self, content: List[Block], units_as_blocks: bool = False) -> bool:
+        """True once content holds everything the block/heading caps allow.
+
+        Only blocks added since the previous call are scanned. With
+        ``units_as_blocks`` the end of the unit range counts as a cap too.
+        """
+        if units_as_blocks and self.stop is not None and len(content) >= self.stop:
+            return True
+        if self._cut is None:
+            self._cut = self._find_cut(content, incremental=True)
+        return self._cut is not None
+
+    def trim(self, content: List[Block], units_as_blocks: bool = False):
+        """Cut content down to the caps in place.
+
+        With ``units_as_blocks`` the unit range is applied to blocks first,
+        for readers without native units.
+        """
+        if units_as_blocks and self.has_units:
+            content[:] = content[self.start:self.stop]
+        cut = self._find_cut(content, incremental=False)
+        if cut is not None:
+            del content[cut:]
+
+    def limit(self, blocks: Iterable[Block], units_as_blocks: bool = False) -> Iterator[Block]:
+        """Lazy ``trim`` for streamed content: stops pulling from blocks."""
+        if units_as_blocks and self.has_units:
+            blocks = islice(blocks, self.start, self.stop)
+        if self.blocks is not None:
+            blocks = islice(blocks, self.blocks)
+        seen = 0
+        for block in blocks:
+            if self.headings is not None and isinstance(block, Heading):
+                seen += 1
+                if seen > self.headings:
+                    return
+            yield block
+
+    def _find_cut(self, content: List[Block], incremental: bool) -> Optional[int]:
+        """Index where content must end, or None if the caps are not reached."""
+        cut = None
+        if self.blocks is not None and len(content) >= self.blocks:
+            cut = self.blocks
+        if self.headings is not None:
+            seen = self._seen if incremental else 0
+            index = self._scanned if incremental else 0
+            end = len(content) if cut is None else cut
+            for index in range(index, end):
+                if isinstance(content[index], Heading):
+                    seen += 1
+                    if seen > self.headings:
+                        cut = index
+                        break
+            else:
+                index = end
+            if incremental:
+                self._seen, self._scanned = seen, index
+        return cut
@@ -0,0 +1,380 @@
+"""Versioned binary serialization of parsed Documents.
+
+Layout (integers little-endian)::
+
+    header    b'CXDOC', u8 format version
+    strings   u32 count, u32 length (in characters) per string,
+              u64 byte size, UTF-8 text of all strings concatenated
+    metadata  value
+    styles    value
+    toc       value
+    images    u32 count, then per image: u32 name, u32 format, u64 blob offset, u64 size
+    blocks    u32 count, then per block: u8 type code, u32 payload size, payload
+    blobs     u64 size, image bytes
+
+Every string (block text, metadata, image names) is stored once in the string
+table and referenced by index. Image data lives in the blob area and is
+referenced from the image table; identical images are stored once. Values are
+tagged (None, bool, int, float, str, bytes, list, dict, block) and a block
+payload is a field count followed by its field values in ``Block._fields``
+order, so blocks that gain trailing fields stay readable. Blocks nested in
+values (paragraph spans) are stored as a type code followed by such a payload.
+
+Nothing is imported or executed while loading (unlike pickle), so serialized
+Documents are safe to cache on disk, share between users and ship to worker
+processes.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import (
+    Heading, Image, Link, ListBlock, Paragraph, Run, Table, Text,
+)
+
+MAGIC = b'CXDOC'
+FORMAT_VERSION = 2
+
+# Block type codes are part of the format: only ever append to this tuple
+BLOCK_TYPES: Tuple[type, ...] = (Text, Paragraph, Heading, Run, Table, ListBlock, Link, Image)
+_BLOCK_CODES = {cls: code for code, cls in enumerate(BLOCK_TYPES)}
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _BYTES, _LIST, _DICT, _BLOCK = range(10)
+
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+_TAG_U32 = struct.Struct('<BI')
+_BLOCK_HEADER = struct.Struct('<BI')
+_IMAGE_ENTRY = struct.Struct('<IIQQ')
+
+
+class _Encoder:
+    """Accumulates the string table while values are encoded."""
+
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+
+    def sid(self, s: str) -> int:
+        index = self.strings.get(s)
+        if index is None:
+            index = self.strings[s] = len(self.strings)
+        return index
+
+    def value(self, out: bytearray, value: Any):
+        kind = type(value)
+        if kind is str:
+            out += _TAG_U32.pack(_STR, self.sid(value))
+        elif value is None:
+            out.append(_NONE)
+        elif kind is bool:
+            out.append(_TRUE if value else _FALSE)
+        elif kind is int:
+            out.append(_INT)
+            out += _I64.pack(value)
+        elif kind is float:
+            out.append(_FLOAT)
+            out += _F64.pack(value)
+        elif kind in (list, tuple):
+            out += _TAG_U32.pack(_LIST, len(value))
+            for item in value:
+                self.value(out, item)
+        elif kind in _BLOCK_CODES:
+            fields = value._fields
+            out.append(_BLOCK)
+            out.append(_BLOCK_CODES[kind])
+            out.append(len(fields))
+            for name in fields:
+                self.value(out, getattr(value, name))
+        elif isinstance(value, Mapping):
+            out += _TAG_U32.pack(_DICT, len(value))
+            for key, item in value.items():
+                self.value(out, key)
+                self.value(out, item)
+        elif kind in (bytes, bytearray, memoryview):
+            out += _TAG_U32.pack(_BYTES, len(value))
+            out += value
+        elif isinstance(value, Sequence):
+            # Lazy views such as TableRows
+            out += _TAG_U32.pack(_LIST, len(value))
+            for item in value:
+                self.value(out, item)
+        else:
+            raise TypeError(f"Cannot serialize {kind.__name__} value in Document")
+
+
+def dumps(doc: Document) -> bytes:
+    """Serialize a Document to bytes.
+
+    Streamed Documents are drained first; their content cannot be reused
+    afterwards.
+    """
+    doc = doc.materialize()
+    enc = _Encoder()
+
+    body = bytearray()
+    enc.value(body, doc.metadata)
+    enc.value(body, doc.styles)
+    enc.value(body, doc.toc)
+
+    blobs = bytearray()
+    blob_offsets: Dict[bytes, int] = {}
+    body += _U32.pack(len(doc.images))
+    for name, image in doc.images.items():
+        data = bytes(image['data'])
+        offset = blob_offsets.get(data)
+        if offset is None:
+            offset = blob_offsets[data] = len(blobs)
+            blobs += data
+        body += _IMAGE_ENTRY.pack(enc.sid(name), enc.sid(image.get('format', '')), offset, len(data))
+
+    body += _U32.pack(len(doc.content))
+    payload = bytearray()
+    for block in doc.content:
+        try:
+            code = _BLOCK_CODES[type(block)]
+        except KeyError:
+            raise TypeError(f"Cannot serialize content block {block!r}") from None
+        payload.clear()
+        fields = block._fields
+        payload.append(len(fields))
+        for name in fields:
+            enc.value(payload, getattr(block, name))
+        body += _BLOCK_HEADER.pack(code, len(payload))
+        body += payload
+
+    body += _U64.pack(len(blobs))
+    body += blobs
+
+    strings = list(enc.strings)
+    text = ''.join(strings).encode('utf-8')
+    header = bytearray(MAGIC)
+    header.append(FORMAT_VERSION)
+    header += _U32.pack(len(strings))
+    header += struct.pack(f'<{len(strings)}I', *map(len, strings))
+    header += _U64.pack(len(text))
+    return bytes(header + text + body)
+
+
+def loads(data: bytes) -> Document:
+    """Rebuild a Document serialized with dumps().
+
+    Raises:
+        ValueError: If data is not a serialized Document, is truncated or
+            otherwise corrupt, or was written by another format version.
+    """
+    try:
+        return _Decoder(data).document()
+    except (struct.error, IndexError, UnicodeDecodeError, TypeError, RecursionError) as e:
+        # TypeError: unhashable dict keys, wrong field counts for a block
+        raise ValueError(f"Corrupt serialized Document: {e}") from None
+
+
+def dump(doc: Document, f: BinaryIO):
+    """Serialize a Document to a binary file object."""
+    f.write(dumps(doc))
+
+
+def load(f: BinaryIO) -> Document:
+    """Load a Document from a binary file object."""
+    return loads(f.read())
+
+
+class _Decoder:
+    def __init__(self, data: bytes):
+        self.buf = memoryview(data)
+        self.pos = 0
+        self.strings: List[str] = []
+
+    def document(self) -> Document:
+        buf = self.buf
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError("Not a serialized Document")
+        version = buf[len(MAGIC)]
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Serialized Document format {version} is newer than supported ({FORMAT_VERSION})")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Serialized Document format {version} is no longer supported ({FORMAT_VERSION})")
+        self.pos = len(MAGIC) + 1
+
+        count = self.u32()
+        lengths = struct.unpack_from(f'<{count}I', buf, self.pos)
+        self.pos += 4 * count
+        size = self.u64()
+        text = str(buf[self.pos:self.pos + size], 'utf-8')
+        self.pos += size
+        strings = self.strings
+        start = 0
+        for length in lengths:
+            strings.append(text[start:start + length])
+            start += length
+
+        doc = Document()
+        doc.metadata = self.value()
+        doc.styles = self.value()
+        doc.toc = self.value()
+
+        images = []
+        for _ in range(self.u32()):
+            images.append(_IMAGE_ENTRY.unpack_from(buf, self.pos))
+            self.pos += _IMAGE_ENTRY.size
+
+        append = doc.content.append
+        value = self.value
+        unpack_header = _BLOCK_HEADER.unpack_from
+        unpack_u32 = _U32.unpack_from
+        for _ in range(self.u32()):
+            pos = self.pos
+            code, size = unpack_header(buf, pos)
+            end = pos + _BLOCK_HEADER.size + size
+            if code >= len(BLOCK_TYPES):
+                raise ValueError(f"Unknown block type code {code}")
+            pos += _BLOCK_HEADER.size
+            nfields = buf[pos]
+            pos += 1
+            args = []
+            for _ in range(nfields):
+                # Inline the common case: a string-table reference
+                if buf[pos] == _STR:
+                    args.append(strings[unpack_u32(buf, pos + 1)[0]])
+                    pos += 5
+                else:
+                    self.pos = pos
+                    args.append(value())
+                    pos = self.pos
+            append(BLOCK_TYPES[code](*args))
+            self.pos = end
+
+        blob_size = self.u64()
+        blobs = buf[self.pos:self.pos + blob_size]
+        if len(blobs) != blob_size:
+            raise ValueError("Corrupt serialized Document: truncated image data")
+        for name, fmt, offset, size in images:
+            doc.images[strings[name]] = {
+                'data': bytes(blobs[offset:offset + size]),
+                'format': strings[fmt],
+            }
+        return doc
+
+    def u32(self) -> int:
+        (n,) = _U32.unpack_from(self.buf, self.pos)
+        self.pos += 4
+        return n
+
+    def u64(self) -> int:
+        (n,) = _U64.unpack_from(self.buf, self.pos)
+        self.pos += 8
+        return n
+
+    def value(self) -> Any:
+        buf = self.buf
+        tag = buf[self.pos]
+        self.pos += 1
+        if tag == _STR:
+            return self.strings[self.u32()]
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _INT:
+            (n,) = _I64.unpack_from(buf, self.pos)
+            self.pos += 8
+            return n
+        if tag == _FLOAT:
+            (x,) = _F64.unpack_from(buf, self.pos)
+            self.pos += 8
+            return x
+        if tag == _LIST:
+            return [self.value() for _ in range(self.u32())]
+        if tag == _DICT:
+            result = {}
+            for _ in range(self.u32()):
+                key = self.value()
+                result[key] = self.value()
+            return result
+        if tag == _BYTES:
+            size = self.u32()
+            data = bytes(buf[self.pos:self.pos + size])
+            self.pos += size
+            return data
+        if tag == _BLOCK:
+            code = buf[self.pos]
+            nfields = buf[self.pos + 1]
+            self.pos += 2
+            if code >= len(BLOCK_TYPES):
+                raise ValueError(f"Unknown block type code {code}")
+            return BLOCK_TYPES[code](*[self.value() for _ in range(nfields)])
+        raise ValueError(f"Unknown value tag {tag}")
+
+
+class DocumentCache:
+    """On-disk cache of parsed Documents.
+
+    Entries are keyed by a hash of the source file's content together with
+    the reader and the reader-relevant config, so renamed or copied files
+    (including batch-staged copies) still hit, and edited files miss.
+
+    Example:
+        >>> cache = DocumentCache(Path('~/.cache/convertext').expanduser())
+        >>> key = cache.key(source, 'EpubConverter._read_epub', {'encoding': 'utf-8'})
+        >>> doc = cache.get(key)
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def key(self, source: Path, reader: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key for reading source with reader under options."""
+        h = hashlib.sha256()
+        h.update(f'{FORMAT_VERSION}\0{reader}\0'.encode('utf-8'))
+        h.update(json.dumps(options or {}, sort_keys=True, default=str).encode('utf-8'))
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f'{key}.cxdoc'
+
+    def get(self, key: str) -> Optional[Document]:
+        """Load a cached Document, or None on a miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            return loads(data)
+        except ValueError:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+    def put(self, key: str, doc: Document):
+        """Store a Document. The entry appears atomically or not at all."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = dumps(doc)
+        fd, tmp = tempfile.mkstemp(prefix=f'.{path.name}.', suffix='.tmp', dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,155 @@
+"""Shared plain text -> Document reading on a memory map.
+
+Paragraphs are separated by blank lines. Rather than reading the whole file
+and splitting it, the file is memory-mapped and a bytes regex scans it for
+the next paragraph boundary; only that paragraph's byte slice is decoded.
+Pages of the map that have been read can be dropped by the OS, so memory
+use does not grow with the file size.
+
+A paragraph that runs past ``_MAX_PARAGRAPH`` without a blank line, such
+as a log or a file with one line per sentence, is cut at the next line
+break so a single block never holds the whole file.
+
+Scanning bytes for newlines is valid for ASCII-compatible encodings (UTF-8,
+Latin-1, cp1252, ...). Other encodings, such as UTF-16, are read line by
+line instead.
+
+Example:
+    >>> doc = read_txt(path, 'utf-8', header=True)
+    >>> for block in iter_txt(path):
+    ...     print(block.data)
+"""
+
+import codecs
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import Paragraph
+
+# One or more empty lines after a line break; lines holding only spaces do
+# not end a paragraph, as with split('\n\n')
+_BOUNDARY = re.compile(rb'\r?\n(?:\r?\n)+')
+# Longer paragraphs are cut at the next line break (bytes, or characters
+# for encodings read as text)
+_MAX_PARAGRAPH = 1024 * 1024
+
+
+def iter_paragraphs(path: Path, encoding: str = 'utf-8') -> Iterator[str]:
+    """Yield the stripped, non-empty paragraphs of a text file in order."""
+    if not _ascii_compatible(encoding):
+        yield from _iter_text_paragraphs(path, encoding)
+        return
+
+    with open(path, 'rb') as f:
+        if not f.seek(0, 2):
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            for match in _BOUNDARY.finditer(data):
+                yield from _split(data, start, match.start(), encoding)
+                start = match.end()
+            yield from _split(data, start, len(data), encoding)
+
+
+def iter_txt(
+    path: Path,
+    encoding: str = 'utf-8',
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Iterator[Paragraph]:
+    """Yield one Paragraph per paragraph of a text file.
+
+    With metadata, a leading title header (a title line underlined with
+    ``=`` and an optional ``By: author`` line, as the ebook TXT writers
+    produce) sets ``title`` and ``author`` in it instead of being read as
+    text.
+    """
+    paras = iter_paragraphs(path, encoding)
+    if metadata is not None:
+        first = next(paras, None)
+        if first is None:
+            return
+        first = _read_header(first, metadata)
+        if first:
+            yield Paragraph(first)
+    for para in paras:
+        yield Paragraph(para)
+
+
+def read_txt(path: Path, encoding: str = 'utf-8', header: bool = False) -> Document:
+    """Read a text file into a Document.
+
+    Args:
+        path: Text file
+        encoding: Encoding of the file
+        header: Read a leading title header into the metadata (see iter_txt)
+    """
+    doc = Document()
+    doc.content.extend(iter_txt(path, encoding, doc.metadata if header else None))
+    return doc
+
+
+def _read_header(para: str, metadata: Dict[str, Any]) -> str:
+    """Take a title header off the first paragraph; return what remains."""
+    lines = para.split('\n')
+    underline = lines[1].strip() if len(lines) >= 2 else ''
+    if not underline or underline.strip('='):
+        return para
+    metadata['title'] = lines[0].strip()
+    i = 2
+    if i < len(lines) and lines[i].startswith('By:'):
+        metadata['author'] = lines[i][3:].strip()
+        i += 1
+    return '\n'.join(lines[i:]).strip()
+
+
+def _split(data: mmap.mmap, start: int, end: int, encoding: str) -> Iterator[str]:
+    """Decode data[start:end], cut at line breaks into pieces of about _MAX_PARAGRAPH."""
+    while end - start > _MAX_PARAGRAPH:
+        cut = data.find(b'\n', start + _MAX_PARAGRAPH, end)
+        if cut == -1:
+            break
+        para = _decode(data[start:cut], encoding)
+        if para:
+            yield para
+        start = cut + 1
+    para = _decode(data[start:end], encoding)
+    if para:
+        yield para
+
+
+def _decode(raw: bytes, encoding: str) -> str:
+    """Decode one paragraph with universal newlines, as text mode would."""
+    text = raw.decode(encoding).strip()
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _ascii_compatible(encoding: str) -> bool:
+    try:
+        return codecs.lookup(encoding).decode(b'\n\n')[0] == '\n\n'
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+
+def _iter_text_paragraphs(path: Path, encoding: str) -> Iterator[str]:
+    with open(path, 'r', encoding=encoding) as f:
+        lines: List[str] = []
+        size = 0
+        for line in f:
+            if line != '\n':
+                lines.append(line)
+                size += len(line)
+                if size <= _MAX_PARAGRAPH:
+                    continue
+            para = ''.join(lines).strip()
+            lines.clear()
+            size = 0
+            if para:
+                yield para
+        para = ''.join(lines).strip()
+        if para:
+            yield para
@@ -1,7 +1,10 @@
 """Shared utility functions for all converters."""
 
+import multiprocessing
 import re
-from typing import Optional
+from typing import Iterable, Optional, TextIO
+
+from convertext.converters.blocks import Run
 
 
 def escape_html(text: str) -> str:
@@ -15,6 +18,70 @@ def escape_html(text: str) -> str:
     )
 
 
+def run_to_html(run: Run) -> str:
+    """Render a formatted run (a ``run`` block or paragraph span) as inline HTML."""
+    content = escape_html(run.text)
+    styles = []
+
+    if run.bold:
+        content = f"<strong>{content}</strong>"
+    if run.italic:
+        content = f"<em>{content}</em>"
+    if run.underline:
+        styles.append("text-decoration: underline")
+
+    if run.color:
+        styles.append(f"color: {run.color}")
+    if run.font:
+        styles.append(f"font-family: {run.font}")
+    if run.size:
+        styles.append(f"font-size: {run.size}pt")
+
+    if styles:
+        style_attr = "; ".join(styles)
+        content = f'<span style="{style_attr}">{content}</span>'
+    return content
+
+
+def run_to_markdown(run: Run) -> str:
+    """Render a formatted run (a ``run`` block or paragraph span) as inline Markdown."""
+    text = run.text
+    if run.bold:
+        text = f"**{text}**"
+    if run.italic:
+        text = f"*{text}*"
+    if run.underline:
+        text = f"<u>{text}</u>"
+    return text
+
+
+class LineWriter:
+    """Write newline-separated parts straight to an open file.
+
+    Stands in for the ``parts.append(...)`` then ``f.write('\\n'.join(parts))``
+    pattern with byte-identical output, but without holding the parts in
+    memory, so writers can consume streamed content of any length.
+    """
+
+    def __init__(self, f: TextIO, sep: str = "\n"):
+        self._f = f
+        self._sep = sep
+        self._first = True
+
+    def append(self, part: str):
+        """Write one part, preceded by the separator unless it is the first."""
+        if self._first:
+            self._first = False
+        else:
+            self._f.write(self._sep)
+        self._f.write(part)
+
+    def extend(self, parts: Iterable[str]):
+        """Write several parts."""
+        for part in parts:
+            self.append(part)
+
+
 def escape_rtf(text: str) -> str:
     """Escape RTF special characters."""
     return text.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
@@ -92,3 +159,12 @@ def rgb_to_hex(r: int, g: int, b: int) -> str:
         Hex color string like '#FF0000'
     """
     return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def process_pool_context():
+    """Multiprocessing context for reader process pools.
+
+    Never fork: the batch pipeline runs conversions on worker threads.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
@@ -1,12 +1,15 @@
 """Main conversion orchestrator."""
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from dataclasses import dataclass
+import shutil
 import tempfile
 import os
 
 from convertext.config import Config
+from convertext.converters.base import collect_read_report
 from convertext.registry import get_registry
 
 
@@ -19,6 +22,10 @@ class ConversionResult:
     error: Optional[str] = None
     conversion_path: Optional[List[str]] = None  # Formats used in multi-hop
     hops: int = 1  # Number of conversion steps
+    skipped_pages: Optional[List[int]] = None  # Source pages the reader had to skip
+    blank_pages: int = 0  # Source pages skipped for having no text
+    encoding: Optional[str] = None  # Detected source encoding (encoding: auto)
+    target_format: Optional[str] = None  # Requested format (batch results, even without a target)
 
 
 class ConversionEngine:
@@ -32,9 +39,16 @@ class ConversionEngine:
     def convert(
         self,
         source_path: Path,
-        target_format: str
+        target_format: str,
+        output_dir: Optional[Path] = None
     ) -> ConversionResult:
-        """Convert a file to target format (supports multi-hop)."""
+        """Convert a file to target format (supports multi-hop).
+
+        Args:
+            source_path: File to convert
+            target_format: Target format extension
+            output_dir: Output directory for this file (overrides output.directory)
+        """
         # Load file-specific config (searches from file's dir up to home)
         self.config.load_file_config(source_path)
 
@@ -44,12 +58,12 @@ class ConversionEngine:
         # Try direct conversion first
         converter = self.registry.get_converter(source_format, target_format)
         if converter:
-            return self._direct_convert(source_path, target_format, converter)
+            return self._direct_convert(source_path, target_format, converter, output_dir)
 
         # Try multi-hop conversion
         path = self.registry.find_conversion_path(source_format, target_format)
         if path and len(path) > 2:  # Multi-hop needed
-            return self._multihop_convert(source_path, target_format, path)
+            return self._multihop_convert(source_path, target_format, path, output_dir)
 
         # No conversion path found
         return ConversionResult(
@@ -65,10 +79,11 @@ class ConversionEngine:
         self,
         source_path: Path,
         target_format: str,
-        converter
+        converter,
+        output_dir: Optional[Path] = None
     ) -> ConversionResult:
         """Perform direct single-hop conversion."""
-        target_path = self._get_target_path(source_path, target_format)
+        target_path = self._get_target_path(source_path, target_format, output_dir)
 
         if target_path.exists() and not self.config.get('output.overwrite', False):
             return ConversionResult(
@@ -81,11 +96,14 @@ class ConversionEngine:
             )
 
         try:
-            success = converter.convert(
-                source_path,
-                target_path,
-                self.config.config
-            )
+            with collect_read_report() as report, _staged(target_path) as staged:
+                success = converter.convert(
+                    source_path,
+                    staged,
+                    self.config.config
+                )
+                if success:
+                    os.replace(staged, target_path)
 
             if success:
                 return ConversionResult(
@@ -93,7 +111,10 @@ class ConversionEngine:
                     source_path=source_path,
                     target_path=target_path,
                     conversion_path=[source_path.suffix.lstrip('.').lower(), target_format],
-                    hops=1
+                    hops=1,
+                    skipped_pages=report.skipped_pages or None,
+                    blank_pages=report.blank_pages,
+                    encoding=report.encoding
                 )
             else:
                 return ConversionResult(
@@ -119,10 +140,11 @@ class ConversionEngine:
         self,
         source_path: Path,
         target_format: str,
-        path: List[str]
+        path: List[str],
+        output_dir: Optional[Path] = None
     ) -> ConversionResult:
         """Perform multi-hop conversion through intermediate formats."""
-        target_path = self._get_target_path(source_path, target_format)
+        target_path = self._get_target_path(source_path, target_format, output_dir)
 
         if target_path.exists() and not self.config.get('output.overwrite', False):
             return ConversionResult(
@@ -136,38 +158,46 @@ class ConversionEngine:
 
         intermediate_files = []
         current_file = source_path
+        report = None
 
         try:
-            # Execute each hop in the path
-            for i in range(len(path) - 1):
-                source_fmt = path[i]
-                target_fmt = path[i + 1]
-
-                # Get converter for this hop
-                converter = self.registry.get_converter(source_fmt, target_fmt)
-                if not converter:
-                    raise Exception(f"Converter missing for {source_fmt} -> {target_fmt}")
-
-                # Determine output path for this hop
-                if i == len(path) - 2:  # Last hop
-                    next_file = target_path
-                else:  # Intermediate hop
-                    if self.keep_intermediate:
-                        # Save in source directory with descriptive name
-                        next_file = source_path.parent / f"{source_path.stem}_intermediate.{target_fmt}"
-                    else:
-                        # Use temp file
-                        fd, temp_path = tempfile.mkstemp(suffix=f".{target_fmt}")
-                        os.close(fd)
-                        next_file = Path(temp_path)
-                    intermediate_files.append(next_file)
-
-                # Perform conversion
-                success = converter.convert(current_file, next_file, self.config.config)
-                if not success:
-                    raise Exception(f"Conversion failed: {source_fmt} -> {target_fmt}")
-
-                current_file = next_file
+            with _staged(target_path) as staged:
+                # Execute each hop in the path
+                for i in range(len(path) - 1):
+                    source_fmt = path[i]
+                    target_fmt = path[i + 1]
+
+                    # Get converter for this hop
+                    converter = self.registry.get_converter(source_fmt, target_fmt)
+                    if not converter:
+                        raise Exception(f"Converter missing for {source_fmt} -> {target_fmt}")
+
+                    # Determine output path for this hop
+                    if i == len(path) - 2:  # Last hop
+                        next_file = staged
+                    else:  # Intermediate hop
+                        if self.keep_intermediate:
+                            # Save in source directory with descriptive name
+                            next_file = source_path.parent / f"{source_path.stem}_intermediate.{target_fmt}"
+                        else:
+                            # Use temp file
+                            fd, temp_path = tempfile.mkstemp(suffix=f".{target_fmt}")
+                            os.close(fd)
+                            next_file = Path(temp_path)
+                        intermediate_files.append(next_file)
+
+                    # Perform conversion; a read range applies to the source only
+                    hop_config = self.config.config if i == 0 else _without_read_range(self.config.config)
+                    with collect_read_report() as hop_report:
+                        success = converter.convert(current_file, next_file, hop_config)
+                    if i == 0:
+                        report = hop_report
+                    if not success:
+                        raise Exception(f"Conversion failed: {source_fmt} -> {target_fmt}")
+
+                    current_file = next_file
+
+                os.replace(staged, target_path)
 
             # Clean up intermediate files if not keeping them
             if not self.keep_intermediate:
@@ -183,7 +213,10 @@ class ConversionEngine:
                 source_path=source_path,
                 target_path=target_path,
                 conversion_path=path,
-                hops=len(path) - 1
+                hops=len(path) - 1,
+                skipped_pages=report.skipped_pages or None,
+                blank_pages=report.blank_pages,
+                encoding=report.encoding
             )
 
         except Exception as e:
@@ -205,9 +238,15 @@ class ConversionEngine:
                 hops=len(path) - 1
             )
 
-    def _get_target_path(self, source_path: Path, target_format: str) -> Path:
+    def _get_target_path(
+        self,
+        source_path: Path,
+        target_format: str,
+        output_dir: Optional[Path] = None
+    ) -> Path:
         """Determine output file path based on config."""
-        output_dir = self.config.get('output.directory')
+        if output_dir is None:
+            output_dir = self.config.get('output.directory')
 
         if output_dir:
             output_dir = Path(output_dir)
@@ -221,3 +260,35 @@ class ConversionEngine:
         )
 
         return output_dir / filename
+
+
+@contextmanager
+def _staged(target_path: Path) -> Iterator[Path]:
+    """Path to write target_path's content to before moving it into place.
+
+    The staged file sits in a private directory next to the target, under
+    the target's own name, so a conversion that fails part way leaves no
+    truncated target behind. The directory is removed on exit. Missing
+    parent directories are created, and removed again if no target was
+    written.
+    """
+    created = [parent for parent in target_path.parents if not parent.exists()]
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix='.convertext-', dir=target_path.parent))
+    try:
+        yield staging / target_path.name
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if created and not target_path.exists():
+            for directory in created:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break  # Not empty: another conversion wrote to it
+
+
+def _without_read_range(config: dict) -> dict:
+    """Config for intermediate hops, which must read their input in full."""
+    documents = dict(config.get('documents', {}))
+    documents.pop('range', None)
+    return {**config, 'documents': documents}
@@ -0,0 +1,94 @@
+"""Recursive source discovery for batch conversions."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+
+def _matches(rel_path: str, name: str, patterns: Sequence[str]) -> bool:
+    """Check a path against lowercased glob patterns, ignoring case.
+
+    Patterns containing a slash match the path relative to the walk root,
+    others match the entry name only (so ``*.pdf`` works at any depth).
+    """
+    rel_path = rel_path.lower()
+    name = name.lower()
+    for pattern in patterns:
+        if '/' in pattern:
+            if fnmatchcase(rel_path, pattern):
+                return True
+        elif fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def _scan_dir(directory: str, rel_dir: str) -> Tuple[List[Tuple[str, str, str]], List[Tuple[str, str, str]]]:
+    """Scan one directory. Returns (files, subdirs) as (path, rel_path, name)."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    # Don't follow directory symlinks - avoids cycles in large trees
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.path, rel, entry.name))
+                    elif entry.is_file():
+                        files.append((entry.path, rel, entry.name))
+                except OSError:
+                    continue
+    except OSError:
+        pass  # Unreadable directory: skip it rather than abort the walk
+    return files, subdirs
+
+
+def discover_files(
+    root: Path,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    workers: int = 8,
+) -> Iterator[Path]:
+    """Walk a directory tree and yield matching files as they are found.
+
+    Directories are scanned with ``os.scandir`` on a thread pool so wide
+    trees are listed in parallel. Files are yielded as soon as their
+    directory has been scanned, so callers can start converting before
+    the walk finishes. Order is not deterministic. Patterns match
+    regardless of case, like the engine's handling of file extensions, so
+    ``*.pdf`` also finds ``BOOK.PDF``.
+
+    Args:
+        root: Directory to walk
+        include: Glob patterns a file must match (all files if empty)
+        exclude: Glob patterns for files and directories to skip
+        workers: Number of scanner threads
+
+    Yields:
+        Paths of matching files
+    """
+    root = Path(root)
+    include = [pattern.lower() for pattern in include]
+    exclude = [pattern.lower() for pattern in exclude]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pending = {pool.submit(_scan_dir, str(root), '')}
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+
+                for path, rel, name in subdirs:
+                    if exclude and _matches(rel, name, exclude):
+                        continue
+                    pending.add(pool.submit(_scan_dir, path, rel))
+
+                for path, rel, name in files:
+                    if exclude and _matches(rel, name, exclude):
+                        continue
+                    if include and not _matches(rel, name, include):
+                        continue
+                    yield Path(path)
@@ -1,7 +1,12 @@
 """Pytest configuration and fixtures."""
 
+import zipfile
+
 import pytest
 from pathlib import Path
+from reportlab.pdfgen import canvas
+
+from convertext.converters.base import Document
 
 
 @pytest.fixture
@@ -35,3 +40,91 @@ def sample_html(tmp_path):
 </body>
 </html>""")
     return html_file
+
+
+@pytest.fixture
+def make_book():
+    """Factory for a Document of level-1 chapters, each followed by paragraphs.
+
+    make_book(chapters=12, paragraphs=1, preface=None, heading='Chapter')
+    gives headings '<heading> 0', '<heading> 1', ... and paragraphs
+    'Paragraph <j> of chapter <i>, long enough to fill records.'; preface,
+    if given, is a paragraph before the first chapter.
+    """
+    def make(chapters=12, paragraphs=1, preface=None, heading='Chapter'):
+        doc = Document()
+        doc.metadata['title'] = 'Collected'
+        doc.metadata['author'] = 'A. Writer'
+        if preface:
+            doc.add_paragraph(preface)
+        for i in range(chapters):
+            doc.add_heading(f'{heading} {i}', 1)
+            for j in range(paragraphs):
+                doc.add_paragraph(f'Paragraph {j} of chapter {i}, long enough to fill records.')
+        return doc
+
+    return make
+
+
+@pytest.fixture
+def make_epub():
+    """Factory writing a hand-built EPUB archive.
+
+    make_epub(path, manifest, spine, files, metadata='<dc:title>T</dc:title>',
+    root='OEBPS'): manifest is the <item> elements, spine the itemref ids
+    and files maps member names (relative to root) to their contents.
+    """
+    def make(path, manifest, spine, files, metadata='<dc:title>T</dc:title>', root='OEBPS'):
+        with zipfile.ZipFile(path, 'w') as zf:
+            zf.writestr('mimetype', 'application/epub+zip')
+            zf.writestr('META-INF/container.xml', (
+                '<?xml version="1.0"?><container version="1.0" '
+                'xmlns="urn:oasis:names:tc:opendocument:xmlns:container"><rootfiles>'
+                f'<rootfile full-path="{root}/content.opf" media-type="application/oebps-package+xml"/>'
+                '</rootfiles></container>'))
+            zf.writestr(f'{root}/content.opf', (
+                '<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+                f'<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">{metadata}</metadata>'
+                f'<manifest>{manifest}</manifest>'
+                '<spine>' + ''.join(f'<itemref idref="{i}"/>' for i in spine) + '</spine></package>'))
+            for name, data in files.items():
+                zf.writestr(f'{root}/{name}', data)
+        return path
+
+    return make
+
+
+@pytest.fixture
+def sample_epub(tmp_path, make_epub):
+    """Create a one-chapter EPUB with a JPEG cover."""
+    return make_epub(
+        tmp_path / 'sample.epub',
+        '<item id="cover-img" href="cover.jpeg" media-type="image/jpeg"/>'
+        '<item id="c1" href="c1.xhtml" media-type="application/xhtml+xml"/>',
+        ['c1'],
+        {'cover.jpeg': b'\xff\xd8JPEGDATA', 'c1.xhtml': '<html><body><p>Hello</p></body></html>'},
+        metadata='<dc:title>T</dc:title><meta name="cover" content="cover-img"/>',
+    )
+
+
+@pytest.fixture
+def sample_pdf_book(tmp_path):
+    """Create a three-chapter PDF: 20pt bold chapter titles, 11pt body, one bold subheading each."""
+    path = tmp_path / 'book.pdf'
+    c = canvas.Canvas(str(path))
+    for chapter in range(1, 4):
+        c.setFont('Helvetica-Bold', 20)
+        c.drawString(72, 750, f'Chapter {chapter}')
+        c.setFont('Helvetica', 11)
+        y = 710
+        for i in range(20):
+            if i == 10:
+                c.setFont('Helvetica-Bold', 11)
+                c.drawString(72, y, 'A Bold Subheading')
+                c.setFont('Helvetica', 11)
+                y -= 14
+            c.drawString(72, y, f'Body text line {i} of chapter {chapter}, set in the regular font.')
+            y -= 14
+        c.showPage()
+    c.save()
+    return path
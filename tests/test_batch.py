@@ -0,0 +1,107 @@
+"""Tests for the pipelined batch mode."""
+
+import threading
+import time
+from pathlib import Path
+
+from convertext.batch import BatchPipeline, _atomic_move
+from convertext.config import Config
+from convertext.core import ConversionEngine
+from convertext.converters.loader import load_converters
+
+
+def test_pipeline_converts_all_jobs(tmp_path):
+    """Every job/format pair yields one result and lands in its output dir."""
+    load_converters()
+    out = tmp_path / "out"
+    sources = []
+    for i in range(5):
+        src = tmp_path / f"doc{i}.txt"
+        src.write_text(f"Document {i}\n\nBody text.")
+        sources.append(src)
+
+    pipeline = BatchPipeline(Config(), workers=2, prefetch=2, prefetch_bytes=16)
+    results = list(pipeline.run(((s, out) for s in sources), ['html', 'md']))
+
+    assert len(results) == 10
+    assert all(r.success for r in results)
+    for i in range(5):
+        assert f"Document {i}" in (out / f"doc{i}.html").read_text()
+        assert (out / f"doc{i}.md").exists()
+    assert {r.source_path for r in results} == set(sources)
+
+
+def test_pipeline_respects_existing_targets(tmp_path):
+    """Existing outputs are not overwritten without output.overwrite."""
+    load_converters()
+    src = tmp_path / "doc.txt"
+    src.write_text("Body")
+    (tmp_path / "doc.html").write_text("keep me")
+
+    results = list(BatchPipeline(Config(), workers=1).run([(src, None)], ['html']))
+
+    assert len(results) == 1
+    assert not results[0].success
+    assert "already exists" in results[0].error
+    assert (tmp_path / "doc.html").read_text() == "keep me"
+
+
+def test_atomic_move_replaces_target(tmp_path):
+    """Target is replaced in one step and the staged file is consumed."""
+    staged = tmp_path / "staged.txt"
+    staged.write_text("new")
+    target = tmp_path / "nested" / "target.txt"
+    target.parent.mkdir()
+    target.write_text("old")
+
+    _atomic_move(staged, target)
+
+    assert target.read_text() == "new"
+    assert not staged.exists()
+
+
+def test_pipeline_reports_format_of_unreadable_sources(tmp_path):
+    """A source that can't be read still fails once per requested format."""
+    load_converters()
+    missing = tmp_path / "gone.txt"
+
+    results = list(BatchPipeline(Config(), workers=1).run([(missing, None)], ['html', 'md']))
+
+    assert sorted(r.target_format for r in results) == ['html', 'md']
+    assert not any(r.success for r in results)
+
+
+def test_pipeline_converts_from_original_location(tmp_path, monkeypatch):
+    """Converters see the source where it is, so relative resources resolve."""
+    load_converters()
+    src = tmp_path / "doc.txt"
+    src.write_text("Body")
+    seen = []
+    convert = ConversionEngine.convert
+    monkeypatch.setattr(ConversionEngine, 'convert',
+                        lambda self, path, *args, **kwargs: seen.append(path) or convert(self, path, *args, **kwargs))
+
+    results = list(BatchPipeline(Config(), workers=1).run([(src, None)], ['html']))
+
+    assert results[0].success and results[0].target_path == tmp_path / "doc.html"
+    assert seen == [src]
+
+
+def test_pipeline_stops_when_consumer_stops(tmp_path):
+    """Closing the result iterator early releases every pipeline thread."""
+    load_converters()
+    sources = []
+    for i in range(20):
+        src = tmp_path / f"doc{i}.txt"
+        src.write_text("Body text. " * 50)
+        sources.append(src)
+
+    results = BatchPipeline(Config(), workers=1, prefetch=1, prefetch_bytes=1).run(
+        ((s, tmp_path / "out") for s in sources), ['html'])
+    assert next(results).success
+    results.close()
+
+    deadline = time.monotonic() + 5
+    while any(t.name.startswith('convertext-') for t in threading.enumerate()):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
@@ -0,0 +1,102 @@
+"""Tests for slotted Document content blocks."""
+
+import pytest
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import Heading, Paragraph, Run, Table
+
+
+def test_blocks_read_like_dicts():
+    """Blocks support the mapping access existing writers rely on."""
+    doc = Document()
+    doc.add_heading("Title", 2)
+    doc.add_paragraph("Body")
+
+    heading, para = doc.content
+    assert heading['type'] == 'heading'
+    assert heading['data'] == 'Title'
+    assert heading.get('level', 1) == 2
+    assert para['type'] == 'paragraph'
+    assert para.get('missing', 'x') == 'x'
+    with pytest.raises(KeyError):
+        para['level']
+
+
+def test_blocks_equal_dict_representation():
+    """Blocks compare equal to the dicts they replace, optional keys omitted."""
+    assert Paragraph("a") == {"type": "paragraph", "data": "a"}
+    assert Heading("h", 1) == {"type": "heading", "data": "h", "level": 1}
+    assert Run("r", bold=True) == {
+        "type": "run", "text": "r", "bold": True, "italic": False, "underline": False,
+    }
+    assert dict(Table([["1"]], headers=["A"])) == {"type": "table", "rows": [["1"]], "headers": ["A"]}
+
+
+def test_optional_run_fields():
+    """Unset optional run fields are absent from the mapping view."""
+    run = Run("r", color="#ff0000")
+    assert 'color' in run
+    assert 'font' not in run
+    assert run.get('size') is None
+    with pytest.raises(KeyError):
+        run['font']
+
+
+def test_blocks_are_slotted():
+    """Blocks carry no per-instance __dict__ and share interned type tags."""
+    a, b = Paragraph("a"), Paragraph("b")
+    assert not hasattr(a, '__dict__')
+    assert a.type is b.type
+
+
+def test_writers_use_attributes(tmp_path, monkeypatch):
+    """Writers read block attributes, not the mapping view."""
+    from convertext.converters.blocks import Block
+    from convertext.converters.mixins import HtmlWriterMixin, MarkdownWriterMixin, TextWriterMixin
+
+    class Writer(TextWriterMixin, HtmlWriterMixin, MarkdownWriterMixin):
+        pass
+
+    doc = Document()
+    doc.add_heading("Title", 1)
+    doc.add_paragraph("Body", [Run("Bo", bold=True), Run("dy")])
+    doc.add_text("Plain")
+    doc.add_table([["1", "2"]], headers=["A", "B"])
+    doc.add_list(["x", "y"], ordered=True)
+    doc.add_link("site", "https://example.com")
+
+    def mapping_access(self, key, *default):
+        raise AssertionError(f"mapping access to {key!r}")
+
+    monkeypatch.setattr(Block, '__getitem__', mapping_access)
+    monkeypatch.setattr(Block, 'get', mapping_access)
+    writer = Writer()
+    writer._write_txt(doc, tmp_path / 'out.txt')
+    writer._write_html(doc, tmp_path / 'out.html')
+    writer._write_md(doc, tmp_path / 'out.md')
+    assert '<p><strong>Bo</strong>dy</p>' in (tmp_path / 'out.html').read_text()
+    assert '| A | B |' in (tmp_path / 'out.md').read_text()
+
+
+def test_dict_blocks_are_converted(tmp_path):
+    """Dict blocks appended by external code still reach the writers."""
+    from convertext.converters.mixins import HtmlWriterMixin
+
+    doc = Document()
+    doc.add_paragraph("First")
+    doc.content.append({"type": "heading", "data": "Old", "level": 2})
+    doc.content.append({"type": "paragraph", "data": "Bold",
+                        "spans": [{"type": "run", "text": "Bold", "bold": True}]})
+    doc.content.append({"type": "custom", "data": "kept as is"})
+
+    assert [type(b) for b in doc.content[:3]] == [Paragraph, Heading, Paragraph]
+    assert doc.content[1] == Heading("Old", 2)
+    assert doc.content[2].spans == [Run("Bold", bold=True)]
+    assert doc.content[3] == {"type": "custom", "data": "kept as is"}
+
+    doc.content = [{"type": "table", "rows": [["1"]], "headers": ["A"]}]
+    assert isinstance(doc.content[0], Table)
+
+    doc.content = [{"type": "heading", "data": "Old", "level": 2}]
+    HtmlWriterMixin()._write_html(doc, tmp_path / 'out.html')
+    assert '<h2>Old</h2>' in (tmp_path / 'out.html').read_text()
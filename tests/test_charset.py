@@ -0,0 +1,47 @@
+"""Tests for text source encoding detection."""
+
+from convertext.config import Config
+from convertext.converters.charset import detect_bytes_encoding, detect_encoding
+from convertext.converters.loader import load_converters
+from convertext.core import ConversionEngine
+
+
+def test_detection_order():
+    """BOMs first, then UTF-16 NUL patterns, UTF-8 validity and single-byte fallbacks."""
+    text = 'Café “quoted” naïve'
+    assert detect_bytes_encoding(text.encode('utf-8-sig')) == 'utf-8-sig'
+    assert detect_bytes_encoding(text.encode('utf-16')) == 'utf-16'
+    assert detect_bytes_encoding(text.encode('utf-32')) == 'utf-32'
+    assert detect_bytes_encoding(text.encode('utf-16-be')) == 'utf-16-be'
+    assert detect_bytes_encoding(text.encode('utf-8')) == 'utf-8'
+    assert detect_bytes_encoding(b'plain ascii') == 'utf-8'
+    assert detect_bytes_encoding(text.encode('cp1252')) == 'cp1252'
+    assert detect_bytes_encoding(b'caf\xe9 \x81') == 'latin-1'
+    # A UTF-8 sequence cut off by the sample size is not an error
+    assert detect_bytes_encoding('aé'.encode('utf-8')[:2], complete=False) == 'utf-8'
+    assert detect_bytes_encoding('aé'.encode('utf-8')[:2]) == 'cp1252'
+
+
+def test_auto_encoding_conversion(tmp_path):
+    """encoding: auto reads each file in its own encoding and reports it."""
+    load_converters()
+    config = Config()
+    config.override({'documents': {'encoding': 'auto'}})
+    engine = ConversionEngine(config)
+
+    txt = tmp_path / 'notes.txt'
+    txt.write_bytes('Café “one”\n\nTwo'.encode('cp1252'))
+    html = tmp_path / 'page.html'
+    html.write_bytes('<html><body><p>Señor</p></body></html>'.encode('latin-1'))
+    assert detect_encoding(html, sample_size=8) == 'utf-8'
+
+    result = engine.convert(txt, 'html', output_dir=tmp_path)
+    assert result.success and result.encoding == 'cp1252'
+    assert '<p>Café “one”</p>' in result.target_path.read_text(encoding='utf-8')
+
+    result = engine.convert(html, 'md', output_dir=tmp_path)
+    assert result.success and result.encoding == 'cp1252'
+    assert 'Señor' in result.target_path.read_text(encoding='utf-8')
+
+    config.override({'documents': {'encoding': 'utf-8'}})
+    assert engine.convert(txt, 'md', output_dir=tmp_path).encoding is None
@@ -0,0 +1,73 @@
+"""Tests for recursive source discovery."""
+
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from convertext.cli import main
+from convertext.discovery import discover_files
+
+
+def _make_tree(root: Path):
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "skip").mkdir()
+    (root / "top.txt").write_text("top")
+    (root / "a" / "one.md").write_text("one")
+    (root / "a" / "b" / "two.txt").write_text("two")
+    (root / "a" / "b" / "data.bin").write_bytes(b"\x00")
+    (root / "skip" / "three.txt").write_text("three")
+
+
+def test_discover_all_files(tmp_path):
+    """Without patterns every file in the tree is found."""
+    _make_tree(tmp_path)
+    found = {p.relative_to(tmp_path).as_posix() for p in discover_files(tmp_path)}
+    assert found == {"top.txt", "a/one.md", "a/b/two.txt", "a/b/data.bin", "skip/three.txt"}
+
+
+def test_discover_include_exclude(tmp_path):
+    """Name patterns match at any depth; excluded directories are pruned."""
+    _make_tree(tmp_path)
+    found = {
+        p.relative_to(tmp_path).as_posix()
+        for p in discover_files(tmp_path, include=["*.txt", "*.md"], exclude=["skip"])
+    }
+    assert found == {"top.txt", "a/one.md", "a/b/two.txt"}
+
+
+def test_discover_relative_path_patterns(tmp_path):
+    """Patterns with a slash match the path relative to the root."""
+    _make_tree(tmp_path)
+    found = {
+        p.relative_to(tmp_path).as_posix()
+        for p in discover_files(tmp_path, include=["a/b/*"], workers=1)
+    }
+    assert found == {"a/b/two.txt", "a/b/data.bin"}
+
+
+def test_discover_ignores_case(tmp_path):
+    """Extension patterns find upper-case names, as the engine accepts them."""
+    _make_tree(tmp_path)
+    (tmp_path / "BOOK.PDF").write_bytes(b"%PDF")
+    (tmp_path / "Skip" / "x").mkdir(parents=True)
+    (tmp_path / "Skip" / "x" / "four.TXT").write_text("four")
+    found = {
+        p.relative_to(tmp_path).as_posix()
+        for p in discover_files(tmp_path, include=["*.pdf", "*.txt"], exclude=["skip"])
+    }
+    assert found == {"BOOK.PDF", "top.txt", "a/b/two.txt"}
+
+
+def test_mirrored_output_dirs_created_on_write(tmp_path):
+    """A mirrored output directory only appears once a target is written to it."""
+    src = tmp_path / "src"
+    (src / "ok").mkdir(parents=True)
+    (src / "bad").mkdir()
+    (src / "ok" / "GOOD.TXT").write_text("fine")
+    (src / "bad" / "broken.txt").write_bytes(b"one\n\n\xff\n")
+    out = tmp_path / "out"
+
+    result = CliRunner().invoke(main, ["-r", str(src), "-o", str(out), "-f", "html"])
+    assert result.exit_code == 0, result.output
+    assert "1 successful, 1 failed" in result.output
+    assert sorted(p.relative_to(out).as_posix() for p in out.rglob("*")) == ["ok", "ok/GOOD.html"]
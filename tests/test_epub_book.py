@@ -0,0 +1,71 @@
+"""Tests for the lazy EPUB book view."""
+
+import pytest
+
+from convertext.converters.ebooks import epub_book
+from convertext.converters.ebooks.epub import ToEpubConverter
+from convertext.converters.ebooks.epub_book import EpubBook
+
+
+def test_chapters_load_on_demand(tmp_path, monkeypatch, make_book):
+    """Opening reads only the package; chapters parse once while cached."""
+    path = tmp_path / 'book.epub'
+    ToEpubConverter()._create_epub(make_book(), path, {}, 'Collected')
+    parsed = []
+    parse = epub_book.parse_member
+    monkeypatch.setattr(epub_book, 'parse_member', lambda data: parsed.append(1) or parse(data))
+
+    with EpubBook(path, cache_size=2) as book:
+        assert book.metadata['title'] == 'Collected'
+        assert book.metadata['author'] == 'A. Writer'
+        assert len(book) == 12
+        assert parsed == []
+
+        assert book.chapter(5)[0]['data'] == 'Chapter 5'
+        assert book.chapter(-1)[0]['data'] == 'Chapter 11'
+        book.chapter(5)
+        assert len(parsed) == 2
+        book.chapter(0)           # evicts chapter 11, the least recently used
+        book.chapter(-1)
+        assert len(parsed) == 4
+        assert [c[0]['data'] for c in book.chapters(1, 3)] == ['Chapter 1', 'Chapter 2']
+        with pytest.raises(IndexError):
+            book.chapter(12)
+
+        toc = book.toc
+        assert [e['title'] for e in toc] == [f'Chapter {i}' for i in range(12)]
+        assert [e['chapter'] for e in toc] == list(range(12))
+        assert toc[0]['level'] == 1 and toc[3]['href'] == book.spine[3]
+
+
+def test_nav_toc_and_cover_image(tmp_path, make_epub):
+    """EPUB 3 nav documents give nested TOC levels; images are read by id."""
+    path = make_epub(
+        tmp_path / 'nav.epub',
+        '<item id="img" href="img/cover.png" media-type="image/png" properties="cover-image"/>'
+        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+        '<item id="c1" href="text/c1.xhtml" media-type="application/xhtml+xml"/>'
+        '<item id="c2" href="text/c2.xhtml" media-type="application/xhtml+xml"/>',
+        ['c1', 'c2'],
+        {
+            'nav.xhtml': (
+                '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops"><body>'
+                '<nav epub:type="toc"><ol><li><a href="text/c1.xhtml">One</a>'
+                '<ol><li><a href="text/c2.xhtml#s">One point one</a></li></ol></li></ol></nav>'
+                '</body></html>'),
+            'img/cover.png': b'PNGDATA',
+            'text/c1.xhtml': '<html><body><p>First</p></body></html>',
+            'text/c2.xhtml': '<html><body><p>Second</p></body></html>',
+        },
+        metadata='<dc:title>Nav</dc:title>',
+        root='OPS',
+    )
+
+    with EpubBook(path) as book:
+        assert book.cover == 'img'
+        assert book.image(book.cover) == b'PNGDATA'
+        assert book.toc == [
+            {'title': 'One', 'level': 1, 'href': 'OPS/text/c1.xhtml', 'chapter': 0},
+            {'title': 'One point one', 'level': 2, 'href': 'OPS/text/c2.xhtml#s', 'chapter': 1},
+        ]
+        assert book.chapter(1)[0]['data'] == 'Second'
@@ -0,0 +1,50 @@
+"""Tests for concurrent EPUB spine reading."""
+
+import zipfile
+
+import pytest
+
+from convertext.converters.ebooks import epub_spine
+from convertext.converters.ebooks.epub import EpubConverter, ToEpubConverter
+
+
+@pytest.fixture
+def anthology(tmp_path, make_book):
+    path = tmp_path / 'book.epub'
+    ToEpubConverter()._create_epub(make_book(chapters=30, paragraphs=5), path, {}, 'Anthology')
+    return path
+
+
+def test_parallel_read_keeps_spine_order(anthology):
+    """Threads and processes give the same blocks as the sequential read."""
+    path = anthology
+
+    reader = EpubConverter()
+    serial = reader._read_epub(path, {'epub': {'workers': 1}})
+    threads = reader._read_epub(path, {'epub': {'workers': 4}})
+    processes = reader._read_epub(path, {'epub': {'workers': 2, 'processes': 2}})
+    assert len(serial.content) == 30 * 6
+    assert [dict(b) for b in threads.content] == [dict(b) for b in serial.content]
+    assert [dict(b) for b in processes.content] == [dict(b) for b in serial.content]
+
+    with zipfile.ZipFile(path) as zf:
+        members = sorted(n for n in zf.namelist() if n.endswith('.xhtml') and 'chap' in n)
+    results = list(epub_spine.read_spine(path, members[:2] + ['missing.xhtml'] + members[2:4], workers=3))
+    assert results[2] is None
+    assert [r[0]['data'] for r in results if r] == ['Chapter 0', 'Chapter 1', 'Chapter 2', 'Chapter 3']
+
+
+def test_range_stops_parsing_early(anthology, monkeypatch):
+    """A block cap leaves most of the spine unparsed."""
+    path = anthology
+    parsed = []
+    parse = epub_spine.parse_member
+
+    def counting(data):
+        parsed.append(1)
+        return parse(data)
+
+    monkeypatch.setattr(epub_spine, 'parse_member', counting)
+    doc = EpubConverter()._read_epub(path, {'epub': {'workers': 2}, 'documents': {'range': 'blocks:10'}})
+    assert len(doc.content) >= 10
+    assert len(parsed) <= 2 + 2 * epub_spine._LOOKAHEAD
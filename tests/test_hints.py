@@ -0,0 +1,142 @@
+"""Tests for read hints from the target writer."""
+
+import zipfile
+
+import docx
+import pytest
+
+from convertext.converters.documents.docx import DocxConverter
+from convertext.converters.documents.odt import OdtConverter
+from convertext.converters.ebooks.azw3 import ToAzw3Converter
+from convertext.converters.ebooks.epub import EpubConverter
+from convertext.converters.hints import ReadHints
+
+ODT_CONTENT = (
+    '<office:document-content'
+    ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+    ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"'
+    ' xmlns:draw="urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"'
+    ' xmlns:xlink="http://www.w3.org/1999/xlink">'
+    '<office:body><office:text>'
+    '<text:p>Figure<draw:frame><draw:image xlink:href="Pictures/fig.png">'
+    '<office:binary-data>iVBORw0KGgo=</office:binary-data></draw:image></draw:frame></text:p>'
+    '</office:text></office:body></office:document-content>'
+)
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Names of the zip members inflated during the test."""
+    names = []
+    open_member = zipfile.ZipFile.open
+
+    def record(self, name, mode='r', *args, **kwargs):
+        if mode == 'r':
+            names.append(getattr(name, 'filename', name))
+        return open_member(self, name, mode, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile.ZipFile, 'open', record)
+    return names
+
+
+def test_epub_reads_what_the_writer_needs(sample_epub, tmp_path):
+    """Text targets skip the cover; metadata-only reads skip the spine; the cache keeps them apart."""
+    path = sample_epub
+    reader = EpubConverter()
+
+    full = reader._read_epub(path, {})
+    assert 'cover' in full.images and full.content[0]['data'] == 'Hello'
+
+    text = reader._read_epub(path, reader._hinted({}, 'txt'))
+    assert 'cover' not in text.images and text.content[0]['data'] == 'Hello'
+
+    meta = reader._read_epub(path, ReadHints(content=False).apply({}))
+    assert meta.metadata['title'] == 'T' and meta.content == []
+
+    cached = {'cache': {'directory': str(tmp_path / 'cache')}}
+    reader._read_cached(reader._read_epub, path, reader._hinted(cached, 'txt'))
+    assert 'cover' in reader._read_cached(reader._read_epub, path, cached).images
+
+
+def test_docx_text_targets_skip_formatting(tmp_path):
+    """Without styles the paragraph text is the same, minus the spans."""
+    path = tmp_path / 'in.docx'
+    document = docx.Document()
+    para = document.add_paragraph('Plain and ')
+    para.add_run('bold').bold = True
+    para.add_run('\tend')
+    document.save(str(path))
+
+    reader = DocxConverter()
+    styled = reader._read_docx(path, reader._hinted({}, 'html'))
+    plain = reader._read_docx(path, reader._hinted({}, 'txt'))
+    assert styled.content[0].spans
+    assert plain.content[0]['data'] == styled.content[0]['data'] == 'Plain and bold\tend'
+    assert 'spans' not in plain.content[0]
+
+    out = tmp_path / 'out.txt'
+    assert reader.convert(path, out, {})
+    assert 'Plain and bold\tend' in out.read_text()
+
+
+def test_docx_text_targets_strip_paragraphs(tmp_path):
+    """Text-only paragraphs are stripped like the rest of the reader's text."""
+    path = tmp_path / 'in.docx'
+    document = docx.Document()
+    document.add_paragraph('  padded ')
+    para = document.add_paragraph()
+    para.add_run('\t')
+    para.add_run('tabbed')
+    para.add_run().add_break()
+    document.add_paragraph(' ')
+    document.save(str(path))
+
+    reader = DocxConverter()
+    plain = reader._read_docx(path, reader._hinted({}, 'txt'))
+    assert [b['data'] for b in plain.content] == ['padded', 'tabbed']
+
+
+def test_epub_text_targets_skip_image_and_style_members(make_epub, tmp_path, opened):
+    """Only the container, the OPF and the spine are inflated for text; the cover for AZW3."""
+    path = make_epub(
+        tmp_path / 'styled.epub',
+        '<item id="cover-img" href="cover.jpeg" media-type="image/jpeg"/>'
+        '<item id="css" href="style.css" media-type="text/css"/>'
+        '<item id="c1" href="c1.xhtml" media-type="application/xhtml+xml"/>',
+        ['c1'],
+        {'cover.jpeg': b'\xff\xd8JPEGDATA', 'style.css': 'p { color: red }',
+         'c1.xhtml': '<html><body><p>Hello</p></body></html>'},
+        metadata='<dc:title>T</dc:title><meta name="cover" content="cover-img"/>',
+    )
+    assert EpubConverter().convert(path, tmp_path / 'out.txt', {})
+    assert set(opened) == {'META-INF/container.xml', 'OEBPS/content.opf', 'OEBPS/c1.xhtml'}
+
+    del opened[:]
+    assert ToAzw3Converter().convert(path, tmp_path / 'out.azw3', {})
+    assert 'OEBPS/cover.jpeg' in opened
+    assert 'OEBPS/style.css' not in opened
+
+
+def test_odt_text_targets_skip_image_and_style_members(tmp_path, opened):
+    """Text reads inflate only meta.xml and content.xml; pictures are referenced when hinted."""
+    path = tmp_path / 'in.odt'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        zf.writestr('meta.xml', '<office:document-meta'
+                    ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"/>')
+        zf.writestr('styles.xml', '<office:document-styles'
+                    ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"/>')
+        zf.writestr('content.xml', ODT_CONTENT)
+        zf.writestr('Pictures/fig.png', b'\x89PNG')
+
+    reader = OdtConverter()
+    assert reader.convert(path, tmp_path / 'out.txt', {})
+    assert sorted(opened) == ['content.xml', 'meta.xml']
+    assert (tmp_path / 'out.txt').read_text().strip() == 'Figure'
+
+    del opened[:]
+    doc = reader._read_odt(path, {})
+    assert [b['data'] for b in doc.content] == ['Figure']
+    assert 'Pictures/fig.png' in doc.images
+    assert 'Pictures/fig.png' not in opened
+    assert doc.images['Pictures/fig.png']['data'] == b'\x89PNG'
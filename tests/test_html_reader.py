@@ -0,0 +1,27 @@
+"""Tests for the shared lxml HTML reader."""
+
+from convertext.converters.html_reader import read_html
+
+
+def test_blocks_in_document_order_without_duplicates():
+    """Nested matches are read once; empty blocks are dropped; h1 backs up the title."""
+    html = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><head><title> </title></head><body>'
+        '<h1>Book</h1><div><p>One <em>two</em></p><p>  </p></div>'
+        '<ul><li><p>item a</p></li><li>item b</li></ul>'
+        '<table><thead><tr><th>H</th></tr></thead><tbody><tr><td>1</td></tr></tbody></table>'
+        '<h2></h2><p>end</p></body></html>'
+    )
+    plain = read_html(html)
+    assert plain.metadata['title'] == 'Book'
+    assert [(b['type'], b['data']) for b in plain.content] == [
+        ('heading', 'Book'), ('paragraph', 'One two'), ('paragraph', 'item a'), ('paragraph', 'end'),
+    ]
+
+    rich = read_html(html.encode('utf-8'), rich=True, title=False)
+    assert 'title' not in rich.metadata
+    assert [b['type'] for b in rich.content] == ['heading', 'paragraph', 'list', 'table', 'paragraph']
+    assert rich.content[2]['items'] == ['item a', 'item b']
+    assert rich.content[3]['headers'] == ['H']
+    assert rich.content[3]['rows'] == [['1']]
@@ -0,0 +1,102 @@
+"""Tests for the lazy Document image store."""
+
+import gc
+import weakref
+import zipfile
+
+import pytest
+
+from convertext.converters.base import Document
+from convertext.converters.ebooks.epub import EpubConverter
+from convertext.converters.images import BytesRef, ImageRef, ImageStore, ZipMemberRef
+
+
+def test_spills_over_memory_limit():
+    """Bytes beyond the memory limit go to the spill file and read back intact."""
+    store = ImageStore(memory_limit=10)
+    store.add_bytes('small', b'12345', 'png')
+    store.add_bytes('big', b'x' * 100, 'jpg')
+    store['dict'] = {'data': b'abcdef', 'format': 'gif'}
+
+    assert isinstance(store['small'], BytesRef)
+    assert not isinstance(store['big'], BytesRef)
+    assert store.memory_used == 5
+    assert store['big']['data'] == b'x' * 100
+    assert store['dict'] == {'data': b'abcdef', 'format': 'gif'}
+
+    del store['small']
+    assert store.memory_used == 0
+    store.close()
+    with pytest.raises(ValueError):
+        store['big']['data']
+
+
+def test_references_load_on_access(tmp_path):
+    """Zip references read nothing until data is requested."""
+    store = ImageStore()
+    store.add_zip_member('missing', tmp_path / 'nope.zip', 'a.png', 'png')
+    assert store['missing']['format'] == 'png'
+
+    doc = Document()
+    doc.add_image('inline', b'data', 'png')
+    assert doc.images['inline']['data'] == b'data'
+    assert doc.content[0]['name'] == 'inline'
+
+
+def test_zip_members_share_one_archive_handle(tmp_path, monkeypatch):
+    """Members of one archive are read through a single open ZipFile."""
+    archive = tmp_path / 'images.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('a.png', b'AAA')
+        zf.writestr('b.png', b'BBB')
+    opened = []
+    real = zipfile.ZipFile
+    monkeypatch.setattr(zipfile, 'ZipFile', lambda *args: opened.append(args) or real(*args))
+
+    store = ImageStore()
+    store.add_zip_member('a', archive, 'a.png', 'png')
+    store.add_zip_member('b', str(archive), 'b.png', 'png')
+    assert [store[name]['data'] for name in ('a', 'b', 'a')] == [b'AAA', b'BBB', b'AAA']
+    assert len(opened) == 1
+    store.close()
+    assert store['b']['data'] == b'BBB'
+
+    assert ZipMemberRef(archive, 'a.png', 'png')['data'] == b'AAA'
+    with pytest.raises(TypeError):
+        ImageRef('png')
+
+
+def test_store_released_with_document(tmp_path):
+    """Refs don't keep their store alive: dropping the Document frees its handles."""
+    archive = tmp_path / 'images.zip'
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('a.png', b'AAA')
+
+    gc.disable()
+    try:
+        doc = Document()
+        doc.images.memory_limit = 0
+        doc.add_image('spilled', b'BBB', 'png')
+        doc.images.add_zip_member('zipped', archive, 'a.png', 'png')
+        zipped, spilled = doc.images['zipped'], doc.images['spilled']
+        assert zipped['data'] == b'AAA' and spilled['data'] == b'BBB'
+        store = weakref.ref(doc.images)
+        handle = weakref.ref(doc.images._archives[archive])
+
+        del doc
+        assert store() is None and handle() is None
+    finally:
+        gc.enable()
+    assert zipped['data'] == b'AAA'
+    with pytest.raises(ValueError):
+        spilled['data']
+
+
+def test_epub_cover_is_referenced(sample_epub):
+    """The EPUB reader registers the cover as a zip member, not bytes."""
+    doc = EpubConverter()._read_epub(sample_epub, {})
+    cover = doc.images['cover']
+    assert isinstance(cover, ZipMemberRef)
+    assert cover['format'] == 'jpg'
+    assert cover['data'] == b'\xff\xd8JPEGDATA'
+    assert doc.images.memory_used == 0
@@ -0,0 +1,76 @@
+"""Tests for the direct Markdown reader."""
+
+import threading
+
+from convertext.converters.markdown_reader import iter_markdown, read_markdown
+
+SOURCE = '''# Title
+
+Some *text* &amp; <b>bold</b>.
+
+- a
+- b
+    - nested
+
+| H1 | H2 |
+|----|----|
+| 1  | 2  |
+
+[site](http://example.com)
+
+![cover](cover.png)
+
+<div><p>raw block</p></div>
+
+    code <x> & y
+'''
+
+
+def test_blocks_without_html_round_trip():
+    """Block tokens map to Document blocks; raw HTML goes through the HTML reader."""
+    rich = read_markdown(SOURCE, rich=True)
+    assert [b['type'] for b in rich.content] == [
+        'heading', 'paragraph', 'list', 'table', 'link', 'image', 'paragraph', 'paragraph',
+    ]
+    assert rich.content[1]['data'] == 'Some text & bold.'
+    assert rich.content[2]['items'] == ['a', 'b', 'nested']
+    assert rich.content[3]['headers'] == ['H1', 'H2']
+    assert rich.content[3]['rows'] == [['1', '2']]
+    assert (rich.content[4]['text'], rich.content[4]['url']) == ('site', 'http://example.com')
+    assert rich.content[5]['name'] == 'cover.png'
+    assert [b['data'] for b in rich.content[6:]] == ['raw block', 'code <x> & y']
+
+
+def test_plain_blocks_match_html_round_trip():
+    """Without rich, only paragraphs and headings, as the HTML round trip found them."""
+    plain = [(b['type'], b['data']) for b in iter_markdown(SOURCE)]
+    assert plain == [
+        ('heading', 'Title'),
+        ('paragraph', 'Some text & bold.'),
+        ('paragraph', '| H1 | H2 |\n|----|----|\n| 1  | 2  |'),
+        ('paragraph', 'site'),
+        ('paragraph', 'raw block'),
+    ]
+
+    nested = iter_markdown('#\n\n- loose\n\n- items\n\n> quoted\n')
+    assert [(b['type'], b['data']) for b in nested] == [
+        ('heading', ''), ('paragraph', 'loose'), ('paragraph', 'items'), ('paragraph', 'quoted'),
+    ]
+
+
+def test_engine_reuse_is_safe_across_readers_and_threads():
+    """Open block iterators do not share state through the reused engine."""
+    first = iter_markdown('# One\n\ntext one')
+    assert next(first)['data'] == 'One'
+    assert [b['data'] for b in iter_markdown('# Two')] == ['Two']
+    assert next(first)['data'] == 'text one'
+
+    results = []
+    threads = [threading.Thread(target=lambda i=i: results.append(
+        [b['data'] for b in iter_markdown(f'para {i}\n\n<p>raw {i}</p>')]
+    )) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results) == [[f'para {i}', f'raw {i}'] for i in range(4)]
@@ -0,0 +1,104 @@
+"""Tests for the lazy MOBI/AZW3 book view."""
+
+import pytest
+
+from convertext.converters.blocks import Paragraph
+from convertext.converters.ebooks import palmdoc
+from convertext.converters.ebooks.azw3 import Azw3Converter, ToAzw3Converter
+from convertext.converters.ebooks.mobi_book import Fragment, MobiBook, Part, _apply_toc, _rebuild
+
+
+def test_parts_load_on_demand(tmp_path, monkeypatch, make_book):
+    """Opening reads the indexes; a part decompresses only its own records."""
+    path = tmp_path / 'book.azw3'
+    doc = make_book(paragraphs=30)
+    ToAzw3Converter()._create_kf8(doc, path, 'Collected')
+    decoded = []
+    decompress = palmdoc.decompress
+    monkeypatch.setattr(palmdoc, 'decompress', lambda data: decoded.append(1) or decompress(data))
+
+    with MobiBook(path, cache_size=2) as book:
+        assert book.is_kf8
+        assert book.metadata == {'title': 'Collected', 'author': 'A. Writer'}
+        assert len(book) == 12
+        assert decoded == []
+
+        blocks = book.chapter(-1)
+        assert blocks[0]['data'] == 'Chapter 11'
+        assert blocks[-1]['data'] == 'Paragraph 29 of chapter 11, long enough to fill records.'
+        assert 0 < len(decoded) < book.text_record_count
+        count = len(decoded)
+        book.chapter(11)
+        assert len(decoded) == count
+        assert [c[0]['data'] for c in book.chapters(3, 5)] == ['Chapter 3', 'Chapter 4']
+        assert book.part(0).startswith(b'<?xml') and b'<h1>Chapter 0</h1>' in book.part(0)
+        with pytest.raises(IndexError):
+            book.chapter(12)
+
+        # Text that runs out before a part is an error, not a stale part
+        parts = book._parts
+        book._parts = lambda indices: parts(indices[:1])
+        with pytest.raises(ValueError, match='part 7'):
+            list(book.chapters(6, 8))
+        del book._parts
+
+        assert [(e['title'], e['level'], e['chapter']) for e in book.toc] == [
+            (f'Chapter {i}', 1, i) for i in range(12)
+        ]
+
+    read = Azw3Converter()._read_azw3(path, {})
+    assert [b['data'] for b in read.content] == [b['data'] for b in doc.content]
+    capped = Azw3Converter()._read_azw3(path, {'documents': {'range': 'headings:2'}})
+    assert len(capped.content) < len(read.content)
+
+
+def test_rebuild_and_toc_headings():
+    """Fragments go in at their insert position, or at the end of the body."""
+    skeleton = b'<html><body aid="0"></body></html>'
+    text = bytearray(skeleton + b'<p>a</p><p>b</p>')
+    inside = skeleton.index(b'</body>')
+    part = Part(0, len(skeleton), len(text), (Fragment(inside, 8), Fragment(inside + 8, 8)))
+    assert _rebuild(part, text, 0) == b'<html><body aid="0"><p>a</p><p>b</p></body></html>'
+
+    # Files from before FRAG keys were insert positions: key past the skeleton
+    part = Part(0, len(skeleton), len(text), (Fragment(len(skeleton), 16),))
+    assert _rebuild(part, text, 0) == b'<html><body aid="0"><p>a</p><p>b</p></body></html>'
+
+    blocks = [Paragraph('Intro'), Paragraph('The  Title'), Paragraph('Text')]
+    _apply_toc(blocks, [{'title': 'The Title', 'level': 2}])
+    assert [(b['type'], b['data']) for b in blocks][:2] == [('paragraph', 'Intro'), ('heading', 'The  Title')]
+    assert blocks[1]['level'] == 2
+
+    blocks = [Paragraph('Text')]
+    _apply_toc(blocks, [{'title': 'Untitled part', 'level': 1}])
+    assert (blocks[0]['type'], blocks[0]['data']) == ('heading', 'Untitled part')
+
+
+def test_broken_kf8_indexes_fall_back_to_text_stream(tmp_path, monkeypatch, make_book):
+    """Unreadable indexes or unreachable parts read the text records instead."""
+    path = tmp_path / 'book.azw3'
+    doc = make_book(paragraphs=3)
+    ToAzw3Converter()._create_kf8(doc, path, 'Collected')
+    expected = [b['data'] for b in doc.content]
+
+    # Overwrite the fragment index header's INDX magic
+    with MobiBook(path) as book:
+        frag = book._base + book._indexes['frag']
+    data = bytearray(path.read_bytes())
+    offset = int.from_bytes(data[78 + 8 * frag:82 + 8 * frag], 'big')
+    assert data[offset:offset + 4] == b'INDX'
+    data[offset:offset + 4] = b'XXXX'
+    broken = tmp_path / 'broken.azw3'
+    broken.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match='INDX'):
+        MobiBook(broken)
+    read = Azw3Converter()._read_azw3(broken, {})
+    assert read.metadata['title'] == 'Collected'
+    assert [b['data'] for b in read.content] == expected
+
+    # Text that runs out before the last parts
+    parts = MobiBook._parts
+    monkeypatch.setattr(MobiBook, '_parts', lambda self, indices: parts(self, indices[:2]))
+    read = Azw3Converter()._read_azw3(path, {})
+    assert [b['data'] for b in read.content] == expected
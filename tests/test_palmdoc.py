@@ -0,0 +1,55 @@
+"""Tests for PalmDOC decompression."""
+
+import random
+
+from convertext.converters.base import Document
+from convertext.converters.ebooks import palmdoc
+from convertext.converters.ebooks.azw3 import Azw3Converter, ToAzw3Converter, _palmdoc_compress
+from convertext.converters.ebooks.palmdoc import decompress, iter_text_records
+from convertext.converters.ebooks.pdb import PdbReader
+
+
+def test_decompress_tokens():
+    """Literals, literal runs, space pairs and (overlapping) back-references."""
+    data = (b'abc'                       # plain literals
+            + b'\x02\xe9\x80'            # two bytes copied as they are
+            + b'\xe1'                    # space + 'a'
+            + b'\x80\x2a'                # distance 5, length 5
+            + b'\x80\x0f'                # distance 1, length 10: repeats 'a'
+            + b'\x81\x00'                # distance 32 is before the start: dropped
+            + b'\x80')                   # back-reference cut off: dropped
+    assert decompress(data) == b'abc\xe9\x80 ac\xe9\x80 a' + b'a' * 10
+    assert decompress(memoryview(data)) == decompress(data)
+
+    # A count of 8 cut off by the end of the record copies the 3 bytes left
+    assert decompress(b'ab\x08\x01x\x80') == b'ab\x01x\x80'
+    assert decompress(b'ab\x02') == b'ab'
+
+    rng = random.Random(7)
+    words = [b'the', b'caf\xc3\xa9', b'<p>', b'</p>', b'\x00', b'aaaaaaaa', b'\xff\x01']
+    for _ in range(20):
+        text = b' '.join(rng.choice(words) for _ in range(rng.randrange(1, 800)))
+        assert decompress(_palmdoc_compress(text)) == text
+
+
+def test_records_decode_in_parallel(tmp_path, monkeypatch):
+    """Pool decoding yields the same text, in order, as decoding in-process."""
+    doc = Document()
+    for i in range(30):
+        doc.add_heading(f'Chapter {i}', 1)
+        doc.add_paragraph(' '.join(f'Word {j} of chapter {i}.' for j in range(60)))
+    path = tmp_path / 'book.azw3'
+    ToAzw3Converter()._create_kf8(doc, path, 'Book')
+
+    monkeypatch.setattr(palmdoc, '_MIN_PARALLEL_RECORDS', 2)
+    with PdbReader(path) as pdb:
+        count = int.from_bytes(pdb.record(0)[8:10], 'big')
+        flags = int.from_bytes(pdb.record(0)[240:244], 'big')
+        assert count > 4
+        serial = list(iter_text_records(pdb, range(1, count + 1), flags, workers=1))
+        parallel = list(iter_text_records(pdb, range(1, count + 1), flags, workers=2))
+        assert parallel == serial
+        assert b''.join(serial).startswith(b'<?xml')
+
+    content = Azw3Converter()._read_azw3(path, {'mobi': {'workers': 2}}).content
+    assert [b['data'] for b in content if b['type'] == 'heading'][-1] == 'Chapter 29'
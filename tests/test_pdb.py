@@ -0,0 +1,45 @@
+"""Tests for the memory-mapped PDB container reader."""
+
+import pytest
+
+from convertext.converters.ebooks.azw3 import ToAzw3Converter
+from convertext.converters.ebooks.pdb import PdbReader, strip_trailing_entries
+
+
+def test_records_are_views(tmp_path):
+    """Records are views of the map, bounded by the next record's offset."""
+    source = tmp_path / 'book.txt'
+    source.write_text('Title\n\nSome text.\n\nMore text.')
+    path = tmp_path / 'book.azw3'
+    ToAzw3Converter().convert(source, path, {})
+    data = path.read_bytes()
+
+    with PdbReader(path) as pdb:
+        assert (pdb.type, pdb.creator) == (b'BOOK', b'MOBI')
+        assert int.from_bytes(data[76:78], 'big') == len(pdb)
+        rec0 = pdb.record(0)
+        assert isinstance(rec0, memoryview)
+        start = int.from_bytes(data[78:82], 'big')
+        end = int.from_bytes(data[86:90], 'big')
+        assert rec0 == data[start:end]
+        assert rec0[16:20] == b'MOBI'
+        last = 78 + 8 * (len(pdb) - 1)
+        assert pdb.record(len(pdb) - 1) == data[int.from_bytes(data[last:last + 4], 'big'):]
+        assert len(list(pdb.records(range(len(pdb) - 1, len(pdb) + 3)))) == 1
+        with pytest.raises(IndexError):
+            pdb.record(len(pdb))
+        del rec0
+
+    with pytest.raises(ValueError):
+        PdbReader(source)
+
+
+def test_strip_trailing_entries():
+    """Varint-sized entries go first, highest bit first, then overlap bytes."""
+    # text, overlap (2 bytes + count), entry of 3 bytes, entry of 2 bytes
+    record = memoryview(b'text' + b'\xaa\x01' + b'xy\x83' + b'z\x82')
+    stripped = strip_trailing_entries(record, 0b111)
+    assert bytes(stripped) == b'text'
+    assert stripped.obj is record.obj
+    assert bytes(strip_trailing_entries(record, 0)) == bytes(record)
+    assert bytes(strip_trailing_entries(memoryview(b'\x85'), 0b10)) == b''
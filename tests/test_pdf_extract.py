@@ -0,0 +1,187 @@
+"""Tests for page-parallel PDF text extraction."""
+
+import threading
+import time
+
+import pypdf
+import pytest
+from pypdf.generic import DecodedStreamObject
+from reportlab.pdfgen import canvas
+
+from convertext.config import Config
+from convertext.converters.documents import pdf_extract
+from convertext.converters.documents.pdf import PDFConverter
+from convertext.converters.documents.pdf_extract import PdfTextExtractor
+from convertext.converters.loader import load_converters
+from convertext.core import ConversionEngine
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / 'pages.pdf'
+    c = canvas.Canvas(str(path))
+    for page in range(40):
+        c.drawString(72, 720, f'Page number {page}')
+        c.showPage()
+    c.save()
+    return path
+
+
+def test_parallel_matches_serial(sample_pdf):
+    """A process pool returns the same pages, in order, as serial extraction."""
+    with PdfTextExtractor(sample_pdf, workers=1) as extractor:
+        serial = list(extractor.pages())
+    with PdfTextExtractor(sample_pdf, workers=2) as extractor:
+        parallel = list(extractor.pages())
+        assert extractor.errors == {}
+    assert parallel == serial
+    assert serial[7].strip() == 'Page number 7'
+
+    doc = PDFConverter()._read_pdf(sample_pdf, {'pdf': {'workers': 2}})
+    assert [b['data'] for b in doc.content] == serial
+
+
+def test_pool_is_opt_in(sample_pdf, monkeypatch):
+    """Without a workers setting, even a large PDF is extracted in-process."""
+    def no_pool(*args, **kwargs):
+        raise AssertionError('process pool started')
+
+    monkeypatch.setattr(pdf_extract, 'ProcessPoolExecutor', no_pool)
+    with PdfTextExtractor.from_config(sample_pdf, Config().config) as extractor:
+        assert extractor.workers == 1
+        assert len(list(extractor.pages())) == 40
+
+
+def test_bad_pages_fall_back_or_are_skipped(sample_pdf, tmp_path, monkeypatch):
+    """Failing pages retry with the raw fallback; pages that fail that too are skipped and reported."""
+    extract = pypdf.PageObject.extract_text
+    fallback = pdf_extract._fallback_text
+
+    def flaky(page, *args, **kwargs):
+        text = extract(page, *args, **kwargs)
+        if text.strip().endswith((' 3', ' 5')):
+            raise KeyError('/Font')
+        if text.strip().endswith(' 7'):
+            time.sleep(2)
+        return text
+
+    def slow_fallback(page):
+        text = fallback(page)
+        if text.endswith(' 5'):
+            time.sleep(2)
+        return text
+
+    monkeypatch.setattr(pypdf.PageObject, 'extract_text', flaky)
+    monkeypatch.setattr(pdf_extract, '_fallback_text', slow_fallback)
+    with PdfTextExtractor(sample_pdf, workers=1, page_timeout=0.2) as extractor:
+        pages = list(extractor.pages())
+    assert pages[3] == 'Page number 3'
+    assert pages[7] == 'Page number 7'
+    assert pages[5] == ''
+    assert pages[4].strip() == 'Page number 4'
+    assert set(extractor.errors) == {5}
+    assert extractor.errors[5].startswith('timed out')
+
+    load_converters()
+    config = Config()
+    config.override({'pdf': {'workers': 1, 'page_timeout': 0.2}})
+    result = ConversionEngine(config).convert(sample_pdf, 'txt', output_dir=tmp_path)
+    assert result.success
+    assert result.skipped_pages == [6]
+    assert '[Page 6 skipped: timed out after 0.2s]' in result.target_path.read_text()
+
+
+def test_timeout_is_not_swallowed_by_nested_forms(sample_pdf, monkeypatch):
+    """A timeout inside a form XObject that pypdf guards with except Exception still fires."""
+    extract = pypdf.PageObject.extract_text
+
+    def nested_forms(page, *args, **kwargs):
+        text = extract(page, *args, **kwargs)
+        if text.strip().endswith(' 2'):
+            for _ in range(20):
+                # pypdf extracts each nested form inside try/except Exception
+                try:
+                    time.sleep(0.1)
+                except Exception:
+                    pass
+            return 'forms done'
+        return text
+
+    monkeypatch.setattr(pypdf.PageObject, 'extract_text', nested_forms)
+    start = time.perf_counter()
+    with PdfTextExtractor(sample_pdf, workers=1, page_timeout=0.2) as extractor:
+        pages = list(extractor.pages())
+    assert time.perf_counter() - start < 1.5
+    assert pages[2] == 'Page number 2'
+    assert extractor.errors == {}
+
+
+def test_timeout_holds_off_the_main_thread(tmp_path):
+    """Extraction on a worker thread still times out a pathological page."""
+    path = tmp_path / 'heavy.pdf'
+    c = canvas.Canvas(str(path))
+    for text in ('Page one', 'Heavy'):
+        c.drawString(72, 720, text)
+        c.showPage()
+    c.save()
+    writer = pypdf.PdfWriter(clone_from=pypdf.PdfReader(path))
+    heavy = DecodedStreamObject()
+    # Takes extract_text() several seconds; the regex fallback a fraction of one
+    heavy.set_data(b'BT /F1 12 Tf 72 720 Td ' + b'(x) Tj 1 0 Td ' * 150_000 + b'ET')
+    writer.pages[1].replace_contents(heavy)
+    writer.write(path)
+
+    result = {}
+
+    def extract():
+        start = time.perf_counter()
+        with PdfTextExtractor(path, workers=1, page_timeout=0.2) as extractor:
+            result['pages'] = list(extractor.pages())
+        result['elapsed'] = time.perf_counter() - start
+
+    thread = threading.Thread(target=extract)
+    thread.start()
+    thread.join(30)
+    assert result['pages'][0].strip() == 'Page one'
+    assert result['elapsed'] < 3
+
+
+def test_missing_timer_is_reported(monkeypatch):
+    """Without signal.setitimer the timeout can't be enforced, and says so."""
+    monkeypatch.delattr(pdf_extract.signal, 'setitimer')
+    with pytest.warns(RuntimeWarning, match='without one'):
+        assert pdf_extract._timeout_in_process(0.2)
+    assert pdf_extract._timeout_in_process(None)
+
+
+def test_pages_without_text_are_skipped_before_extraction(tmp_path, monkeypatch):
+    """Blank and graphics-only pages never reach extract_text and are counted."""
+    path = tmp_path / 'scanned.pdf'
+    c = canvas.Canvas(str(path))
+    c.drawString(72, 720, 'Text page')
+    c.showPage()
+    c.showPage()
+    c.rect(72, 72, 300, 500, fill=1)
+    c.showPage()
+    c.save()
+
+    extract = pypdf.PageObject.extract_text
+    calls = []
+
+    def counting(page, *args, **kwargs):
+        calls.append(page)
+        return extract(page, *args, **kwargs)
+
+    monkeypatch.setattr(pypdf.PageObject, 'extract_text', counting)
+    with PdfTextExtractor(path, workers=1) as extractor:
+        pages = list(extractor.pages())
+    assert [p.strip() for p in pages] == ['Text page', '', '']
+    assert extractor.blank == {1, 2}
+    assert extractor.errors == {}
+    assert len(calls) == 1
+
+    load_converters()
+    result = ConversionEngine(Config()).convert(path, 'txt', output_dir=tmp_path)
+    assert result.success
+    assert result.blank_pages == 2
+    assert result.skipped_pages is None
@@ -0,0 +1,39 @@
+"""Tests for font-statistics heading detection in the PDF readers."""
+
+import zipfile
+
+from convertext.converters.documents.pdf import PDFConverter
+from convertext.converters.documents.pdf_to_epub import PdfToEpubConverter
+
+
+def test_headings_from_font_sizes(sample_pdf_book):
+    """Large rare sizes become level 1, bold body-size lines the next level."""
+    path = sample_pdf_book
+
+    doc = PDFConverter()._read_pdf(path, {'pdf': {'workers': 1}})
+    headings = [(b['data'], b['level']) for b in doc.content if b['type'] == 'heading']
+    assert headings == [
+        ('Chapter 1', 1), ('A Bold Subheading', 2),
+        ('Chapter 2', 1), ('A Bold Subheading', 2),
+        ('Chapter 3', 1), ('A Bold Subheading', 2),
+    ]
+    assert [s.title for s in doc.sections] == ['Chapter 1', 'Chapter 2', 'Chapter 3']
+
+    plain = PDFConverter()._read_pdf(path, {'pdf': {'workers': 1, 'detect_headings': False}})
+    assert all(b['type'] == 'paragraph' for b in plain.content)
+
+
+def test_pdf_to_epub_is_chapterized(sample_pdf_book, tmp_path):
+    """Each detected level-1 heading starts an EPUB chapter with a TOC entry."""
+    path = sample_pdf_book
+    out = tmp_path / 'book.epub'
+    assert PdfToEpubConverter().convert(path, out, {'pdf': {'workers': 1}})
+
+    with zipfile.ZipFile(out) as zf:
+        chapters = sorted(n for n in zf.namelist() if n.startswith('OEBPS/chapter_'))
+        ncx = zf.read('OEBPS/toc.ncx').decode()
+        second = zf.read(chapters[1]).decode()
+    assert len(chapters) == 3
+    assert '<text>Chapter 3</text>' in ncx
+    assert '<h1>Chapter 2</h1>' in second
+    assert '<h2>A Bold Subheading</h2>' in second
@@ -0,0 +1,45 @@
+"""Tests for PDF line-to-paragraph reflow."""
+
+from convertext.converters.documents.pdf_reflow import Reflow
+
+
+def test_reflow_joins_lines_and_dehyphenates():
+    """Wrapped lines join, headings and short sentence ends split, hyphens rejoin."""
+    page = (
+        "Chapter One\n"
+        "It was a dark and stormy night; the rain fell in\n"
+        "torrents, except at occasional intervals, when it was\n"
+        "checked by a violent gust of wind which swept up the\n"
+        "streets.\n"
+        "  The lamps, strug-\n"
+        "gling against the darkness, flickered on and on and\n"
+        "went out.\n"
+    )
+    assert Reflow().feed(page) == [
+        'Chapter One',
+        'It was a dark and stormy night; the rain fell in torrents, except at '
+        'occasional intervals, when it was checked by a violent gust of wind '
+        'which swept up the streets.',
+        'The lamps, struggling against the darkness, flickered on and on and went out.',
+    ]
+
+
+def test_reflow_continues_paragraphs_across_pages():
+    """A paragraph cut by a page break is held back and completed on the next page."""
+    reflow = Reflow()
+    first = reflow.feed(
+        "A first short paragraph.\n"
+        "Then one that runs on and on past the bottom of the\n"
+        "page, line after line after line of it, and longer\n"
+        "than any reader would like, but still without an end\n"
+        "and keeps going onto the page that follows it, un-\n"
+    )
+    second = reflow.feed("til it finally stops.\nNew Section\n")
+    assert first == ["A first short paragraph."]
+    assert second == [
+        'Then one that runs on and on past the bottom of the page, line after line '
+        'after line of it, and longer than any reader would like, but still without '
+        'an end and keeps going onto the page that follows it, until it finally stops.',
+        'New Section',
+    ]
+    assert reflow.flush() == []
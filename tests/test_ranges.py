@@ -0,0 +1,103 @@
+"""Tests for partial reads (--range / documents.range)."""
+
+import pypdf
+import pytest
+from reportlab.pdfgen import canvas
+
+from convertext.converters.base import Document
+from convertext.converters.documents.pdf import PDFConverter
+from convertext.converters.documents.txt import TxtConverter
+from convertext.converters.ebooks.azw3 import Azw3Converter, ToAzw3Converter
+from convertext.converters.ebooks.fb2 import FB2Converter
+from convertext.converters.ranges import ReadRange
+
+
+def _range(spec, **pdf):
+    return {'documents': {'range': spec}, 'pdf': pdf}
+
+
+def test_parse_specs():
+    """Unit ranges are 1-based and inclusive; caps combine with commas."""
+    rng = ReadRange.parse('3-5, blocks:10')
+    assert (rng.start, rng.stop, rng.blocks, rng.headings) == (2, 5, 10, None)
+    assert list(ReadRange.parse('7').units(20)) == [6]
+    assert list(ReadRange.parse('18-').units(20)) == [17, 18, 19]
+    assert list(ReadRange.parse('-2').units(20)) == [0, 1]
+    assert ReadRange.parse('headings:2').headings == 2
+    for bad in ('0-3', '5-2', 'pages:3', 'blocks:x', '-', 'a-b'):
+        with pytest.raises(ValueError):
+            ReadRange.parse(bad)
+
+    doc = Document()
+    for i in range(3):
+        doc.add_heading(f'H{i}', 1)
+        doc.add_paragraph('text')
+    ReadRange.parse('headings:2').trim(doc.content)
+    assert [b['data'] for b in doc.content] == ['H0', 'text', 'H1', 'text']
+
+
+def test_pdf_reads_only_the_range(tmp_path, monkeypatch):
+    """PDF page ranges and block caps stop extraction early."""
+    path = tmp_path / 'book.pdf'
+    c = canvas.Canvas(str(path))
+    for page in range(10):
+        c.drawString(72, 720, f'Page {page}')
+        c.showPage()
+    c.save()
+
+    calls = []
+    extract = pypdf.PageObject.extract_text
+    monkeypatch.setattr(pypdf.PageObject, 'extract_text',
+                        lambda page, *a, **kw: calls.append(1) or extract(page, *a, **kw))
+
+    doc = PDFConverter()._read_pdf(path, _range('3-5', workers=1))
+    assert [b['data'].strip() for b in doc.content] == ['Page 2', 'Page 3', 'Page 4']
+    assert len(calls) == 3
+
+    calls.clear()
+    out = tmp_path / 'out.txt'
+    PDFConverter().convert(path, out, _range('blocks:2', workers=1))
+    assert len(calls) == 2
+    assert out.read_text().split() == ['Page', '0', 'Page', '1']
+
+
+def test_streamed_and_record_readers_stop_early(tmp_path):
+    """TXT streams stop pulling; KF8 reads only the selected text records."""
+    source = tmp_path / 'in.txt'
+    source.write_text('\n\n'.join(f'Paragraph {i}. ' + 'filler text ' * 40 for i in range(200)))
+    out = tmp_path / 'out.txt'
+    TxtConverter().convert(source, out, _range('2-3'))
+    assert out.read_text().split('\n\n')[0].startswith('Paragraph 1.')
+    assert 'Paragraph 3.' not in out.read_text()
+
+    book = tmp_path / 'book.azw3'
+    ToAzw3Converter().convert(source, book, {})
+    full = Azw3Converter()._read_azw3(book, {})
+    first = Azw3Converter()._read_azw3(book, _range('1'))
+    assert 0 < len(first.content) < len(full.content)
+    assert first.content[0] == full.content[0]
+
+
+def test_fb2_sections(tmp_path):
+    """FB2 units are top-level body sections."""
+    path = tmp_path / 'book.fb2'
+    sections = ''.join(
+        f'<section><title><p>Chapter {i}</p></title><p>Body {i}</p></section>' for i in range(4)
+    )
+    path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<FictionBook xmlns="http://www.gribuser.ru/xml/fictionbook/2.0">'
+        '<description><title-info><book-title>Book</book-title></title-info></description>'
+        f'<body>{sections}</body></FictionBook>'
+    )
+    doc = FB2Converter()._read_fb2(path, _range('2-3'))
+    assert doc.metadata['title'] == 'Book'
+    assert [b['data'] for b in doc.content] == ['Chapter 1', 'Body 1', 'Chapter 2', 'Body 2']
+
+    # The reader stops after the section that completes the cap; convert trims
+    doc = FB2Converter()._read_fb2(path, _range('headings:1'))
+    assert len(doc.content) == 4
+    out = tmp_path / 'out.md'
+    FB2Converter().convert(path, out, _range('headings:1'))
+    assert 'Body 0' in out.read_text()
+    assert 'Chapter 1' not in out.read_text()
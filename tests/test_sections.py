@@ -0,0 +1,62 @@
+"""Tests for the Document section index and the writers built on it."""
+
+import zipfile
+
+import pytest
+
+from convertext.converters.base import StreamingDocument
+from convertext.converters.blocks import Section
+from convertext.converters.ebooks.azw3 import _build_kf8_content
+from convertext.converters.ebooks.epub import ToEpubConverter
+from convertext.converters.ebooks.mobi import _doc_to_html
+
+
+@pytest.fixture
+def book(make_book):
+    """Front matter, then two chapters; the second holds a subheading and a list."""
+    doc = make_book(chapters=2, preface='Preface', heading='Part')
+    doc.add_heading('Sub', 2)
+    doc.add_list(['x', 'yz'])
+    return doc
+
+
+def test_index_grows_with_content(book):
+    """Sections split at level-1 headings and extend as blocks are appended."""
+    doc = book
+    assert doc.sections == [
+        Section(0, 1, 0, None, 7),
+        Section(1, 3, 1, 'Part 0', 60),
+        Section(3, 7, 1, 'Part 1', 66),
+    ]
+    doc.add_paragraph('more')
+    assert doc.sections[-1].end == 8
+    assert doc.sections[-1].size == 70
+
+    doc.content = doc.content[1:]
+    assert [s.title for s in doc.sections] == ['Part 0', 'Part 1']
+
+    with pytest.raises(TypeError):
+        StreamingDocument(lambda d: iter(())).sections
+
+
+def test_writers_agree_on_chapters(tmp_path, book):
+    """EPUB, KF8 and MOBI split and title the same chapters, front matter included."""
+    doc = book
+    path = tmp_path / 'out.epub'
+    ToEpubConverter()._create_epub(doc, path, {}, 'Book')
+    with zipfile.ZipFile(path) as zf:
+        chapters = sorted(n for n in zf.namelist() if n.startswith('OEBPS/chap_'))
+        ncx = zf.read('OEBPS/toc.ncx').decode()
+        assert 'Preface' in zf.read(chapters[0]).decode()
+    assert len(chapters) == 3
+    assert ncx.index('Chapter 1') < ncx.index('Part 0') < ncx.index('Part 1')
+
+    text, chunks, toc = _build_kf8_content(doc, 'Book')
+    assert len(chunks) == 3
+    assert [(e['label'], e['offset']) for e in toc] == [
+        ('Part 0', chunks[1].pre_start), ('Part 1', chunks[2].pre_start),
+    ]
+
+    html, toc = _doc_to_html(doc)
+    assert [e['label'] for e in toc] == ['Part 0', 'Part 1']
+    assert html.count('<mbp:pagebreak/>') == 1
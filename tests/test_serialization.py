@@ -0,0 +1,102 @@
+"""Tests for binary Document serialization and the parsed-document cache."""
+
+import io
+
+import pytest
+
+from convertext.converters.base import Document
+from convertext.converters.documents.txt import TxtConverter
+from convertext.converters.serialization import FORMAT_VERSION, MAGIC, dump, dumps, load, loads
+
+
+def _sample_doc():
+    doc = Document()
+    doc.metadata = {'title': 'Book', 'pages': 3, 'ratio': 0.5, 'tags': ['a', None, True]}
+    doc.toc = [{'title': 'One', 'level': 1}]
+    doc.add_heading('Chapter', 1)
+    doc.add_paragraph('Text with ünïcode ✓')
+    doc.add_text('styled', 'quote')
+    doc.add_run('run', bold=True, color='#ff0000', font_size=12)
+    doc.add_table([['1', '2']], headers=['A', 'B'])
+    doc.add_table([['x']])
+    doc.add_list(['i', 'ii'], ordered=True)
+    doc.add_link('site', 'https://example.com')
+    doc.add_image('cover', b'\x89PNG data', 'png')
+    doc.images['cover-copy'] = {'data': b'\x89PNG data', 'format': 'png'}
+    return doc
+
+
+def test_roundtrip_preserves_document():
+    """Every block type, metadata value and image survives a roundtrip."""
+    doc = _sample_doc()
+    restored = loads(dumps(doc))
+
+    assert restored.metadata == doc.metadata
+    assert restored.toc == doc.toc
+    assert restored.images == doc.images
+    assert [type(b) for b in restored.content] == [type(b) for b in doc.content]
+    assert [dict(b) for b in restored.content] == [dict(b) for b in doc.content]
+
+
+def test_file_roundtrip_and_shared_storage():
+    """dump/load work on file objects; repeated strings and images are stored once."""
+    doc = _sample_doc()
+    buf = io.BytesIO()
+    dump(doc, buf)
+    buf.seek(0)
+    assert load(buf).images['cover-copy']['data'] == b'\x89PNG data'
+
+    data = dumps(doc)
+    assert data.startswith(MAGIC)
+    assert data.count(b'\x89PNG data') == 1
+
+    doc.add_paragraph('Text with ünïcode ✓')
+    assert len(dumps(doc)) < len(data) + 16
+
+
+def test_rejects_bad_input():
+    """Foreign, truncated and future-version data raise ValueError."""
+    data = dumps(_sample_doc())
+    with pytest.raises(ValueError):
+        loads(b'PK\x03\x04 not a document')
+    with pytest.raises(ValueError):
+        loads(data[:len(data) // 2])
+    with pytest.raises(ValueError, match='newer'):
+        loads(MAGIC + bytes([99]) + data[len(MAGIC) + 1:])
+    with pytest.raises(ValueError, match='no longer supported'):
+        loads(MAGIC + bytes([FORMAT_VERSION - 1]) + data[len(MAGIC) + 1:])
+
+    # Crafted values: an empty string table, then metadata
+    header = MAGIC + bytes([FORMAT_VERSION]) + b'\0' * 4 + b'\0' * 8
+    list_tag, dict_tag = 7, 8
+    count = (1).to_bytes(4, 'little')
+    with pytest.raises(ValueError, match='unhashable'):
+        loads(header + bytes([dict_tag]) + count + bytes([list_tag]) + b'\0' * 4 + b'\0')
+    with pytest.raises(ValueError, match='Corrupt'):
+        loads(header + (bytes([list_tag]) + count) * 100000)
+    with pytest.raises(TypeError):
+        doc = Document()
+        doc.metadata['when'] = object()
+        dumps(doc)
+
+
+def test_read_cached_reuses_parse(tmp_path):
+    """With cache.directory set, a source is parsed once and then reloaded."""
+    source = tmp_path / 'in.txt'
+    source.write_text('one\n\ntwo')
+    config = {'cache': {'directory': str(tmp_path / 'cache')}}
+    converter = TxtConverter()
+    calls = []
+
+    def read(path, cfg):
+        calls.append(path)
+        return converter._read_txt(path, cfg)
+
+    first = converter._read_cached(read, source, config)
+    second = converter._read_cached(read, source, config)
+    assert len(calls) == 1
+    assert [b['data'] for b in second.content] == [b['data'] for b in first.content] == ['one', 'two']
+
+    source.write_text('changed')
+    assert [b['data'] for b in converter._read_cached(read, source, config).content] == ['changed']
+    assert len(calls) == 2
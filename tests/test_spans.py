@@ -0,0 +1,53 @@
+"""Tests for coalescing formatted runs into paragraph spans."""
+
+import docx
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import Paragraph, Run, merge_runs
+from convertext.converters.documents.docx import DocxConverter
+from convertext.converters.mixins import HtmlWriterMixin
+from convertext.converters.serialization import dumps, loads
+
+
+def test_merge_runs_coalesces_equal_formatting():
+    """Adjacent equal runs merge, empty runs vanish, the ends are stripped."""
+    runs = [Run(' Hel', bold=True), Run('lo', bold=True), Run(''), Run(' world '), Run('  ')]
+    spans = merge_runs(runs)
+    assert [(s.text, s.bold) for s in spans] == [('Hello', True), (' world', False)]
+
+
+def test_docx_paragraph_keeps_one_block(tmp_path):
+    """A paragraph split into many runs reads as one block with merged spans."""
+    d = docx.Document()
+    p = d.add_paragraph()
+    for part in ('Mixed ', 'plain ', 'text '):
+        p.add_run(part)
+    p.add_run('bold').bold = True
+    p.add_run(' end')
+    d.add_paragraph().add_run('only plain')
+    path = tmp_path / 'in.docx'
+    d.save(path)
+
+    doc = DocxConverter()._read_docx(path, {})
+    first, second = doc.content
+    assert isinstance(first, Paragraph)
+    assert first['data'] == 'Mixed plain text bold end'
+    assert [(s.text, s.bold) for s in first['spans']] == [
+        ('Mixed plain text ', False), ('bold', True), (' end', False),
+    ]
+    assert dict(second) == {'type': 'paragraph', 'data': 'only plain'}
+
+
+def test_html_writer_renders_spans_in_one_paragraph(tmp_path):
+    """Spans render inline inside a single <p>; nested blocks serialize."""
+    doc = Document()
+    doc.add_paragraph('a <b> c', [Run('a '), Run('<b>', bold=True), Run(' c', color='#ff0000')])
+    out = tmp_path / 'out.html'
+    HtmlWriterMixin()._write_html(doc, out)
+    assert (
+        '<p>a <strong>&lt;b&gt;</strong><span style="color: #ff0000"> c</span></p>'
+        in out.read_text()
+    )
+
+    restored = loads(dumps(doc)).content[0]
+    assert [dict(s) for s in restored['spans']] == [dict(s) for s in doc.content[0]['spans']]
@@ -0,0 +1,204 @@
+"""Tests for streaming Document readers and writers."""
+
+import tracemalloc
+from types import SimpleNamespace
+
+from lxml import etree
+
+from convertext.config import Config
+from convertext.converters import txt_reader
+from convertext.converters.base import Document, StreamingDocument
+from convertext.converters.blocks import Paragraph
+from convertext.converters.documents import html as html_converter
+from convertext.converters.documents import markdown as markdown_converter
+from convertext.converters.documents.html import HtmlConverter
+from convertext.converters.documents.markdown import MarkdownConverter, _markdown_chunks
+from convertext.converters.documents.txt import TxtConverter
+from convertext.converters.ebooks.epub import ToEpubConverter
+from convertext.converters.loader import load_converters
+from convertext.converters.txt_reader import read_txt
+from convertext.core import ConversionEngine
+
+
+def test_streaming_document_metadata_first():
+    """Metadata set by the reader is available before content is consumed."""
+    consumed = []
+
+    def reader(doc):
+        doc.metadata['title'] = 'Streamed'
+        for i in range(3):
+            consumed.append(i)
+            yield Paragraph(f'p{i}')
+
+    doc = StreamingDocument(reader)
+    assert doc.metadata['title'] == 'Streamed'
+    assert consumed == [0]
+
+    buffered = doc.materialize()
+    assert type(buffered) is Document
+    assert [b['data'] for b in buffered.content] == ['p0', 'p1', 'p2']
+    assert buffered.metadata['title'] == 'Streamed'
+
+
+def test_buffer_for_declared_formats():
+    """Two-pass writers get a fully loaded Document."""
+    doc = StreamingDocument(lambda d: iter([Paragraph('x')]))
+    buffered = ToEpubConverter()._buffer_for(doc, 'epub')
+    assert isinstance(buffered.content, list)
+    assert TxtConverter()._buffer_for(doc, 'txt') is doc
+
+
+def test_txt_reader_paragraph_split(tmp_path):
+    """Line-based reader splits paragraphs exactly like split('\\n\\n')."""
+    text = '\n\nfirst\nline\n\n\nsecond\n  \nstill second\n\n\n\nthird'
+    source = tmp_path / 'in.txt'
+    source.write_text(text)
+
+    doc = TxtConverter()._read_txt(source, {})
+    expected = [p.strip() for p in text.split('\n\n') if p.strip()]
+    assert [b['data'] for b in doc.content] == expected
+
+
+def test_txt_reader_caps_paragraphs_at_line_breaks(tmp_path, monkeypatch):
+    """A file without blank lines is cut into line-aligned paragraphs."""
+    monkeypatch.setattr(txt_reader, '_MAX_PARAGRAPH', 1000)
+    lines = [f'line {i} of a file with no blank lines' for i in range(2000)]
+    for encoding in ('utf-8', 'utf-16'):
+        source = tmp_path / f'long-{encoding}.txt'
+        source.write_text('\n'.join(lines) + '\n', encoding=encoding)
+        paras = list(txt_reader.iter_paragraphs(source, encoding))
+        assert len(paras) > 50
+        assert all(len(p) <= 1100 for p in paras)
+        assert '\n'.join(paras).split('\n') == lines
+
+
+def test_txt_reader_encodings_and_header(tmp_path):
+    """CRLF files, non-ASCII-compatible encodings and the ebook title header."""
+    text = 'Title\n=====\nBy: Someone\n\nfirst é\nline\n\nsecond\n'
+    crlf = tmp_path / 'crlf.txt'
+    crlf.write_bytes(text.replace('\n', '\r\n').encode('utf-8'))
+    wide = tmp_path / 'wide.txt'
+    wide.write_text(text, encoding='utf-16')
+
+    for path, encoding in [(crlf, 'utf-8'), (wide, 'utf-16')]:
+        doc = read_txt(path, encoding, header=True)
+        assert doc.metadata == {'title': 'Title', 'author': 'Someone'}
+        assert [b['data'] for b in doc.content] == ['first é\nline', 'second']
+
+    assert read_txt(crlf).content[0]['data'] == 'Title\n=====\nBy: Someone'
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert read_txt(empty, header=True).content == []
+
+
+def test_txt_conversion_constant_memory(tmp_path):
+    """Converting a large text file does not hold it in memory."""
+    source = tmp_path / 'big.txt'
+    para = 'lorem ipsum dolor sit amet ' * 20
+    with open(source, 'w') as f:
+        for i in range(4000):
+            f.write(f'{i} {para}\n\n')
+    size = source.stat().st_size
+
+    tracemalloc.start()
+    try:
+        assert TxtConverter().convert(source, tmp_path / 'big.html', {})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < size / 4
+    assert (tmp_path / 'big.html').read_text().count('<p>') == 4000
+
+
+def test_failed_streaming_conversion_leaves_no_target(tmp_path):
+    """A decode error part way through leaves neither a target nor staging files."""
+    load_converters()
+    source = tmp_path / 'a.txt'
+    source.write_bytes(b'one\n\ntwo\n\nthr\xffee\n\n' + b'more text\n\n' * 20000)
+    engine = ConversionEngine(Config())
+
+    result = engine.convert(source, 'html', output_dir=tmp_path)
+    assert not result.success
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['a.txt']
+
+    source.write_bytes(b'one\n\ntwo\n\nthree\n\n')
+    result = engine.convert(source, 'html', output_dir=tmp_path)
+    assert result.success
+    assert '<p>three</p>' in result.target_path.read_text()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['a.html', 'a.txt']
+
+
+def test_html_title_falls_back_to_later_h1(tmp_path):
+    """A streamed HTML file still takes its title from a later <h1>."""
+    source = tmp_path / 'in.html'
+    source.write_text('<html><body><p>Intro</p><h1>Real Title</h1><p>Body</p></body></html>')
+
+    output = tmp_path / 'out.md'
+    assert HtmlConverter().convert(source, output, {})
+    assert output.read_text().startswith('# Real Title\n\nIntro\n\n')
+
+    source.write_bytes('<html><body><p>Señor</p><h1>Año</h1></body></html>'.encode('latin-1'))
+    assert HtmlConverter().convert(source, output, {'documents': {'encoding': 'latin-1'}})
+    assert output.read_text().startswith('# Año\n\nSeñor\n\n')
+
+
+def test_html_title_lookahead_reads_file_once(tmp_path, monkeypatch):
+    """The <h1> title comes from the main pass; without one, blocks still go out."""
+    parses = []
+    iterparse = etree.iterparse
+    monkeypatch.setattr(html_converter, 'etree', SimpleNamespace(
+        iterparse=lambda *args, **kwargs: parses.append(1) or iterparse(*args, **kwargs)))
+    monkeypatch.setattr(html_converter, '_TITLE_LOOKAHEAD', 100)
+    source = tmp_path / 'in.html'
+    output = tmp_path / 'out.md'
+
+    source.write_text('<html><body><p>Intro</p><h1>Real Title</h1><p>Body</p></body></html>')
+    assert HtmlConverter().convert(source, output, {})
+    assert output.read_text().startswith('# Real Title\n\nIntro\n\n# Real Title')
+    assert len(parses) == 1
+
+    paragraphs = ''.join(f'<p>Paragraph {i} with some text.</p>' for i in range(20))
+    source.write_text(f'<html><body>{paragraphs}<h1>Too Late</h1></body></html>')
+    assert HtmlConverter().convert(source, output, {})
+    text = output.read_text()
+    assert text.startswith('Paragraph 0 with some text.\n\n')
+    assert text.count('Paragraph') == 20 and text.endswith('# Too Late\n\n')
+
+
+def test_markdown_chunks_keep_blocks_whole():
+    """Chunks never split fenced code or lists."""
+    lines = ['para\n', '\n', '```\n', 'code\n', '\n', 'more\n', '```\n', '\n',
+             '- a\n', '\n', '- b\n', '\n', 'tail\n']
+    chunks = list(_markdown_chunks(lines, 1))
+    assert ''.join(chunks) == ''.join(lines)
+    assert chunks == ['para\n\n', '```\ncode\n\nmore\n```\n\n- a\n\n- b\n\n', 'tail\n']
+
+
+def test_markdown_chunks_keep_html_blocks_whole(tmp_path, monkeypatch):
+    """Raw HTML blocks and comments spanning blank lines stay in one chunk."""
+    lines = ['para\n', '\n', '<div class="x">\n', '\n', '<div>inner</div>\n', '\n', 'text\n',
+             '\n', '</DIV>\n', '\n', '<!-- note\n', '\n', 'end -->\n', '\n', 'tail\n']
+    chunks = list(_markdown_chunks(lines, 1))
+    assert chunks == ['para\n\n', ''.join(lines[2:10]), ''.join(lines[10:14]), 'tail\n']
+
+    monkeypatch.setattr(markdown_converter, '_CHUNK_CHARS', 1)
+    source = tmp_path / 'html.md'
+    source.write_text(''.join(lines))
+    output = tmp_path / 'html.txt'
+    assert MarkdownConverter().convert(source, output, {})
+    assert 'text' not in output.read_text().replace('tail', '')
+
+
+def test_markdown_references_resolve_across_chunks(tmp_path, monkeypatch):
+    """Reference-style links resolve wherever in the file they are defined."""
+    monkeypatch.setattr(markdown_converter, '_CHUNK_CHARS', 1024)
+    source = tmp_path / 'refs.md'
+    paragraphs = [f'See [the docs][ref{i % 3}] for part {i}.' for i in range(1200)]
+    source.write_text('\n\n'.join(paragraphs) + '\n\n[ref0]: http://a\n[ref1]: http://b\n[REF2]: <http://c> "C"\n')
+
+    output = tmp_path / 'refs.txt'
+    assert MarkdownConverter().convert(source, output, {})
+    text = output.read_text()
+    assert '[the docs]' not in text
+    assert text.count('See the docs for part') == 1200
@@ -0,0 +1,62 @@
+"""Tests for columnar table blocks."""
+
+import docx
+
+from convertext.converters.base import Document
+from convertext.converters.blocks import Table
+from convertext.converters.documents.docx import _table_rows
+from convertext.converters.mixins import MarkdownWriterMixin
+from convertext.converters.serialization import dumps, loads
+
+
+def test_columnar_storage_and_row_view():
+    """Rows read back unchanged, ragged rows keep their length, strings are shared."""
+    rows = [['a', 'yes', 1], ['b', 'yes'], [], ['c', 'no', 3, 'extra']]
+    table = Table(rows, headers=['Name', 'Flag', 'N'])
+
+    assert table.nrows == 4
+    assert list(table.rows) == [['a', 'yes', '1'], ['b', 'yes'], [], ['c', 'no', '3', 'extra']]
+    assert table.rows == [['a', 'yes', '1'], ['b', 'yes'], [], ['c', 'no', '3', 'extra']]
+    assert table.rows[-1] == ['c', 'no', '3', 'extra']
+    assert table.rows[1:3] == [['b', 'yes'], []]
+    assert table.strings.count('yes') == 1
+    assert all(len(col) == 4 for col in table.columns)
+
+    table['rows'] = [['x']]
+    assert table['rows'] == [['x']]
+
+
+def test_table_serialization_roundtrip():
+    """Columnar tables survive the binary serialization."""
+    doc = Document()
+    doc.add_table([['1', '2'], ['3']], headers=['A', 'B'])
+    restored = loads(dumps(doc)).content[0]
+    assert isinstance(restored, Table)
+    assert restored.rows == [['1', '2'], ['3']]
+    assert restored.headers == ['A', 'B']
+
+
+def test_markdown_writer_streams_headerless_table(tmp_path):
+    """Without headers the first row becomes the Markdown header row."""
+    doc = Document()
+    doc.add_table([['h1', 'h2'], ['v1', 'v2']])
+    out = tmp_path / 'out.md'
+    MarkdownWriterMixin()._write_md(doc, out)
+    assert out.read_text() == '| h1 | h2 |\n| --- | --- |\n| v1 | v2 |\n\n'
+
+
+def test_docx_bulk_rows_match_python_docx(tmp_path):
+    """The XML table reader matches python-docx cell texts, spans included."""
+    d = docx.Document()
+    table = d.add_table(rows=3, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = 'span'
+    table.cell(1, 2).merge(table.cell(2, 2)).text = 'vert'
+    cell = table.cell(2, 0)
+    cell.text = 'tab\there'
+    cell.add_paragraph('second').add_run().add_break()
+    path = tmp_path / 't.docx'
+    d.save(path)
+
+    table = docx.Document(path).tables[0]
+    expected = [[c.text.strip() for c in row.cells] for row in table.rows]
+    assert list(_table_rows(table._tbl)) == expected